@@ -2,4 +2,4 @@
 Carneades argumentation package
 """
 
-__all__ = ['caes', 'tracecalls','reader', 'dialogue']
+__all__ = ['caes', 'graph', 'tracecalls','reader', 'dialogue', 'batch', 'binary', 'bulk']
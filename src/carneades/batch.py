@@ -0,0 +1,163 @@
+"""
+Batch
+=====
+Evaluate many case files at once, spreading them over a pool of worker
+processes.
+
+Each case file is loaded with :class:`.Reader`, with its progress messages
+suppressed, and every :class:`.CAES` that it defines is evaluated with
+:meth:`.CAES.evaluate_all`. One JSON object is written per case, on its own
+line, as soon as the case is finished, so cases come out in the order in
+which they finish rather than the order in which they were given. A case
+which fails is reported with its error, and the run carries on with the
+others. If a worker process dies, e.g. because it ran out of memory, the
+case it was evaluating and those which had not finished are reported as
+failed, rather than left waiting for.
+
+To evaluate every case file in a directory ::
+
+    python batch.py cases/ > results.jsonl
+
+or just some files, with four worker processes ::
+
+    python batch.py -j 4 test1.txt test2.txt
+
+Each line looks like ::
+
+    {"case": "test1.txt", "ok": true, "seconds": 0.004,
+     "caes": {"caes": {"accepted": ["-intent", "kill", ...]}}}
+
+or, for a case which failed ::
+
+    {"case": "bad.txt", "ok": false, "seconds": 0.001,
+     "error": "NameError: intent is not defined"}
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+if not __package__:
+    # when run as a script, make sure that the package can be imported
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from carneades.reader import Reader
+
+CASE_SUFFIXES = ('.txt', '.yaml', '.yml')
+"""
+The suffixes of the files which are taken to be case files when a directory
+is given to :func:`case_files`.
+"""
+
+
+def case_files(paths):
+    """
+    List the case files to be evaluated.
+
+    :param paths: Case files, or directories whose files with one of the\
+    :data:`CASE_SUFFIXES` are all case files.
+    :type paths: list(str)
+    :rtype: list(str)
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name)
+                         for name in sorted(os.listdir(path))
+                         if name.endswith(CASE_SUFFIXES) and
+                         os.path.isfile(os.path.join(path, name)))
+        else:
+            files.append(path)
+    return files
+
+
+def evaluate_case(path):
+    """
+    Load a case file and evaluate every :class:`.CAES` that it defines.
+
+    Exceptions are caught and reported in the result, so that one bad case
+    does not stop a batch.
+
+    :param path: The case file.
+    :type path: str
+    :return: The result for the case, as described in :mod:`carneades.batch`.
+    :rtype: dict
+    """
+    start = time.perf_counter()
+    result = {'case': path}
+    try:
+        reader = Reader()
+        with open(path, 'r') as f, \
+                contextlib.redirect_stdout(io.StringIO()):
+            reader.load(f)
+            results = {}
+            for (name, caes) in sorted(
+                    reader.initialised_variables['CAES'].items()):
+                labelling = caes.evaluate_all()
+                results[name] = {'accepted': sorted(
+                    str(p) for p in labelling.accepted())}
+    except Exception as e:
+        result['ok'] = False
+        result['error'] = '{}: {}'.format(type(e).__name__, e)
+    else:
+        result['ok'] = True
+        result['caes'] = results
+    result['seconds'] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def run_batch(paths, processes=None, stream=sys.stdout):
+    """
+    Evaluate case files in a pool of worker processes, writing out the
+    result for each case as a line of JSON as soon as it is finished.
+
+    :param paths: Case files or directories, as for :func:`case_files`.
+    :type paths: list(str)
+    :param processes: The number of worker processes; by default, the\
+    number of CPUs.
+    :type processes: int or None
+    :param stream: Where the results are written.
+    :return: The number of cases which failed, including those which were\
+    left unfinished by a worker process which died.
+    :rtype: int
+    """
+    files = case_files(paths)
+    failures = 0
+    with ProcessPoolExecutor(processes) as pool:
+        futures = {pool.submit(evaluate_case, path): path for path in files}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # the worker died, and took the pool with it
+                result = {'case': futures[future], 'ok': False,
+                          'error': '{}: {}'.format(type(e).__name__, e),
+                          'seconds': None}
+            if not result['ok']:
+                failures += 1
+            stream.write(json.dumps(result, sort_keys=True) + '\n')
+            stream.flush()
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Evaluate case files in parallel, writing one line of '
+                    'JSON per case.')
+    parser.add_argument('paths', nargs='+',
+                        help='case files, or directories of case files')
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='number of worker processes '
+                             '(default: number of CPUs)')
+    args = parser.parse_args(argv)
+    failures = run_batch(args.paths, args.processes)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
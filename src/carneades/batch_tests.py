@@ -0,0 +1,63 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+from carneades import batch
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+evaluate_case = batch.evaluate_case
+
+def dying_case(path):
+    """
+    Evaluate a case, except that the worker process dies on a case called
+    ``die.txt``.
+    """
+    if os.path.basename(path) == 'die.txt':
+        os._exit(1)
+    return evaluate_case(path)
+
+class BatchTestCase(unittest.TestCase):
+    """
+    Test cases for the batch runner
+    """
+
+    def test_batch_reports_every_case(self):
+        ''' Every case gets a line of JSON, and failures do not stop the run '''
+        cases = [os.path.join(HERE, 'test1.txt'),
+                 os.path.join(HERE, 'no_such_case.txt')]
+        proc = subprocess.run([sys.executable, '-m', 'carneades.batch',
+                               '-j', '2'] + cases,
+                              cwd=os.path.join(HERE, '..'),
+                              stdout=subprocess.PIPE,
+                              universal_newlines=True)
+        self.assertEqual(proc.returncode, 1)
+        results = {r['case']: r for r in map(json.loads,
+                                             proc.stdout.splitlines())}
+        self.assertEqual(sorted(results), sorted(cases))
+        self.assertTrue(results[cases[0]]['ok'])
+        self.assertIn('caes', results[cases[0]]['caes'])
+        self.assertFalse(results[cases[1]]['ok'])
+        self.assertIn('FileNotFoundError', results[cases[1]]['error'])
+
+    def test_worker_dies(self):
+        ''' A worker which dies is reported as a failure instead of hanging '''
+        cases = [os.path.join(HERE, 'test1.txt'), os.path.join(HERE, 'die.txt')]
+        stream = io.StringIO()
+        with mock.patch.object(batch, 'evaluate_case', dying_case):
+            failures = batch.run_batch(cases, processes=1, stream=stream)
+        results = {r['case']: r for r in map(json.loads,
+                                             stream.getvalue().splitlines())}
+        self.assertEqual(sorted(results), sorted(cases))
+        self.assertFalse(results[cases[1]]['ok'])
+        self.assertIn('BrokenProcessPool', results[cases[1]]['error'])
+        self.assertEqual(failures,
+                         sum(not r['ok'] for r in results.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,392 @@
+"""
+Benchmarks
+==========
+Benchmarks for the performance-sensitive parts of the carneades package.
+
+To run all of them ::
+
+    python benchmarks.py
+
+or just some of them, by name ::
+
+    python benchmarks.py backends
+"""
+
+import contextlib
+import copy
+import csv
+import io
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+if not __package__:
+    # when run as a script, make sure that the package can be imported
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from carneades.caes import PropLiteral, Argument, ArgumentSet, Audience, \
+    CAES, ProofStandard
+from carneades.graph import BACKENDS
+from carneades import binary, bulk
+from carneades.reader import Reader
+
+
+def generate_arguments(n, fanout=3, seed=0):
+    """
+    Generate an acyclic set of random arguments.
+
+    Argument *i* concludes proposition ``p<i>`` (or its negation) from
+    premises and exceptions drawn from propositions with larger indexes.
+
+    :param n: The number of arguments.
+    :param fanout: The maximum number of premises of an argument.
+    :param seed: The seed for the random number generator.
+    :rtype: list(:class:`.Argument`)
+    """
+    rng = random.Random(seed)
+    props = [PropLiteral('p{}'.format(i)) for i in range(n + fanout + 1)]
+    arguments = []
+    for i in range(n):
+        later = props[i + 1:i + 1 + 4 * fanout]
+        premises = set(rng.sample(later, rng.randint(0, fanout)))
+        exceptions = set(rng.sample(later, rng.randint(0, 1))) - premises
+        conclusion = props[i] if rng.random() < 0.8 else props[i].negate()
+        arguments.append(Argument(conclusion, premises=premises,
+                                  exceptions=exceptions))
+    return arguments
+
+
+def write_case(arguments, f):
+    """
+    Write a case file for :class:`.Reader` which builds an
+    :class:`.ArgumentSet` called ``argset`` from arguments.
+
+    :param arguments: The arguments, e.g. from :func:`generate_arguments`.
+    :type arguments: list(:class:`.Argument`)
+    :param f: The file to write to.
+    """
+    props = set()
+    for arg in arguments:
+        props.add(arg.conclusion.negate() if not arg.conclusion.polarity
+                  else arg.conclusion)
+        props.update(arg.premises)
+        props.update(arg.exceptions)
+    number = 0
+    for prop in sorted(props):
+        f.write('{}:\n    func_name: PropLiteral\n    type: construct\n'
+                '    var_name: {}\n    args:\n        None\n'.format(number,
+                                                                prop))
+        f.write('{}:\n    func_name: negate\n    type: func\n'
+                '    var_name: {}\n    args:\n        return_var: neg_{}\n'.\
+                format(number + 1, prop, prop))
+        number += 2
+    f.write('{}:\n    func_name: ArgumentSet\n    type: construct\n'
+            '    var_name: argset\n    args:\n        None\n'.format(number))
+    number += 1
+    for (i, arg) in enumerate(arguments):
+        conclusion = arg.conclusion
+        name = str(conclusion) if conclusion.polarity else \
+            'neg_{}'.format(conclusion.negate())
+        f.write('{}:\n    func_name: Argument\n    type: construct\n'
+                '    var_name: a{}\n    args:\n        conclusion: {}\n'
+                '        premises: [{}]\n        exceptions: [{}]\n'.format(
+                    number, i, name, ', '.join(map(str, arg.premises)),
+                    ', '.join(map(str, arg.exceptions))))
+        f.write('{}:\n    func_name: add_argument\n    type: func\n'
+                '    var_name: argset\n    args:\n        argument: a{}\n'.\
+                format(number + 1, i))
+        number += 2
+
+
+def write_jsonl(arguments, f):
+    """
+    Write arguments in the JSON Lines format of :mod:`carneades.bulk`.
+
+    :param arguments: The arguments.
+    :type arguments: list(:class:`.Argument`)
+    :param f: The file to write to.
+    """
+    for arg in arguments:
+        f.write(json.dumps({'id': arg.arg_id, 'conclusion': str(arg.conclusion),
+                            'premises': sorted(map(str, arg.premises)),
+                            'exceptions': sorted(map(str, arg.exceptions)),
+                            'weight': 0.5}) + '\n')
+
+
+def write_csv(arguments, f):
+    """
+    Write arguments in the CSV format of :mod:`carneades.bulk`.
+
+    :param arguments: The arguments.
+    :type arguments: list(:class:`.Argument`)
+    :param f: The file to write to, opened with ``newline=''``.
+    """
+    writer = csv.writer(f)
+    writer.writerow(['id', 'conclusion', 'premises', 'exceptions', 'weight'])
+    for arg in arguments:
+        writer.writerow([arg.arg_id, arg.conclusion,
+                         ';'.join(sorted(map(str, arg.premises))),
+                         ';'.join(sorted(map(str, arg.exceptions))), 0.5])
+
+
+def bench_storage(n=5000):
+    """
+    Compare the time needed to load an :class:`.ArgumentSet` of ``n``
+    arguments from a case file with :class:`.Reader`, from the binary
+    format of :mod:`carneades.binary`, and from the JSON Lines and CSV
+    formats of :mod:`carneades.bulk`.
+    """
+    arguments = generate_arguments(n)
+    with tempfile.TemporaryDirectory() as directory:
+        case = os.path.join(directory, 'case.txt')
+        with open(case, 'w') as f:
+            write_case(arguments, f)
+        start = time.perf_counter()
+        reader = Reader()
+        with open(case, 'r') as f, contextlib.redirect_stdout(io.StringIO()):
+            reader.load(f)
+        reader_time = time.perf_counter() - start
+        argset = reader.initialised_variables['ArgumentSet']['argset']
+
+        path = os.path.join(directory, 'case.carg')
+        binary.save(path, argset)
+        start = time.perf_counter()
+        binary.load(path)
+        binary_time = time.perf_counter() - start
+
+        rows = [('yaml', reader_time, os.path.getsize(case)),
+                ('binary', binary_time, os.path.getsize(path))]
+
+        for (name, write) in [('jsonl', write_jsonl), ('csv', write_csv)]:
+            path = os.path.join(directory, 'case.' + name)
+            with open(path, 'w', newline='') as f:
+                write(argset.arguments, f)
+            start = time.perf_counter()
+            bulk.load(path)
+            rows.append((name, time.perf_counter() - start,
+                         os.path.getsize(path)))
+
+    print('{:<8} {:>10} {:>14} {:>10}'.format('format', 'seconds',
+                                              'arguments/s', 'MiB'))
+    for (name, elapsed, size) in rows:
+        print('{:<8} {:>10.3f} {:>14.0f} {:>10.2f}'.format(
+            name, elapsed, n / elapsed, size / 2 ** 20))
+
+
+def bench_reader(n=5000, repeat=3):
+    """
+    Measure how many commands per second :class:`.Reader` parses and
+    executes, for a generated case file which builds an
+    :class:`.ArgumentSet` of ``n`` arguments. Execution, which includes
+    validating each command and dispatching it to its handler, is timed
+    separately from parsing by replaying commands which have already been
+    parsed.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'case.txt')
+        with open(path, 'w') as f:
+            write_case(generate_arguments(n), f)
+        reader = Reader()
+        with open(path, 'r') as f:
+            reader.fileObject = f
+            start = time.perf_counter()
+            commands = list(reader.iter_commands())
+            parse_time = time.perf_counter() - start
+        execute_time = None
+        for _ in range(repeat):
+            reader = Reader()
+            reader.iter_commands = lambda: iter(commands)
+            with open(path, 'r') as f, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                reader.fileObject = f
+                start = time.perf_counter()
+                reader.deserialise()
+                elapsed = time.perf_counter() - start
+            execute_time = elapsed if execute_time is None \
+                else min(execute_time, elapsed)
+    print('{:<8} {:>10} {:>12} {:>14}'.format('stage', 'commands', 'seconds',
+                                              'commands/s'))
+    for (stage, elapsed) in [('parse', parse_time),
+                             ('execute', execute_time)]:
+        print('{:<8} {:>10} {:>12.3f} {:>14.0f}'.format(
+            stage, len(commands), elapsed, len(commands) / elapsed))
+
+
+def bench_plans(n=5000, repeat=3):
+    """
+    Compare the time needed to load a generated case file which builds an
+    :class:`.ArgumentSet` of ``n`` arguments with :class:`.Reader`, without
+    a plan cache, when its plan is compiled and cached, and when its cached
+    plan is replayed.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'case.txt')
+        with open(path, 'w') as f:
+            write_case(generate_arguments(n), f)
+        cache = os.path.join(directory, 'plans')
+
+        def timed(plan_cache):
+            reader = Reader(plan_cache=plan_cache)
+            with open(path, 'r') as f, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                reader.load(f)
+                return time.perf_counter() - start
+
+        times = [('uncached', min(timed(None) for _ in range(repeat))),
+                 ('compile', timed(cache)),
+                 ('replay', min(timed(cache) for _ in range(repeat)))]
+    print('{:<10} {:>10} {:>14}'.format('load', 'seconds', 'arguments/s'))
+    for (name, elapsed) in times:
+        print('{:<10} {:>10.3f} {:>14.0f}'.format(name, elapsed, n / elapsed))
+
+
+def _measure_backend(backend, n):
+    """
+    Build an :class:`.ArgumentSet` of ``n`` arguments with a backend and
+    measure how long it takes and how many bytes the argument set holds.
+    Meant to be run in a fresh process, so that the time for the igraph
+    backend includes importing igraph.
+
+    The memory is measured with :mod:`tracemalloc` while building the
+    argument set a second time, so that tracing does not slow down the
+    timed build; memory which igraph allocates outside of Python's
+    allocator is not counted.
+    """
+    import tracemalloc
+    arguments = generate_arguments(n)
+    start = time.perf_counter()
+    argset = ArgumentSet(backend)
+    argset.add_arguments(arguments)
+    elapsed = time.perf_counter() - start
+    del argset
+    tracemalloc.start()
+    try:
+        argset = ArgumentSet(backend)
+        argset.add_arguments(arguments)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (elapsed, size)
+
+
+def bench_backends(n=20000):
+    """
+    Compare the graph backends for the time and memory needed to build an
+    :class:`.ArgumentSet` of ``n`` arguments, each in a fresh process; see
+    :func:`_measure_backend`.
+    """
+    context = multiprocessing.get_context('spawn')
+    print('{:<10} {:>10} {:>14} {:>12}'.format('backend', 'seconds',
+                                               'arguments/s', 'heap MiB'))
+    for backend in sorted(BACKENDS):
+        with context.Pool(1) as pool:
+            try:
+                elapsed, size = pool.apply(_measure_backend, (backend, n))
+            except ImportError:
+                print('{:<10} not available'.format(backend))
+                continue
+        print('{:<10} {:>10.3f} {:>14.0f} {:>12.1f}'.format(
+            backend, elapsed, n / elapsed, size / 2 ** 20))
+
+
+def bench_import(repeat=5):
+    """
+    Measure how long it takes to import each module of the package in a
+    fresh interpreter, using ``python -X importtime``, and check which of the
+    heavy optional dependencies are imported along with it.
+    """
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    heavy = ['igraph', 'numpy', 'yaml']
+    print('{:<22} {:>10}  {}'.format('module', 'ms', 'heavy imports'))
+    for module in ['carneades.caes', 'carneades.reader', 'carneades.dialogue']:
+        code = 'import sys, {}; print(" ".join(m for m in {!r} ' \
+            'if m in sys.modules))'.format(module, heavy)
+        best = None
+        for _ in range(repeat):
+            proc = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                                   code], cwd=src, check=True,
+                                  stdout=subprocess.PIPE,
+                                  stderr=subprocess.PIPE,
+                                  universal_newlines=True)
+            # the last line of the report is the top-level import, and its
+            # second column is the cumulative time in microseconds
+            cumulative = int(proc.stderr.splitlines()[-1].split('|')[1])
+            best = cumulative if best is None else min(best, cumulative)
+        print('{:<22} {:>10.1f}  {}'.format(module, best / 1000,
+                                           proc.stdout.strip() or '-'))
+
+
+def bench_incremental(n=20000, k=50, queries=20):
+    """
+    Compare the time needed to answer the same queries after adding each of
+    ``k`` arguments to an :class:`.ArgumentSet` of ``n`` arguments, either
+    with one :class:`.CAES` which follows the changes or with a new
+    :class:`.CAES` after each one.
+    """
+    arguments = generate_arguments(n)
+    # the new arguments conclude propositions near the bottom of the graph,
+    # and the queries are about propositions near the top
+    extra = [Argument(arg.conclusion) for arg in arguments[-k:]]
+    props = [arg.conclusion for arg in arguments[:queries]]
+    print('{:<12} {:>10} {:>14}'.format('caes', 'seconds', 'arguments/s'))
+    for fresh in (False, True):
+        argset = ArgumentSet()
+        argset.add_arguments(arguments)
+        caes = CAES(argset, Audience(set(), {}), ProofStandard([]))
+        for p in props:
+            caes.acceptable(p)
+        start = time.perf_counter()
+        for arg in extra:
+            argset.add_argument(arg)
+            if fresh:
+                caes = CAES(argset, Audience(set(), {}), ProofStandard([]))
+            for p in props:
+                caes.acceptable(p)
+        elapsed = time.perf_counter() - start
+        print('{:<12} {:>10.3f} {:>14.0f}'.format(
+            'new' if fresh else 'incremental', elapsed, k / elapsed))
+
+
+def bench_rollback(n=5000, k=20):
+    """
+    Compare the time needed to try out each of ``k`` arguments on an
+    :class:`.ArgumentSet` of ``n`` arguments and take it back again, either
+    on a deep copy of the argument set or by rolling back to a checkpoint.
+    """
+    arguments = generate_arguments(n)
+    argset = ArgumentSet()
+    argset.add_arguments(arguments)
+    extra = [Argument(arg.conclusion) for arg in arguments[-k:]]
+    print('{:<12} {:>10} {:>14}'.format('undo', 'seconds', 'arguments/s'))
+    start = time.perf_counter()
+    for arg in extra:
+        trial = copy.deepcopy(argset)
+        trial.add_argument(arg)
+    elapsed = time.perf_counter() - start
+    print('{:<12} {:>10.3f} {:>14.0f}'.format('deepcopy', elapsed, k / elapsed))
+    start = time.perf_counter()
+    token = argset.checkpoint()
+    for arg in extra:
+        argset.add_argument(arg)
+        argset.rollback(token)
+    argset.release(token)
+    elapsed = time.perf_counter() - start
+    print('{:<12} {:>10.3f} {:>14.0f}'.format('rollback', elapsed, k / elapsed))
+
+
+BENCHMARKS = {'backends': bench_backends, 'import': bench_import,
+              'incremental': bench_incremental, 'plans': bench_plans,
+              'reader': bench_reader, 'rollback': bench_rollback,
+              'storage': bench_storage}
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or sorted(BENCHMARKS):
+        print('== {} =='.format(name))
+        BENCHMARKS[name]()
@@ -0,0 +1,365 @@
+# Binary storage for the Carneades Argument Evaluation Structure
+#
+# For license information, see LICENSE
+
+"""
+A compact binary file format for :class:`carneades.caes.ArgumentSet`, and
+optionally for the :class:`carneades.caes.Audience` and
+:class:`carneades.caes.ProofStandard` that go with it.
+
+Loading a file of this kind is much faster than running the commands of a
+case file through :class:`carneades.reader.Reader`, and the file is read
+through :mod:`mmap`: its arrays are exposed by :class:`ArgumentFile` as
+``memoryview`` objects over the mapped pages, without being copied, so many
+worker processes can share one copy of the raw arrays in the page cache.
+Evaluation is not served from the arrays, however:
+:meth:`ArgumentFile.argument_set` builds the arguments and the graph
+afresh, so each process which loads the file still holds its own copy of
+the argument set.
+
+A file consists of a header followed by a number of sections, each of which
+is a flat array of a single C type, aligned to 8 bytes:
+
+* ``atoms`` and ``atomoff``: the names of the atomic propositions, as UTF-8
+  bytes and their offsets;
+
+* ``props``: the propositions in the argument set, as *literal codes*: the
+  literal with polarity ``True`` of atom *i* has code ``2 * i``, and its
+  negation has code ``2 * i + 1``;
+
+* ``concl``, ``premoff``, ``prem``, ``excoff`` and ``exc``: the conclusion of
+  each argument, and its premises and exceptions with their offsets, as
+  literal codes;
+
+* ``argids`` and ``argidoff``: the IDs of the arguments;
+
+* ``vprop``, ``varg``, ``esrc`` and ``etgt``: the graph of the argument set,
+  i.e. for each vertex the literal code of its proposition or the index of
+  its argument (or -1), and the endpoints of each edge;
+
+* ``meta``: the argument counter of the argument set;
+
+* if an audience was saved, ``assume`` for its assumptions, and ``wkeys``,
+  ``wkeyoff`` and ``wvals`` for its weights;
+
+* if a proof standard was saved, ``psprop`` and ``psstd`` for the standards
+  of the propositions and ``psdef`` for the default.
+
+Arrays are stored in the byte order of the machine which saved them, and a
+file saved on a machine with the other byte order cannot be loaded.
+"""
+
+from array import array
+from collections import namedtuple
+import mmap
+import struct
+import sys
+
+from carneades.caes import PropLiteral, Argument, ArgumentSet, Audience, \
+    ProofStandard
+
+MAGIC = b'CARNARG\x00'
+FORMAT_VERSION = 1
+
+# magic, format version, byte order (0 little, 1 big), number of sections
+_HEADER = struct.Struct('<8sIII')
+# name, type code, offset, number of items
+_SECTION = struct.Struct('<8s4sQQ')
+
+Case = namedtuple('Case', ['argset', 'audience', 'proofstandard'])
+"""
+The contents of a file loaded by :func:`load`.
+
+:param argset: The argument set.
+:type argset: :class:`.ArgumentSet`
+:param audience: The audience, or ``None`` if none was saved.
+:type audience: :class:`.Audience`
+:param proofstandard: The proof standard, or ``None`` if none was saved.
+:type proofstandard: :class:`.ProofStandard`
+"""
+
+
+def _strings(strings):
+    """
+    Encode strings as a blob of UTF-8 bytes and an array of offsets.
+    """
+    blob = bytearray()
+    offsets = array('Q', [0])
+    for string in strings:
+        blob.extend(string.encode('utf-8'))
+        offsets.append(len(blob))
+    return array('B', blob), offsets
+
+
+def _ragged(lists):
+    """
+    Flatten lists of integers into an array of values and an array of
+    offsets.
+    """
+    values = array('I')
+    offsets = array('Q', [0])
+    for items in lists:
+        values.extend(items)
+        offsets.append(len(values))
+    return values, offsets
+
+
+def save(path, argset, audience=None, proofstandard=None):
+    """
+    Save an argument set, and optionally an audience and proof standard, in
+    the binary format.
+
+    Argument IDs, and the keys of the weights of the audience, are stored as
+    strings, as :mod:`carneades.bulk` stores them, so an argument set whose
+    IDs are numbers, e.g. from a YAML case, is loaded with the same IDs as
+    strings.
+
+    :param path: The file to be written.
+    :type path: str
+    :param argset: The argument set.
+    :type argset: :class:`.ArgumentSet`
+    :param audience: The audience, if any.
+    :type audience: :class:`.Audience` or None
+    :param proofstandard: The proof standard, if any.
+    :type proofstandard: :class:`.ProofStandard` or None
+    :raises ValueError: if two keys of the weights are the same as strings.
+    """
+    atoms = {}
+
+    def code(literal):
+        atom = atoms.setdefault(literal._string, len(atoms))
+        return 2 * atom + (0 if literal.polarity else 1)
+
+    graph = argset.graph
+    arg_number = {}
+    for (i, arg) in enumerate(argset.arguments):
+        arg_number.setdefault(arg.arg_id, i)
+    sections = [
+        ('props', array('I', [code(p) for p in sorted(argset.propset())])),
+        ('concl', array('I', [code(arg.conclusion)
+                              for arg in argset.arguments])),
+        ('vprop', array('q', [-1 if p is None else code(p)
+                              for p in graph.attribute('prop')])),
+        ('varg', array('q', [-1 if a is None else arg_number[a]
+                             for a in graph.attribute('arg')])),
+        ('esrc', array('q', [s for (s, _) in graph.edges()])),
+        ('etgt', array('q', [t for (_, t) in graph.edges()])),
+        ('meta', array('Q', [argset.arg_count])),
+    ]
+    prem, premoff = _ragged([code(p) for p in arg.premises]
+                            for arg in argset.arguments)
+    exc, excoff = _ragged([code(e) for e in arg.exceptions]
+                          for arg in argset.arguments)
+    argids, argidoff = _strings(str(arg.arg_id)
+                                for arg in argset.arguments)
+    sections += [('prem', prem), ('premoff', premoff), ('exc', exc),
+                 ('excoff', excoff), ('argids', argids),
+                 ('argidoff', argidoff)]
+    if audience is not None:
+        weights = {}
+        for (key, value) in audience.weight.items():
+            if str(key) in weights:
+                raise ValueError("Weight of argument '{}' given twice".\
+                                 format(key))
+            weights[str(key)] = value
+        weights = sorted(weights.items())
+        wkeys, wkeyoff = _strings(key for (key, _) in weights)
+        sections += [('assume', array('I', [code(p) for p in
+                                            sorted(audience.assumptions)])),
+                     ('wkeys', wkeys), ('wkeyoff', wkeyoff),
+                     ('wvals', array('d', [value for (_, value) in weights]))]
+    if proofstandard is not None:
+        standards = sorted(proofstandard.config.items())
+        names = proofstandard.proof_standards
+        sections += [('psprop', array('I', [code(p) for (p, _) in standards])),
+                     ('psstd', array('B', [names.index(s)
+                                           for (_, s) in standards])),
+                     ('psdef', array('B',
+                                     [names.index(proofstandard.default)]))]
+    # the atoms are only complete once every literal has been coded
+    names, offsets = _strings(sorted(atoms, key=atoms.get))
+    sections += [('atoms', names), ('atomoff', offsets)]
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    directory = []
+    for (name, values) in sections:
+        offset = (offset + 7) // 8 * 8
+        directory.append(_SECTION.pack(name.encode('ascii'),
+                                       values.typecode.encode('ascii'),
+                                       offset, len(values)))
+        offset += len(values) * values.itemsize
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION,
+                             0 if sys.byteorder == 'little' else 1,
+                             len(sections)))
+        for entry in directory:
+            f.write(entry)
+        for (entry, (_, values)) in zip(directory, sections):
+            f.write(b'\0' * (_SECTION.unpack(entry)[2] - f.tell()))
+            values.tofile(f)
+
+
+class ArgumentFile(object):
+    """
+    A file in the binary format, opened through :mod:`mmap`.
+
+    Each section is available as a ``memoryview`` of the mapped file, by
+    name, e.g. ``f['prem']``; no data is copied until objects are built
+    from it, by :meth:`literal`, :meth:`argument_set`, :meth:`audience` and
+    :meth:`proofstandard`. The views must not be used after the file has
+    been closed.
+    """
+    def __init__(self, path):
+        """
+        :param path: The file to be opened.
+        :type path: str
+        :raises ValueError: if the file is not in the binary format, or was\
+        saved on a machine with a different byte order.
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        self._sections = {}
+        try:
+            magic, version, order, count = _HEADER.unpack_from(self._buffer)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError("{} is not an argument file".format(path))
+            if order != (0 if sys.byteorder == 'little' else 1):
+                raise ValueError("{} was saved with a different byte order".\
+                                 format(path))
+            for i in range(count):
+                name, typecode, offset, length = _SECTION.unpack_from(
+                    self._buffer, _HEADER.size + i * _SECTION.size)
+                typecode = typecode.rstrip(b'\0').decode('ascii')
+                size = array(typecode).itemsize
+                self._sections[name.rstrip(b'\0').decode('ascii')] = \
+                    self._buffer[offset:offset + length * size].cast(typecode)
+        except (struct.error, ValueError):
+            self.close()
+            raise
+        self._literals = None
+
+    def __getitem__(self, name):
+        return self._sections[name]
+
+    def __contains__(self, name):
+        return name in self._sections
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Release the views and unmap the file.
+        """
+        for view in self._sections.values():
+            view.release()
+        self._sections = {}
+        self._buffer.release()
+        self._mmap.close()
+
+    def strings(self, blob, offsets):
+        """
+        Decode a section of strings.
+
+        :param blob: The name of the section holding the bytes.
+        :param offsets: The name of the section holding the offsets.
+        :rtype: list(str)
+        """
+        data = bytes(self[blob])
+        offsets = self[offsets]
+        return [data[offsets[i]:offsets[i + 1]].decode('utf-8')
+                for i in range(len(offsets) - 1)]
+
+    def literals(self):
+        """
+        The propositions, indexed by literal code.
+
+        :rtype: list(:class:`.PropLiteral`)
+        """
+        if self._literals is None:
+            self._literals = []
+            for name in self.strings('atoms', 'atomoff'):
+                literal = PropLiteral(name)
+                self._literals.extend([literal, literal.negate()])
+        return self._literals
+
+    def literal(self, code):
+        """
+        The proposition with a literal code.
+
+        :param code: The literal code.
+        :type code: int
+        :rtype: :class:`.PropLiteral`
+        """
+        return self.literals()[code]
+
+    def argument_set(self, backend='adjacency'):
+        """
+        Build the argument set, using the stored graph as it is.
+
+        The argument set is an ordinary one, held in the memory of this
+        process; it does not refer to the mapped file.
+
+        :param backend: The graph backend, see :class:`.ArgumentSet`.
+        :type backend: str
+        :rtype: :class:`.ArgumentSet`
+        """
+        literal = self.literals().__getitem__
+        concl = self['concl']
+        prem, premoff = self['prem'], self['premoff']
+        exc, excoff = self['exc'], self['excoff']
+        arg_ids = self.strings('argids', 'argidoff')
+        arguments = []
+        for i in range(len(concl)):
+            argument = Argument(
+                literal(concl[i]),
+                premises=[literal(c) for c in prem[premoff[i]:premoff[i + 1]]],
+                exceptions=[literal(c) for c in exc[excoff[i]:excoff[i + 1]]])
+            argument.arg_id = arg_ids[i]
+            arguments.append(argument)
+        return ArgumentSet.from_graph(
+            arguments, [None if c < 0 else literal(c) for c in self['vprop']],
+            [None if i < 0 else arg_ids[i] for i in self['varg']],
+            list(zip(self['esrc'], self['etgt'])), self['meta'][0], backend)
+
+    def audience(self):
+        """
+        Build the audience, if one was saved.
+
+        :rtype: :class:`.Audience` or None
+        """
+        if 'assume' not in self:
+            return None
+        weight = dict(zip(self.strings('wkeys', 'wkeyoff'), self['wvals']))
+        return Audience({self.literal(c) for c in self['assume']}, weight)
+
+    def proofstandard(self):
+        """
+        Build the proof standard, if one was saved.
+
+        :rtype: :class:`.ProofStandard` or None
+        """
+        if 'psdef' not in self:
+            return None
+        names = ProofStandard([]).proof_standards
+        return ProofStandard([(self.literal(c), names[s]) for (c, s) in
+                              zip(self['psprop'], self['psstd'])],
+                             default=names[self['psdef'][0]])
+
+
+def load(path, backend='adjacency'):
+    """
+    Load a file saved by :func:`save`.
+
+    :param path: The file to be loaded.
+    :type path: str
+    :param backend: The graph backend for the argument set.
+    :type backend: str
+    :rtype: :class:`Case`
+    """
+    with ArgumentFile(path) as f:
+        return Case(f.argument_set(backend), f.audience(), f.proofstandard())
@@ -0,0 +1,120 @@
+import os
+import struct
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+from carneades import binary
+from carneades.binary import save, load, ArgumentFile
+from carneades.caes import PropLiteral, Argument, ArgumentSet, Audience, \
+    ProofStandard, CAES
+
+class BinaryTestCase(unittest.TestCase):
+    """
+    Test cases for the binary format
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'case.carg')
+        self.p, self.q, self.r = map(PropLiteral, 'pqr')
+        self.argset = ArgumentSet()
+        self.argset.add_argument(Argument(self.p, premises={self.q},
+                                          exceptions={self.r}), arg_id='a1')
+        self.argset.add_argument(Argument(self.p.negate(),
+                                          premises={self.r}), arg_id='a2')
+        self.argset.add_argument(Argument(self.q))
+        self.audience = Audience({self.q}, {'a1': 0.6, 'a2': 0.4,
+                                            'arg3': 0.1})
+        self.ps = ProofStandard([(self.p, 'preponderance')],
+                                default='scintilla')
+
+    def patch(self, offset, data):
+        with open(self.path, 'r+b') as f:
+            f.seek(offset)
+            f.write(data)
+
+    def test_round_trip(self):
+        ''' A loaded case equals the one saved, and evaluates the same '''
+        save(self.path, self.argset, self.audience, self.ps)
+        case = load(self.path)
+        self.assertEqual(case.argset.freeze(), self.argset.freeze())
+        self.assertEqual(case.argset.arg_count, self.argset.arg_count)
+        self.assertEqual(case.audience, self.audience)
+        self.assertEqual(case.proofstandard.get_proofstandard(self.p),
+                         'preponderance')
+        self.assertEqual(case.proofstandard.default, 'scintilla')
+        before = CAES(self.argset, self.audience, self.ps).evaluate_all()
+        after = CAES(*case).evaluate_all()
+        self.assertEqual(after.accepted(), before.accepted())
+
+    def test_loaded_set_can_grow(self):
+        ''' Arguments added after loading get fresh IDs '''
+        save(self.path, self.argset)
+        case = load(self.path)
+        self.assertIsNone(case.audience)
+        self.assertIsNone(case.proofstandard)
+        case.argset.add_argument(Argument(self.r))
+        self.argset.add_argument(Argument(self.r))
+        self.assertEqual(case.argset.freeze(), self.argset.freeze())
+
+    def test_numeric_ids(self):
+        ''' Numeric argument IDs and weight keys are saved as strings '''
+        argset = ArgumentSet()
+        argset.add_argument(Argument(self.p, premises={self.q}), arg_id=7)
+        audience = Audience({self.q}, {7: 0.5})
+        save(self.path, argset, audience)
+        case = load(self.path)
+        self.assertEqual([arg.arg_id for arg in case.argset.arguments],
+                         ['7'])
+        self.assertEqual(case.audience.weight, {'7': 0.5})
+        self.assertTrue(CAES(case.argset, case.audience,
+                             ProofStandard([])).acceptable(self.p))
+        audience.weight['7'] = 0.4
+        self.assertRaisesRegex(ValueError, 'given twice', save, self.path,
+                               argset, audience)
+
+    def test_sections(self):
+        ''' Sections are exposed without building objects '''
+        save(self.path, self.argset)
+        with ArgumentFile(self.path) as f:
+            self.assertIn('concl', f)
+            self.assertNotIn('assume', f)
+            self.assertEqual([f.literal(c) for c in f['concl']],
+                             [self.p, self.p.negate(), self.q])
+
+    def test_bad_magic(self):
+        ''' Raises error on a file which is not in the binary format '''
+        save(self.path, self.argset)
+        self.patch(0, b'CARNAGE\x00')
+        with self.assertRaisesRegex(ValueError, 'not an argument file'):
+            ArgumentFile(self.path)
+
+    def test_bad_version(self):
+        ''' Raises error on a file in another version of the format '''
+        save(self.path, self.argset)
+        self.patch(8, binary._HEADER.pack(binary.MAGIC,
+                                          binary.FORMAT_VERSION + 1, 0,
+                                          0)[8:12])
+        with self.assertRaisesRegex(ValueError, 'not an argument file'):
+            ArgumentFile(self.path)
+
+    def test_byte_order(self):
+        ''' Raises error on a file saved with the other byte order '''
+        save(self.path, self.argset)
+        other = 0 if sys.byteorder == 'big' else 1
+        self.patch(12, binary._HEADER.pack(binary.MAGIC, 0, other,
+                                           0)[12:16])
+        with self.assertRaisesRegex(ValueError, 'different byte order'):
+            ArgumentFile(self.path)
+
+    def test_truncated(self):
+        ''' Raises error on a file too short for its header '''
+        with open(self.path, 'wb') as f:
+            f.write(binary.MAGIC)
+        self.assertRaises(struct.error, ArgumentFile, self.path)
+
+if __name__ == '__main__':
+    unittest.main()
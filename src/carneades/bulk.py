@@ -0,0 +1,208 @@
+# Bulk input for the Carneades Argument Evaluation Structure
+#
+# For license information, see LICENSE
+
+"""
+Loading large corpora of arguments from flat files, with one argument per
+line of a JSON Lines file or per row of a CSV file.
+
+Each argument has the fields
+
+* ``conclusion``: the conclusion, as a literal such as ``kill`` or
+  ``-intent``, where a leading ``-`` negates the proposition;
+
+* ``premises`` and ``exceptions`` (optional): literals, as a JSON list or, in
+  a CSV file, separated by ``;``;
+
+* ``weight`` (optional): the weight which the audience gives the argument,
+  by default 0.0;
+
+* ``side`` (optional): ``Prosecution`` (the default) or ``Defense``, as for
+  the ``by`` argument of a :class:`.Reader` command;
+
+* ``id`` (optional): the ID of the argument, by default assigned by the
+  :class:`.ArgumentSet`.
+
+A JSON Lines file looks like ::
+
+    {"id": "arg1", "conclusion": "kill", "weight": 0.8}
+    {"id": "arg2", "conclusion": "intent", "premises": ["witness1"],
+     "exceptions": ["unreliable1"], "weight": 0.3}
+
+(with each argument on a single line), and the same arguments in a CSV
+file look like ::
+
+    id,conclusion,premises,exceptions,weight,side
+    arg1,kill,,,0.8,
+    arg2,intent,witness1,unreliable1,0.3,
+
+Unlike a case file for :class:`.Reader`, there are no commands to be
+interpreted: the file is read one argument at a time and the arguments
+are added to the argument set with a single call to
+:meth:`.ArgumentSet.add_arguments`, while their weights are collected for
+the :class:`.Audience`. The tests are in ``bulk_tests.py``.
+"""
+
+from collections import namedtuple
+import csv
+import json
+
+from carneades.caes import PropLiteral, Argument, ArgumentSet, Audience
+
+FIELDS = ('id', 'conclusion', 'premises', 'exceptions', 'weight', 'side')
+"""
+The fields of an argument.
+"""
+
+SIDES = ('Prosecution', 'Defense')
+"""
+The sides which can put forward an argument; the first is the default.
+"""
+
+FORMATS = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv'}
+"""
+The format of a file, by its suffix, when no format is given to :func:`load`.
+"""
+
+Corpus = namedtuple('Corpus', ['argset', 'audience', 'sides'])
+"""
+A corpus loaded by :func:`load`: the :class:`.ArgumentSet`, the
+:class:`.Audience` and the side of each argument, by argument ID.
+"""
+
+
+def literal(text):
+    """
+    The literal written as ``text``, with a leading ``-`` for a negative
+    literal.
+
+    >>> literal('-intent')
+    -intent
+
+    :param text: The literal.
+    :type text: str
+    :rtype: :class:`.PropLiteral`
+    """
+    if text.startswith('-'):
+        return PropLiteral(text[1:], polarity=False)
+    return PropLiteral(text)
+
+
+def _jsonl_records(f):
+    """
+    Read the arguments of a JSON Lines file, skipping blank lines.
+    """
+    for (number, line) in enumerate(f, 1):
+        if line.strip():
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError("{}, line {}: {}".format(f.name, number, e))
+            if not isinstance(record, dict):
+                raise ValueError("{}, line {}: not a JSON object".format(
+                    f.name, number))
+            yield number, record
+
+
+def _csv_records(f):
+    """
+    Read the arguments of a CSV file, which starts with a header row.
+    Empty fields are left out, and lists of literals are split on ``;``.
+    """
+    rows = csv.reader(f)
+    header = next(rows, [])
+    for (number, row) in enumerate(rows, 2):
+        record = {}
+        for (name, value) in zip(header, row):
+            if value:
+                if name == 'premises' or name == 'exceptions':
+                    value = [v for v in value.split(';') if v]
+                record[name] = value
+        if record:
+            yield number, record
+
+
+def load(path, assumptions=(), format=None, backend='adjacency'):
+    """
+    Load a corpus of arguments from a JSON Lines or CSV file.
+
+    :param path: The file to be loaded.
+    :type path: str
+    :param assumptions: The assumptions of the audience, as literals or as\
+    text for :func:`literal`.
+    :type assumptions: iterable
+    :param format: ``'jsonl'`` or ``'csv'``; by default, the format is\
+    chosen by the suffix of the file, see :data:`FORMATS`.
+    :type format: str or None
+    :param backend: The graph backend for the argument set.
+    :type backend: str
+    :rtype: :class:`Corpus`
+    :raises ValueError: if the format is unknown, or an argument is invalid\
+    or has the same ID as an earlier one
+    """
+    if format is None:
+        suffix = path[path.rfind('.'):].lower() if '.' in path else ''
+        if suffix not in FORMATS:
+            raise ValueError("Cannot tell the format of {} from its suffix; "
+                             "give one of {}".format(
+                                 path, sorted(set(FORMATS.values()))))
+        format = FORMATS[suffix]
+    if format == 'jsonl':
+        records = _jsonl_records
+    elif format == 'csv':
+        records = _csv_records
+    else:
+        raise ValueError("Unknown format '{}'".format(format))
+
+    argset = ArgumentSet(backend)
+    weights = {}
+    sides = {}
+    # the same literals come up again and again
+    literals = {}
+
+    def lookup(text):
+        try:
+            return literals[text]
+        except KeyError:
+            literals[text] = result = literal(text)
+            return result
+
+    def arguments(f):
+        for (number, record) in records(f):
+            try:
+                for name in record:
+                    if name not in FIELDS:
+                        raise ValueError("unknown field '{}'".format(name))
+                if 'conclusion' not in record:
+                    raise ValueError("no conclusion")
+                side = record.get('side', SIDES[0])
+                if side not in SIDES:
+                    raise ValueError("{} invalid value".format(side))
+                weight = float(record.get('weight', 0.0))
+                for name in ('premises', 'exceptions'):
+                    if not isinstance(record.get(name, []), list):
+                        raise ValueError("{} should be a list".format(name))
+                argument = Argument(
+                    lookup(record['conclusion']),
+                    premises=[lookup(p) for p in record.get('premises', ())],
+                    exceptions=[lookup(e)
+                                for e in record.get('exceptions', ())])
+                if record.get('id') not in (None, ''):
+                    arg_id = str(record['id'])
+                else:
+                    # the ID which add_arguments would assign is known in
+                    # advance
+                    arg_id = 'arg{}'.format(argset.arg_count)
+                if arg_id in weights:
+                    raise ValueError("duplicate id '{}'".format(arg_id))
+            except (ValueError, TypeError, AttributeError) as e:
+                raise ValueError("{}, line {}: {}".format(path, number, e))
+            weights[arg_id] = weight
+            sides[arg_id] = side
+            yield argument, arg_id
+
+    with open(path, 'r', newline='') as f:
+        argset.add_arguments(arguments(f))
+    audience = Audience({p if isinstance(p, PropLiteral) else lookup(p)
+                         for p in assumptions}, weights)
+    return Corpus(argset, audience, sides)
@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+from carneades.binary import save
+from carneades.bulk import load
+from carneades.caes import PropLiteral
+
+JSONL = ('{"id": "arg1", "conclusion": "kill", "weight": 0.8}\n'
+         '\n'
+         '{"id": "arg_i", "conclusion": "intent", "premises": ["witness1"], '
+         '"exceptions": ["unreliable1"], "weight": 0.3, "side": "Defense"}\n'
+         '{"conclusion": "-intent", "premises": ["witness2"]}\n')
+
+CSV = ('id,conclusion,premises,exceptions,weight,side\n'
+       'arg1,kill,,,0.8,\n'
+       'arg_i,intent,witness1,unreliable1,0.3,Defense\n'
+       ',-intent,witness2,,,\n')
+
+class BulkTestCase(unittest.TestCase):
+    """
+    Test cases for loading corpora of arguments
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def check_corpus(self, corpus):
+        intent = PropLiteral('intent')
+        argset = corpus.argset
+        self.assertEqual([str(arg) for arg in argset.get_arguments(intent)],
+                         ['[witness1], ~[unreliable1] => intent'])
+        self.assertEqual([arg.arg_id for arg in
+                          argset.get_arguments(intent.negate())], ['arg3'])
+        self.assertEqual(corpus.audience.weight,
+                         {'arg1': 0.8, 'arg_i': 0.3, 'arg3': 0.0})
+        self.assertEqual(corpus.sides, {'arg1': 'Prosecution',
+                                        'arg_i': 'Defense',
+                                        'arg3': 'Prosecution'})
+
+    def test_jsonl(self):
+        ''' Loads the arguments, weights and sides of a JSON Lines file '''
+        corpus = load(self.write('corpus.jsonl', JSONL),
+                      assumptions=['witness1', PropLiteral('witness2')])
+        self.check_corpus(corpus)
+        self.assertEqual(corpus.audience.assumptions,
+                         {PropLiteral('witness1'), PropLiteral('witness2')})
+
+    def test_csv(self):
+        ''' A CSV file gives the same corpus as a JSON Lines file '''
+        self.check_corpus(load(self.write('corpus.csv', CSV)))
+
+    def test_format(self):
+        ''' The format is given, or else chosen by the suffix '''
+        path = self.write('corpus.txt', CSV)
+        self.assertRaises(ValueError, load, path)
+        self.check_corpus(load(path, format='csv'))
+        self.assertRaises(ValueError, load, path, format='xml')
+
+    def test_numeric_id(self):
+        ''' A numeric ID is stored as a string, and can be saved '''
+        corpus = load(self.write('corpus.jsonl',
+                                 '{"id": 7, "conclusion": "kill"}\n'))
+        self.assertEqual([arg.arg_id for arg in corpus.argset.arguments],
+                         ['7'])
+        save(os.path.join(self.dir, 'corpus.bin'), corpus.argset)
+
+    def test_malformed_rows(self):
+        ''' Raises error naming the line of an invalid argument '''
+        rows = ['{"conclusion": "kill", "premises": "abc"}',
+                '{"conclusion": "kill", "exceptions": {"a": 1}}',
+                '{"premises": ["a"]}',
+                '{"conclusion": "kill", "colour": "red"}',
+                '{"conclusion": "kill", "side": "Jury"}',
+                '{"conclusion": "kill", "weight": "heavy"}',
+                '{"conclusion": 5}',
+                '["kill"]',
+                '{"conclusion": ']
+        for row in rows:
+            path = self.write('corpus.jsonl', '\n{"conclusion": "a"}\n' + row)
+            with self.assertRaisesRegex(ValueError, ', line 3: '):
+                load(path)
+
+    def test_malformed_csv_row(self):
+        ''' Raises error naming the row of an invalid CSV argument '''
+        path = self.write('corpus.csv', CSV + 'arg4,,kill,,,\n')
+        with self.assertRaisesRegex(ValueError, ', line 5: no conclusion'):
+            load(path)
+
+    def test_duplicate_ids(self):
+        ''' Raises error on an ID used twice, even if assigned '''
+        path = self.write('corpus.jsonl', JSONL + '{"id": "arg_i", '
+                          '"conclusion": "kill"}\n')
+        with self.assertRaisesRegex(ValueError, "line 5: duplicate id"):
+            load(path)
+        path = self.write('corpus.jsonl', JSONL + '{"id": "arg3", '
+                          '"conclusion": "kill"}\n')
+        with self.assertRaisesRegex(ValueError, "line 5: duplicate id"):
+            load(path)
+
+if __name__ == '__main__':
+    unittest.main()
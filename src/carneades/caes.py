@@ -112,7 +112,7 @@ Once an audience has been defined, we can use it to initialise a
 [witness1], ~[unreliable1] => intent
 [witness2], ~[unreliable2] => -intent
 
-The :meth:`get_arguments` method returns the list of arguments in an
+The :meth:`get_arguments` method returns the arguments in an
 :class:`ArgumentSet` which support a given proposition.
 
 A proposition is said to be *acceptable* in a CAES if it meets its required
@@ -156,26 +156,32 @@ False
 """
 
 
-from collections import namedtuple, defaultdict
+from collections import namedtuple
+from functools import wraps
 import logging
 import os
 import sys
+import threading
+from types import MappingProxyType
+import weakref
 
-from igraph import Graph, plot
-# fix to ensure that package is loaded properly on system path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+if not __package__:
+    # when run as a script, make sure that the package can be imported
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from carneades.graph import make_graph, ReadOnlyGraph
 from carneades.tracecalls import TraceCalls
 
+# Debug messages are sent to this logger; applications which want to see them
+# should configure logging themselves.
+logger = logging.getLogger(__name__)
 
 #LOGLEVEL = logging.DEBUG
 # Uncomment the following line to raise the logging level and thereby turn off
-# debug messages
+# debug messages when running this module as a script
 LOGLEVEL = logging.INFO
 
 
-logging.basicConfig(format='%(levelname)s: %(message)s', level=LOGLEVEL)
-
 class PropLiteral(object):
     """
     Proposition literals have most of the properties of ordinary strings,
@@ -184,54 +190,108 @@ class PropLiteral(object):
     >>> a = PropLiteral('a')
     >>> a.negate().negate() == a
     True
+
+    Literals are interned: there is only ever one literal with a given
+    string and polarity, so it can be compared by identity, and it is
+    created together with its negation.
+
+    >>> PropLiteral('a') is a
+    True
+    >>> a.negate() is PropLiteral('a', polarity=False)
+    True
+
+    Each literal also has a small integer ``id``. The ids of a literal and
+    its negation differ only in the lowest bit.
+
+    >>> a.negate().id == a.id ^ 1
+    True
+
+    Literals are immutable, and stay in the intern table for the lifetime
+    of the process.
     """
-    def __init__(self, string, polarity=True):
+    __slots__ = ('_string', 'polarity', 'id', '_hash', '_label', '_negation')
+
+    # interned literals, by string for positive literals and by id for all
+    _atoms = {}
+    _literals = []
+    _lock = threading.Lock()
+
+    def __new__(cls, string, polarity=True):
         """
         Propositions are either positive or negative atoms.
         """
-        self.polarity = polarity
-        self._string = string
-
+        try:
+            positive = cls._atoms[string]
+        except KeyError:
+            with cls._lock:
+                positive = cls._atoms.get(string)
+                if positive is None:
+                    positive = cls._intern(string)
+        return positive if polarity else positive._negation
+
+    @classmethod
+    def _intern(cls, string):
+        """
+        Create the positive and negative literals for a new atom.
+        """
+        positive = object.__new__(cls)
+        negative = object.__new__(cls)
+        first = len(cls._literals)
+        for (literal, polarity, label, negation) in \
+                [(positive, True, string, negative),
+                 (negative, False, "-" + string, positive)]:
+            literal_id = first if polarity else first + 1
+            for (name, value) in [('_string', string), ('polarity', polarity),
+                                  ('id', literal_id), ('_hash', literal_id),
+                                  ('_label', label), ('_negation', negation)]:
+                object.__setattr__(literal, name, value)
+        cls._literals.extend([positive, negative])
+        cls._atoms[string] = positive
+        return positive
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PropLiteral objects are immutable")
 
     def negate(self):
         """
         Negation of a proposition.
 
-        We create a copy of the current proposition and flip its polarity.
+        The negation is created along with the proposition, so this just
+        returns it.
         """
-        polarity = (not self.polarity)
-        return PropLiteral(self._string, polarity=polarity)
-
+        return self._negation
 
     def __str__(self):
         """
         Override ``__str__()`` so that negation is realised as a prefix on the
         string.
         """
-        if self.polarity:
-            return self._string
-        return "-" + self._string
+        return self._label
 
     def __hash__(self):
-        return self._string.__hash__()
+        return self._hash
 
     def __repr__(self):
-        return self.__str__()
+        return self._label
 
     def __eq__(self, other):
-        if isinstance(other, self.__class__):
-            return self.__str__() == other.__str__()
-        else:
-            return False
+        return self is other
 
     def __ne__(self, other):
-        return not self.__eq__(other)
+        return self is not other
 
     def __lt__(self, other):
-        return self.__str__() < other.__str__()
+        return self._label < other._label
 
+    def __reduce__(self):
+        # unpickling interns the literal again
+        return (PropLiteral, (self._string, self.polarity))
 
+    def __copy__(self):
+        return self
 
+    def __deepcopy__(self, memo):
+        return self
 
 
 class Argument(object):
@@ -242,8 +302,27 @@ class Argument(object):
     Although arguments should have identifiers (`arg_id`), it is preferable
     to specify these when calling the :meth:`add_argument` method of
     :class:`ArgumentSet`.
+
+    Arguments are immutable, apart from their identifier: the premises and
+    exceptions are stored as sorted tuples, along with tuples of the ids of
+    their literals (see :class:`PropLiteral`), so that they can be checked
+    against the assumptions of an audience without creating any objects.
+
+    >>> a, b = PropLiteral('a'), PropLiteral('b')
+    >>> arg = Argument(a, premises={b})
+    >>> arg.premises
+    (b,)
+    >>> arg.premise_ids == (b.id,)
+    True
+    >>> arg.conclusion = b
+    Traceback (most recent call last):
+        ...
+    AttributeError: Argument objects are immutable
     """
-    def __init__(self, conclusion, premises=set(), exceptions=set()):
+    __slots__ = ('conclusion', 'premises', 'exceptions', 'premise_ids',
+                 'exception_ids', 'arg_id', '_label')
+
+    def __init__(self, conclusion, premises=(), exceptions=()):
         """
         :param conclusion: The conclusion of the argument.
         :type conclusion: :class:`PropLiteral`
@@ -252,12 +331,25 @@ class Argument(object):
         :param exceptions: The exceptions of the argument
         :type exceptions: set(:class:`PropLiteral`)
         """
-
-        self.conclusion = conclusion
-        self.premises = premises
-        self.exceptions = exceptions
-        self.arg_id = None
-
+        premises = tuple(sorted(set(premises)))
+        exceptions = tuple(sorted(set(exceptions)))
+        for (name, value) in [('conclusion', conclusion),
+                              ('premises', premises),
+                              ('exceptions', exceptions),
+                              ('premise_ids', tuple(p.id for p in premises)),
+                              ('exception_ids',
+                               tuple(e.id for e in exceptions)),
+                              ('_label', None), ('arg_id', None)]:
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        if name != 'arg_id':
+            raise AttributeError("Argument objects are immutable")
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        return (Argument, (self.conclusion, self.premises, self.exceptions),
+                (None, {'arg_id': self.arg_id}))
 
     def __str__(self):
         """
@@ -268,15 +360,12 @@ class Argument(object):
 
         Premises and exceptions are sorted to facilitate doctest comparison.
         """
-        if len(self.premises) == 0:
-            prems = "[]"
-        else:
-            prems = sorted(self.premises)
-        if len(self.exceptions) == 0:
-            excepts = "[]"
-        else:
-            excepts = sorted(self.exceptions)
-        return "{}, ~{} => {}".format(prems, excepts, self.conclusion)
+        if self._label is None:
+            label = "{}, ~{} => {}".format(list(self.premises),
+                                           list(self.exceptions),
+                                           self.conclusion)
+            object.__setattr__(self, '_label', label)
+        return self._label
 
 
 class ArgumentSet(object):
@@ -285,19 +374,156 @@ class ArgumentSet(object):
     the components of an argument. A vertex corresponding to the conclusion
     of an argument *A* will **depend on** the premises and exceptions in *A*.
 
-    The graph is built using the `igraph <http://igraph.org/>`_ library. This
-    allows *attributes* to be associated with both vertices and edges.
-    Attributes are represented as Python dictionaries where the key (which
-    must be a string) is the name of the attribute and the value is the
-    attribute itself. For more details, see the
-    `igraph tutorial\
-    <http://igraph.org/python/doc/tutorial/tutorial.html#setting-and-retrieving-attributes>`_.
+    The graph is stored by one of the backends in :mod:`carneades.graph`.
+    Each vertex has two *attributes*: ``prop``, which holds the proposition
+    represented by the vertex, and ``arg``, which holds the ID of the
+    argument represented by the vertex; the one which does not apply is
+    ``None``. The default ``'adjacency'`` backend is a pure-Python structure;
+    the ``'igraph'`` backend stores the graph in an
+    `igraph <http://igraph.org/>`_ ``Graph`` instead. Either way, igraph is
+    only needed by :meth:`draw`.
     """
-    def __init__(self):
-        self.graph = Graph()
-        self.graph.to_directed()
+    def __init__(self, backend='adjacency'):
+        """
+        :parameter backend: The name of the graph backend, see\
+        :data:`carneades.graph.BACKENDS`.
+        :type backend: str
+        """
+        self.graph = make_graph(backend)
         self.arg_count = 1
         self.arguments = []
+        # indexes from propositions and argument IDs to their vertices
+        self._prop_index = {}
+        self._arg_index = {}
+        # the arguments pro each conclusion; the arguments con a proposition
+        # are those pro its negation
+        self._conclusion_index = {}
+        # the arguments which have each proposition as a premise or exception
+        self._premise_index = {}
+        # the arguments with each ID
+        self._id_index = {}
+        # incremented on every change to the graph, so that clients such as
+        # :class:`CAES` can tell when results computed from it are stale
+        self.version = 0
+        # callbacks to be told about each change, see subscribe()
+        self._subscribers = []
+        # how to undo each change since the first open checkpoint, and the
+        # open checkpoints, as positions in the undo log; see checkpoint()
+        self._undo = []
+        self._checkpoints = []
+
+    @classmethod
+    def from_graph(cls, arguments, props, args, edges, arg_count=None,
+                   backend='adjacency'):
+        """
+        Build an argument set from its arguments and a graph which has
+        already been laid out, e.g. one saved by :mod:`carneades.binary`,
+        without adding the arguments one at a time.
+
+        The graph must be the one that :meth:`add_arguments` would build for
+        the arguments; this is not checked.
+
+        >>> p, q = PropLiteral('p'), PropLiteral('q')
+        >>> argset = ArgumentSet()
+        >>> argset.add_argument(Argument(p, premises={q}), arg_id='a1')
+        >>> argument = Argument(p, premises={q})
+        >>> argument.arg_id = 'a1'
+        >>> graph = argset.graph
+        >>> copy = ArgumentSet.from_graph([argument], graph.attribute('prop'),
+        ...                               graph.attribute('arg'),
+        ...                               graph.edges())
+        >>> copy.freeze() == argset.freeze()
+        True
+
+        :param arguments: The arguments, each with its ``arg_id`` set.
+        :type arguments: list(:class:`Argument`)
+        :param props: The ``prop`` attribute of each vertex.
+        :type props: list(:class:`PropLiteral` or None)
+        :param args: The ``arg`` attribute of each vertex.
+        :type args: list(str or None)
+        :param edges: The edges, as pairs of vertex indexes.
+        :type edges: list(tuple(int, int))
+        :param arg_count: The counter for the IDs of arguments added later;\
+        by default, one more than the number of arguments.
+        :type arg_count: int or None
+        :param backend: The name of the graph backend.
+        :type backend: str
+        :rtype: :class:`ArgumentSet`
+        """
+        argset = cls(backend)
+        for argument in arguments:
+            argset._index_argument(argument)
+        argset.graph.add_vertices(props, args)
+        argset.graph.add_edges(edges)
+        for (index, (prop, arg_id)) in enumerate(zip(props, args)):
+            if prop is not None:
+                argset._prop_index[prop] = index
+            if arg_id is not None:
+                argset._arg_index.setdefault(arg_id, index)
+        if arg_count is None:
+            arg_count = len(arguments) + 1
+        argset.arg_count = arg_count
+        argset.version += 1
+        return argset
+
+    def __getstate__(self):
+        # subscribers and checkpoints belong to this argument set, not to
+        # copies of it
+        state = self.__dict__.copy()
+        for name in ('_subscribers', '_undo', '_checkpoints'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._subscribers = []
+        self._undo = []
+        self._checkpoints = []
+
+    def subscribe(self, callback):
+        """
+        Ask to be told about every change to the argument set.
+
+        After each change, ``callback`` is called with the argument set, the
+        list of arguments which were added, or removed by
+        :meth:`remove_argument` or :meth:`rollback` (which may be empty, if
+        only a proposition was added) and the value of :attr:`version` before
+        the change. A bound method is only held by a weak reference, so
+        subscribing does not keep its object alive.
+
+        :param callback: The function to be called.
+        """
+        try:
+            ref = weakref.WeakMethod(callback)
+        except TypeError:
+            ref = lambda: callback
+        # forget the subscribers which have been garbage collected, so that
+        # short-lived ones do not pile up between changes
+        self._subscribers = [r for r in self._subscribers
+                             if r() is not None]
+        self._subscribers.append(ref)
+
+    def unsubscribe(self, callback):
+        """
+        Stop calling a function passed to :meth:`subscribe`.
+
+        :param callback: The function to be removed.
+        """
+        self._subscribers = [ref for ref in self._subscribers
+                             if ref() not in (None, callback)]
+
+    def _notify(self, arguments, previous_version):
+        """
+        Call the subscribers after a change, forgetting those which have
+        been garbage collected.
+        """
+        live = []
+        for ref in self._subscribers:
+            callback = ref()
+            if callback is not None:
+                live.append(ref)
+                callback(self, arguments, previous_version)
+        self._subscribers = live
 
     def propset(self):
         """
@@ -305,16 +531,10 @@ class ArgumentSet(object):
         the graph.
 
         Retrieving this set relies on the fact that :meth:`add_proposition`
-        sets a value for the ``prop`` attribute in vertices created when a
-        new proposition is added to the graph.
+        records the vertex created when a new proposition is added to the
+        graph.
         """
-        g = self.graph
-        props = set()
-        try:
-            props = {p for p in g.vs['prop']}
-        except KeyError:
-            pass
-        return props
+        return set(self._prop_index)
 
     def add_proposition(self, proposition):
         """
@@ -323,25 +543,38 @@ class ArgumentSet(object):
         :param proposition: The proposition to be added to the graph.
         :type proposition: :class:`PropLiteral`
         :return: The graph vertex corresponding to the proposition.
-        :rtype: :class:`Graph.Vertex`
+        :rtype: :class:`carneades.graph.Vertex` or :class:`igraph.Vertex`
         :raises TypeError: if the input is not a :class:`PropLiteral`.
         """
         if isinstance(proposition, PropLiteral):
-            if proposition in self.propset():
-                logging.debug("Proposition '{}' is already in graph".\
-                              format(proposition))
-            else:
-                # add the proposition as a vertex attribute, recovered via the
-                # key 'prop'
-                self.graph.add_vertex(prop=proposition)
-                logging.debug("Added proposition '{}' to graph".\
-                              format(proposition))
-            return self.graph.vs.select(prop=proposition)[0]
-
+            return self.graph.vertex(self._proposition_vertex(proposition))
         else:
             raise TypeError('Input {} should be PropLiteral'.\
                             format(proposition))
 
+    def _proposition_vertex(self, proposition):
+        """
+        Find the index of the vertex for a proposition, adding the vertex
+        if it is not already present.
+        """
+        try:
+            index = self._prop_index[proposition]
+            logger.debug("Proposition '{}' is already in graph".\
+                          format(proposition))
+        except KeyError:
+            # add the proposition as a vertex attribute, recovered via the
+            # key 'prop'
+            index = self.graph.add_vertices([proposition], [None])
+            self._prop_index[proposition] = index
+            if self._checkpoints:
+                self._undo.append(('add', index, [proposition], [None], [],
+                                   [], [], self.arg_count))
+            self.version += 1
+            logger.debug("Added proposition '{}' to graph".\
+                          format(proposition))
+            self._notify([], self.version - 1)
+        return index
+
     def add_argument(self, argument, arg_id=None):
         """
         Add an argument to the graph.
@@ -351,68 +584,518 @@ class ArgumentSet(object):
         :parameter arg_id: The ID of the argument
         :type arg_id: str or None
         """
+        self.add_arguments([(argument, arg_id)])
+
+    def add_arguments(self, arguments):
+        """
+        Add several arguments to the graph at once.
+
+        The vertices and edges needed for all the arguments are collected
+        first and then created with a single call each to the graph, which
+        is much faster than adding the arguments one by one.
+
+        :parameter arguments: The arguments to be added to the graph, each\
+        optionally paired with its ID as in :meth:`add_argument`.
+        :type arguments: iterable(:class:`Argument` or\
+        tuple(:class:`Argument`, str or None))
+        """
         g = self.graph
-        if arg_id is not None:
+        first = g.vcount()
+        arg_count = self.arg_count
+        added = []
+        # the IDs of the arguments before they were added, for rollback()
+        old_ids = []
+        # attributes of the vertices to be created, in order of index
+        props = []
+        args = []
+        edges = []
+
+        def proposition_vertex(proposition):
+            try:
+                return self._prop_index[proposition]
+            except KeyError:
+                index = first + len(props)
+                props.append(proposition)
+                args.append(None)
+                self._prop_index[proposition] = index
+                return index
+
+        try:
+            for argument in arguments:
+                if isinstance(argument, Argument):
+                    arg_id = None
+                else:
+                    argument, arg_id = argument
+                    if not isinstance(argument, Argument):
+                        raise TypeError('Input {} should be Argument'.\
+                                        format(argument))
+                old_ids.append(argument.arg_id)
+                if arg_id is not None:
+                    argument.arg_id = arg_id
+                else:
+                    argument.arg_id = 'arg{}'.format(self.arg_count)
+                self.arg_count += 1
+                added.append(argument)
+                self._index_argument(argument)
+                conclusion = argument.conclusion
+
+                # the arg_id is recovered via the 'arg' key; if the ID is
+                # already in use, edges go to the vertex that has it
+                arg_index = self._arg_index.setdefault(argument.arg_id,
+                                                       first + len(props))
+                props.append(None)
+                args.append(argument.arg_id)
+
+                conclusion_index = proposition_vertex(conclusion)
+                proposition_vertex(conclusion.negate())
+                edges.append((conclusion_index, arg_index))
+                for prop in sorted(argument.premises):
+                    edges.append((arg_index, proposition_vertex(prop)))
+                for prop in sorted(argument.exceptions):
+                    edges.append((arg_index, proposition_vertex(prop)))
+        except BaseException:
+            # nothing has been added to the graph yet, so forget the
+            # arguments which were indexed before the failure
+            self._forget(first, props, args, added, old_ids, arg_count)
+            raise
+
+        if props:
+            g.add_vertices(props, args)
+            g.add_edges(edges)
+            if self._checkpoints:
+                self._undo.append(('add', first, props, args, edges, added,
+                                   old_ids, arg_count))
+            self.version += 1
+            self._notify(added, self.version - 1)
+
+    def _forget(self, first, props, args, added, old_ids, arg_count):
+        """
+        Undo the changes made to the indexes, but not the graph, by adding
+        arguments and propositions whose vertices were to start at index
+        ``first``; see :meth:`add_arguments`.
+        """
+        for prop in props:
+            if prop is not None:
+                del self._prop_index[prop]
+        for arg_id in args:
+            if arg_id is not None and \
+               self._arg_index.get(arg_id, -1) >= first:
+                del self._arg_index[arg_id]
+        for (argument, arg_id) in zip(reversed(added),
+                                      reversed(old_ids[:len(added)])):
+            self._unindex_argument(argument)
             argument.arg_id = arg_id
-        else:
-            argument.arg_id = 'arg{}'.format(self.arg_count)
-        self.arg_count += 1
+        self.arg_count = arg_count
+
+    def _index_argument(self, argument):
+        """
+        Record an argument, which already has its ID, in :attr:`arguments`
+        and in the indexes by ID, by conclusion and by premise or exception.
+        This does not touch the graph.
+        """
         self.arguments.append(argument)
+        self._id_index[argument.arg_id] = \
+            self._id_index.get(argument.arg_id, ()) + (argument,)
+        conclusion = argument.conclusion
+        self._conclusion_index[conclusion] = \
+            self._conclusion_index.get(conclusion, ()) + (argument,)
+        for prop in set(argument.premises + argument.exceptions):
+            self._premise_index[prop] = \
+                self._premise_index.get(prop, ()) + (argument,)
+
+    def _unindex_argument(self, argument):
+        """
+        Remove the last occurrence of an argument from :attr:`arguments` and
+        from the indexes; the converse of :meth:`_index_argument`.
 
-        # add the arg_id as a vertex attribute, recovered via the 'arg' key
-        self.graph.add_vertex(arg=argument.arg_id)
-        arg_v = g.vs.select(arg=argument.arg_id)[0]
+        :return: The position of the argument in :attr:`arguments`, and\
+        the index entries which were changed, with their old values.
+        :rtype: tuple(int, list(tuple(dict, object, tuple)))
+        """
+        arguments = self.arguments
+        for position in range(len(arguments) - 1, -1, -1):
+            if arguments[position] is argument:
+                break
+        else:
+            raise ValueError("Argument '{}' is not in the argument set".\
+                             format(argument))
+        del arguments[position]
+        entries = [(self._id_index, argument.arg_id),
+                   (self._conclusion_index, argument.conclusion)]
+        entries.extend((self._premise_index, prop) for prop in
+                       set(argument.premises + argument.exceptions))
+        changed = []
+        for (index, key) in entries:
+            old = index[key]
+            for i in range(len(old) - 1, -1, -1):
+                if old[i] is argument:
+                    break
+            if len(old) == 1:
+                del index[key]
+            else:
+                index[key] = old[:i] + old[i + 1:]
+            changed.append((index, key, old))
+        return position, changed
 
-        # add proposition vertices to the graph
-        conclusion_v = self.add_proposition(argument.conclusion)
-        self.add_proposition(argument.conclusion.negate())
-        premise_vs =\
-            [self.add_proposition(prop) for prop in sorted(argument.premises)]
-        exception_vs =\
-            [self.add_proposition(prop) for prop in sorted(argument.exceptions)]
-        target_vs = premise_vs + exception_vs
+    def remove_argument(self, argument):
+        """
+        Remove an argument from the graph.
 
-        # add new edges to the graph
-        edge_to_arg = [(conclusion_v.index, arg_v.index)]
-        edges_from_arg = [(arg_v.index, target.index) for target in target_vs]
-        g.add_edges(edge_to_arg + edges_from_arg)
+        The edges of the argument are deleted, and so is its ID, unless
+        another argument has the same ID; propositions stay in the graph,
+        even if no argument uses them any more. Deleting the edges takes
+        time proportional to the number of edges added since the argument
+        was, so retracting recently added arguments is cheap; to try out
+        arguments and take them back again, :meth:`checkpoint` and
+        :meth:`rollback` are simpler still.
 
+        :parameter argument: The argument to be removed.
+        :type argument: :class:`Argument`
+        :raises ValueError: if the argument is not in the argument set.
+        """
+        position, changed = self._unindex_argument(argument)
+        arg_id = argument.arg_id
+        arg_index = self._arg_index[arg_id]
+        prop_index = self._prop_index
+        edges = [(prop_index[argument.conclusion], arg_index)]
+        for prop in sorted(argument.premises):
+            edges.append((arg_index, prop_index[prop]))
+        for prop in sorted(argument.exceptions):
+            edges.append((arg_index, prop_index[prop]))
+        self.graph.delete_edges(edges)
+        if arg_id not in self._id_index:
+            # no other argument has the ID, so its vertex is left empty
+            self.graph.set_attribute('arg', arg_index, None)
+            del self._arg_index[arg_id]
+        else:
+            arg_index = None
+        if self._checkpoints:
+            self._undo.append(('remove', argument, position, changed, edges,
+                               arg_index))
+        self.version += 1
+        self._notify([argument], self.version - 1)
+
+    def checkpoint(self):
+        """
+        Mark the current state of the argument set, so that it can be
+        restored with :meth:`rollback`.
+
+        While a checkpoint is open, every change is recorded in an undo
+        log, and rolling back undoes the changes made since the checkpoint
+        in time proportional to their size, however large the argument set
+        is. Checkpoints can be nested, and stay open until they are
+        released with :meth:`release`.
+
+        >>> p, q, r = PropLiteral('p'), PropLiteral('q'), PropLiteral('r')
+        >>> argset = ArgumentSet()
+        >>> argset.add_argument(Argument(p, premises={q}))
+        >>> token = argset.checkpoint()
+        >>> argset.add_argument(Argument(q, premises={r}))
+        >>> sorted(argset.propset())
+        [-p, -q, p, q, r]
+        >>> argset.rollback(token)
+        >>> sorted(argset.propset())
+        [-p, p, q]
+        >>> argset.release(token)
+
+        :return: A token for :meth:`rollback` and :meth:`release`.
+        :rtype: int
+        """
+        token = len(self._undo)
+        self._checkpoints.append(token)
+        return token
+
+    def rollback(self, token):
+        """
+        Undo all the changes made since a checkpoint. The checkpoint stays
+        open, so it can be rolled back to again, but any checkpoints made
+        after it are released.
+
+        :param token: A token returned by :meth:`checkpoint`.
+        :type token: int
+        :raises ValueError: if the checkpoint is not open.
+        """
+        if token not in self._checkpoints:
+            raise ValueError("{} is not an open checkpoint".format(token))
+        self._checkpoints = [t for t in self._checkpoints if t <= token]
+        undo = self._undo
+        if len(undo) == token:
+            return
+        graph = self.graph
+        # the arguments taken out or put back
+        affected = []
+        while len(undo) > token:
+            change = undo.pop()
+            if change[0] == 'add':
+                (first, props, args, edges, added, old_ids,
+                 arg_count) = change[1:]
+                graph.delete_edges(edges)
+                graph.truncate(first)
+                self._forget(first, props, args, added, old_ids, arg_count)
+                affected.extend(added)
+            else:
+                argument, position, changed, edges, arg_index = change[1:]
+                affected.append(argument)
+                self.arguments.insert(position, argument)
+                for (index, key, old) in changed:
+                    index[key] = old
+                graph.add_edges(edges)
+                if arg_index is not None:
+                    graph.set_attribute('arg', arg_index, argument.arg_id)
+                    self._arg_index[argument.arg_id] = arg_index
+        self.version += 1
+        self._notify(affected, self.version - 1)
+
+    def release(self, token):
+        """
+        Close a checkpoint, keeping the changes made since it. Once every
+        checkpoint is released, changes are no longer recorded.
+
+        :param token: A token returned by :meth:`checkpoint`.
+        :type token: int
+        :raises ValueError: if the checkpoint is not open.
+        """
+        if token not in self._checkpoints:
+            raise ValueError("{} is not an open checkpoint".format(token))
+        self._checkpoints.remove(token)
+        if not self._checkpoints:
+            self._undo = []
 
     def get_arguments(self, proposition):
         """
         Find the arguments for a proposition in an *ArgumentSet*.
 
+        The arguments are kept in an index by conclusion as they are added,
+        so this does not need to search the graph.
+
         :param proposition: The proposition to be checked.
         :type proposition: :class:`PropLiteral`
-        :return: A list of the arguments pro the proposition
-        :rtype: list(:class:`Argument`)
+        :return: The arguments pro the proposition
+        :rtype: tuple(:class:`Argument`)
 
         :raises ValueError: if the input :class:`PropLiteral` isn't present\
         in the graph.
         """
-        g = self.graph
+        try:
+            return self._conclusion_index[proposition]
+        except KeyError:
+            if proposition in self._prop_index:
+                return ()
+            raise ValueError("Proposition '{}' is not in the current graph".\
+                             format(proposition))
 
-        # index of vertex associated with the proposition
-        vs = g.vs.select(prop=proposition)
+    def dependencies(self, proposition):
+        """
+        The propositions on which the acceptability of a proposition depends.
 
-        try:
-            conc_v_index = vs[0].index
-            # IDs of vertices reachable in one hop from the proposition's vertex
-            target_IDs = [e.target for e in g.es.select(_source=conc_v_index)]
+        These are the premises and exceptions of the arguments pro the
+        proposition and of the arguments con it, i.e. pro its negation.
 
-            # the vertices indexed by target_IDs
-            out_vs = [g.vs[i] for i in target_IDs]
+        :param proposition: The proposition to be checked.
+        :type proposition: :class:`PropLiteral`
+        :rtype: list(:class:`PropLiteral`)
+        """
+        deps = []
+        for conclusion in (proposition, proposition.negate()):
+            for arg in self._conclusion_index.get(conclusion, ()):
+                deps.extend(arg.premises)
+                deps.extend(arg.exceptions)
+        return deps
+
+    def freeze(self):
+        """
+        Take an immutable snapshot of the argument set.
 
-            arg_IDs = [v['arg'] for v in out_vs]
-            args = [arg for arg in self.arguments if arg.arg_id in arg_IDs]
-            return args
-        except IndexError:
-            raise ValueError("Proposition '{}' is not in the current graph".\
-                             format(proposition))
+        The argument set itself can still be changed afterwards, without
+        affecting the snapshot.
+
+        :rtype: :class:`FrozenArgumentSet`
+        """
+        return FrozenArgumentSet(self)
+
+    def arguments_with_id(self, arg_id):
+        """
+        Find the arguments with a given ID.
+
+        :param arg_id: The ID to be looked up.
+        :type arg_id: str
+        :rtype: tuple(:class:`Argument`)
+        """
+        return self._id_index.get(arg_id, ())
+
+    def arguments_using(self, proposition):
+        """
+        Find the arguments which have a proposition as a premise or as an
+        exception.
+
+        :param proposition: The proposition to be checked.
+        :type proposition: :class:`PropLiteral`
+        :rtype: tuple(:class:`Argument`)
+        """
+        return self._premise_index.get(proposition, ())
+
+    def dependents(self, proposition):
+        """
+        The propositions whose acceptability depends directly on a
+        proposition; the converse of :meth:`dependencies`.
+
+        :param proposition: The proposition to be checked.
+        :type proposition: :class:`PropLiteral`
+        :rtype: list(:class:`PropLiteral`)
+        """
+        deps = []
+        for arg in self.arguments_using(proposition):
+            deps.append(arg.conclusion)
+            deps.append(arg.conclusion.negate())
+        return deps
 
+    def upstream(self, propositions):
+        """
+        Find the propositions whose acceptability may change when that of
+        some given propositions does, i.e. the given propositions together
+        with everything that depends on them, directly or indirectly.
+
+        Only the affected part of the graph is visited.
+
+        :param propositions: The propositions which have changed.
+        :type propositions: iterable(:class:`PropLiteral`)
+        :rtype: set(:class:`PropLiteral`)
+        """
+        found = set(propositions)
+        todo = list(found)
+        while todo:
+            for dep in self.dependents(todo.pop()):
+                if dep not in found:
+                    found.add(dep)
+                    todo.append(dep)
+        return found
+
+    def ancestors(self, propositions, arguments=()):
+        """
+        Find the propositions whose acceptability may affect that of some
+        given propositions, i.e. the given propositions together with
+        everything that they depend on, directly or indirectly; the converse
+        of :meth:`upstream`. Every proposition comes with its negation, so
+        an argument can only affect the given propositions if its
+        conclusion is in the result.
+
+        Arguments which are not (yet) in the argument set can be taken into
+        account as well. Only the relevant part of the graph is visited.
+
+        >>> p, q, r, s = [PropLiteral(x) for x in 'pqrs']
+        >>> argset = ArgumentSet()
+        >>> argset.add_argument(Argument(p, premises={q}))
+        >>> sorted(argset.ancestors({p}))
+        [-p, -q, p, q]
+        >>> sorted(argset.ancestors({p}, [Argument(q.negate(), premises={r}),
+        ...                               Argument(s)]))
+        [-p, -q, -r, p, q, r]
+
+        :param propositions: The propositions to be checked.
+        :type propositions: iterable(:class:`PropLiteral`)
+        :param arguments: More arguments to be taken into account.
+        :type arguments: iterable(:class:`Argument`)
+        :rtype: set(:class:`PropLiteral`)
+        """
+        extra = {}
+        for arg in arguments:
+            extra[arg.conclusion] = extra.get(arg.conclusion, ()) + (arg,)
+        found = set()
+        todo = []
+        for prop in propositions:
+            if prop not in found:
+                found.update((prop, prop.negate()))
+                todo.append(prop)
+        while todo:
+            prop = todo.pop()
+            for conclusion in (prop, prop.negate()):
+                for index in (self._conclusion_index, extra):
+                    for arg in index.get(conclusion, ()):
+                        for dep in arg.premises + arg.exceptions:
+                            if dep not in found:
+                                found.update((dep, dep.negate()))
+                                todo.append(dep)
+        return found
+
+    def strongly_connected_components(self):
+        """
+        Partition the propositions in the graph into strongly connected
+        components of the dependency relation (see :meth:`dependencies`),
+        using an iterative version of Tarjan's algorithm.
+
+        The components are listed so that every component comes after all
+        the components that it depends on.
+
+        :rtype: list(list(:class:`PropLiteral`))
+        """
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+        for root in self.propset():
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.dependencies(root)))]
+            while work:
+                prop, deps = work[-1]
+                for dep in deps:
+                    if dep not in index:
+                        index[dep] = lowlink[dep] = len(index)
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self.dependencies(dep))))
+                        break
+                    elif dep in on_stack:
+                        lowlink[prop] = min(lowlink[prop], index[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[prop])
+                    if lowlink[prop] == index[prop]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == prop:
+                                break
+                        components.append(component)
+        return components
+
+    def is_cyclic(self, component):
+        """
+        Determine whether a strongly connected component contains a cycle,
+        i.e. whether it has more than one member or its single member
+        depends on itself.
 
+        :param component: A component returned by\
+        :meth:`strongly_connected_components`.
+        :type component: list(:class:`PropLiteral`)
+        :rtype: bool
+        """
+        return len(component) > 1 or \
+            component[0] in self.dependencies(component[0])
 
+    def evaluation_order(self):
+        """
+        Order the propositions in the graph so that every proposition comes
+        after all the propositions that it depends on.
 
+        :rtype: list(:class:`PropLiteral`)
+        :raises ValueError: if a proposition depends on itself.
+        """
+        order = []
+        for component in self.strongly_connected_components():
+            if self.is_cyclic(component):
+                raise ValueError("Proposition '{}' depends on itself".\
+                                 format(component[0]))
+            order.extend(component)
+        return order
 
     def draw(self, debug=False):
         """
@@ -420,7 +1103,7 @@ class ArgumentSet(object):
 
         :parameter debug: If :class:`True`, add the vertex index to the label.
         """
-        g = self.graph
+        g = self.graph.to_igraph()
 
         # labels for nodes that are classed as propositions
         labels = g.vs['prop']
@@ -458,11 +1141,11 @@ class ArgumentSet(object):
 
     def write_to_graphviz(self, fname=None):
         g = self.graph
+        props = g.attribute('prop')
+        args = g.attribute('arg')
         result = "digraph G{ \n"
 
-        for vertex in g.vs:
-            arg_label = vertex.attributes()['arg']
-            prop_label = vertex.attributes()['prop']
+        for (prop_label, arg_label) in zip(props, args):
 
             if arg_label:
                 dot_str = (arg_label +
@@ -474,13 +1157,14 @@ class ArgumentSet(object):
                            ' [color="black", fillcolor="lightblue", '
                            'fixedsize=true, width=1  shape="circle", '
                            'style="filled"]; \n')
+            else:
+                # the vertex of a removed argument
+                continue
             result += dot_str
 
-        for edge in g.es:
-            source_label = g.vs[edge.source]['prop'] if\
-                g.vs[edge.source]['prop'] else g.vs[edge.source]['arg']
-            target_label = g.vs[edge.target]['prop'] if\
-                g.vs[edge.target]['prop'] else g.vs[edge.target]['arg']
+        for (source, target) in g.edges():
+            source_label = props[source] if props[source] else args[source]
+            target_label = props[target] if props[target] else args[target]
             result += '"{}" -> "{}"'.format(source_label, target_label)
             dot_str = " ; \n"
             result += dot_str
@@ -493,6 +1177,164 @@ class ArgumentSet(object):
             print(result, file=f)
 
 
+class _FrozenArgument(Argument):
+    """
+    The copy of an :class:`Argument` held by a :class:`FrozenArgumentSet`,
+    whose identifier cannot be changed either, so that adding it to another
+    argument set cannot rename it inside the snapshot.
+    """
+    __slots__ = ()
+
+    def __init__(self, argument):
+        """
+        :param argument: The argument to be copied.
+        :type argument: :class:`Argument`
+        """
+        super().__init__(argument.conclusion, argument.premises,
+                         argument.exceptions)
+        object.__setattr__(self, 'arg_id', argument.arg_id)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("The arguments of a FrozenArgumentSet are "
+                             "immutable; use FrozenArgumentSet.thaw()")
+
+
+class FrozenArgumentSet(ArgumentSet):
+    """
+    An immutable snapshot of an :class:`ArgumentSet`, made by
+    :meth:`ArgumentSet.freeze`.
+
+    Everything which a :class:`CAES` needs from an argument set, including
+    the strongly connected components of the dependency relation, is
+    computed when the snapshot is made, and nothing changes afterwards, so
+    any number of threads can query a snapshot, or evaluate their own
+    :class:`CAES` on it, without locking. Snapshots with the same arguments
+    and propositions are equal, and can be used as dictionary keys.
+
+    The snapshot shares its :class:`PropLiteral` objects with the argument
+    set it was made from, but holds copies of its arguments, whose
+    identifiers cannot be changed, so adding an argument to another set
+    afterwards does not rename it in the snapshot. Its :attr:`graph` is a
+    :class:`.ReadOnlyGraph` and its indexes are read-only mappings, so the
+    snapshot cannot be changed through them either. Use :meth:`thaw` to get
+    an argument set which can be changed again.
+
+    >>> p, q = PropLiteral('p'), PropLiteral('q')
+    >>> argset = ArgumentSet()
+    >>> argset.add_argument(Argument(p, premises={q}), arg_id='a1')
+    >>> frozen = argset.freeze()
+    >>> frozen == argset.freeze()
+    True
+    >>> argset.add_argument(Argument(q), arg_id='a2')
+    >>> len(frozen.arguments), len(argset.arguments)
+    (1, 2)
+    >>> frozen.add_argument(Argument(q), arg_id='a2')
+    Traceback (most recent call last):
+        ...
+    TypeError: FrozenArgumentSet objects are immutable
+    >>> frozen.graph.add_vertices([q], [None])
+    Traceback (most recent call last):
+        ...
+    TypeError: ReadOnlyGraph objects are immutable
+    """
+    def __init__(self, argset):
+        """
+        :parameter argset: the argument set to be copied.
+        :type argset: :class:`ArgumentSet`
+        """
+        # a private copy of the graph, so that later changes to argset do
+        # not show through
+        graph = make_graph()
+        source = argset.graph
+        graph.add_vertices(list(source.attribute('prop')),
+                           list(source.attribute('arg')))
+        graph.add_edges(source.edges())
+        copies = {id(arg): _FrozenArgument(arg) for arg in argset.arguments}
+        state = {'graph': ReadOnlyGraph(graph),
+                 'arg_count': argset.arg_count,
+                 'arguments': tuple(copies[id(arg)]
+                                    for arg in argset.arguments),
+                 'version': argset.version,
+                 '_subscribers': (), '_undo': (), '_checkpoints': ()}
+        # the indexes are read-only views of private copies, which refer to
+        # the copies of the arguments
+        for name in ('_prop_index', '_arg_index'):
+            state[name] = MappingProxyType(dict(getattr(argset, name)))
+        for name in ('_conclusion_index', '_premise_index', '_id_index'):
+            state[name] = MappingProxyType(
+                {key: tuple(copies[id(arg)] for arg in value)
+                 for (key, value) in getattr(argset, name).items()})
+        self.__dict__.update(state)
+        components = tuple(tuple(component) for component in
+                           ArgumentSet.strongly_connected_components(self))
+        key = (tuple((arg.arg_id, arg.conclusion, arg.premises,
+                      arg.exceptions) for arg in self.arguments),
+               frozenset(self._prop_index))
+        self.__dict__.update({'_components': components, '_key': key,
+                              '_hash': hash(key)})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenArgumentSet objects are immutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return isinstance(other, FrozenArgumentSet) and \
+            self._key == other._key
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        return (FrozenArgumentSet, (self.thaw(),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenArgumentSet objects are immutable")
+
+    add_proposition = add_argument = add_arguments = _immutable
+    remove_argument = checkpoint = rollback = release = _immutable
+
+    def subscribe(self, callback):
+        """
+        A snapshot never changes, so there is nothing to be told about.
+        """
+
+    def unsubscribe(self, callback):
+        pass
+
+    def strongly_connected_components(self):
+        """
+        See :meth:`ArgumentSet.strongly_connected_components`; the
+        components were found when the snapshot was made.
+
+        :rtype: list(list(:class:`PropLiteral`))
+        """
+        return [list(component) for component in self._components]
+
+    def thaw(self):
+        """
+        Make an argument set with the same arguments and propositions, which
+        can be changed.
+
+        :rtype: :class:`ArgumentSet`
+        """
+        argset = ArgumentSet()
+        argset.add_arguments((Argument(arg.conclusion, arg.premises,
+                                       arg.exceptions), arg.arg_id)
+                             for arg in self.arguments)
+        for prop in sorted(self._prop_index):
+            argset.add_proposition(prop)
+        argset.arg_count = self.arg_count
+        return argset
+
+
 class ProofStandard(object):
     """
     Each proposition in a CAES is associated with a proof standard.
@@ -506,6 +1348,13 @@ class ProofStandard(object):
     Possible values for proof standards: `"scintilla"`, `"preponderance"`,
     `"clear_and_convincing"`, `"beyond_reasonable_doubt"`, and
     `"dialectical_validity"`.
+
+    The standards can be changed afterwards, through :attr:`config`, and a
+    :class:`CAES` which uses the proof standard notices the change.
+
+    >>> ps.config[intent] = "preponderance"
+    >>> ps.get_proofstandard(intent)
+    'preponderance'
     """
     def __init__(self, propstandards, default='scintilla'):
         """
@@ -517,10 +1366,35 @@ class ProofStandard(object):
                                 "clear_and_convincing",
                                 "beyond_reasonable_doubt",
                                 "dialectical_validity"]
+        # the standard of each proposition which does not have the default;
+        # it counts the changes made to it, see version
+        self.config = _Standards()
         self.default = default
-        self.config = defaultdict(lambda: self.default)
         self._set_standard(propstandards)
 
+    @property
+    def default(self):
+        """
+        The proof standard of the propositions not in :attr:`config`.
+
+        :rtype: str
+        """
+        return self.config.default
+
+    @default.setter
+    def default(self, default):
+        self.config.default = default
+
+    @property
+    def version(self):
+        """
+        The number of changes made to :attr:`config`, so that a
+        :class:`CAES` can tell when results computed with it are stale.
+
+        :rtype: int
+        """
+        return self.config.version
+
     def _set_standard(self, propstandards):
         for (prop, standard) in propstandards:
             if standard not in self.proof_standards:
@@ -552,14 +1426,286 @@ assigns weights to arguments.
 """
 
 
+BatchLabelling = namedtuple('BatchLabelling', ['propositions', 'acceptable',
+                                               'max_pro', 'max_con'])
+"""
+The status of every proposition in a CAES for many audiences, as computed by
+:meth:`CAES.evaluate_batch`.
+
+:param propositions: The propositions, in the order of the columns of the\
+other fields.
+:type propositions: list(:class:`PropLiteral`)
+
+:param acceptable: Whether each proposition is acceptable to each audience.
+:type acceptable: boolean array of shape (audiences, propositions)
+
+:param max_pro: The maximum weight of the applicable arguments pro each\
+proposition for each audience.
+:type max_pro: float array of shape (audiences, propositions)
+
+:param max_con: The maximum weight of the applicable arguments con each\
+proposition for each audience.
+:type max_con: float array of shape (audiences, propositions)
+"""
+
+ThresholdSweep = namedtuple('ThresholdSweep', ['alphas', 'gammas',
+                                               'propositions', 'acceptable',
+                                               'breakpoints'])
+"""
+The status of every proposition in a CAES over a grid of values of the
+thresholds ``alpha`` and ``gamma``, as computed by
+:meth:`CAES.sweep_thresholds`.
+
+:param alphas: The values of ``alpha``.
+:param gammas: The values of ``gamma``.
+:param propositions: The propositions, in the order of the last axis of\
+``acceptable``.
+:type propositions: list(:class:`PropLiteral`)
+
+:param acceptable: Whether each proposition is acceptable at each point of\
+the grid.
+:type acceptable: boolean array of shape (alphas, gammas, propositions)
+
+:param breakpoints: For each proposition, the values of ``alpha`` and of\
+``gamma`` in the grid at which its status differs from its status at the\
+previous value, for some value of the other threshold.
+:type breakpoints: dict(:class:`PropLiteral`, dict(str, list(float)))
+"""
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'size'])
+"""
+Statistics about the memo tables of a :class:`CAES`, in the style of
+:func:`functools.lru_cache`.
+
+:param hits: The number of lookups answered from the memo tables.
+:param misses: The number of lookups which had to be computed.
+:param size: The number of results currently held in the memo tables.
+"""
+
+_WEIGHED_STANDARDS = frozenset(['preponderance', 'clear_and_convincing',
+                                'beyond_reasonable_doubt'])
+"""
+The proof standards which compare the weights of arguments; the arguments
+pro and con a proposition with any other standard need no weights.
+"""
+
+
+class Labelling(object):
+    """
+    The status of every proposition and argument in a CAES, as computed by
+    :meth:`CAES.evaluate_all`.
+
+    All queries are dictionary lookups, except that the maximum weights pro
+    and con a proposition whose proof standard does not depend on weights
+    are only looked up when they are asked for, so that the arguments
+    concerned need not have weights.
+    """
+    def __init__(self, acceptable, applicable, max_pro, max_con,
+                 weight_of=None, unweighed=None):
+        """
+        :param acceptable: The acceptability of each proposition.
+        :type acceptable: dict(:class:`PropLiteral`, bool)
+        :param applicable: The applicability of each argument.
+        :type applicable: dict(:class:`Argument`, bool)
+        :param max_pro: The maximum weight of the applicable arguments pro\
+        each proposition.
+        :type max_pro: dict(:class:`PropLiteral`, float)
+        :param max_con: The maximum weight of the applicable arguments con\
+        each proposition.
+        :type max_con: dict(:class:`PropLiteral`, float)
+        :param weight_of: The weight of an argument, for the propositions\
+        in ``unweighed``.
+        :type weight_of: function
+        :param unweighed: The applicable arguments pro each conclusion\
+        whose maximum weight is not in ``max_pro`` or ``max_con``.
+        :type unweighed: dict(:class:`PropLiteral`, list(:class:`Argument`))
+        """
+        self._acceptable = acceptable
+        self._applicable = applicable
+        self._max_pro = max_pro
+        self._max_con = max_con
+        self._weight_of = weight_of
+        self._unweighed = unweighed or {}
+
+    def _max_weight(self, table, proposition, conclusion):
+        try:
+            return table[proposition]
+        except KeyError:
+            arguments = self._unweighed[conclusion]
+            table[proposition] = result = max(
+                (self._weight_of(arg) for arg in arguments), default=0.0)
+            return result
+
+    def acceptable(self, proposition):
+        """
+        :type proposition: :class:`PropLiteral`
+        :rtype: bool
+        """
+        return self._acceptable[proposition]
+
+    def applicable(self, argument):
+        """
+        :type argument: :class:`Argument`
+        :rtype: bool
+        """
+        return self._applicable[argument]
+
+    def max_weight_pro(self, proposition):
+        """
+        :type proposition: :class:`PropLiteral`
+        :rtype: float in interval [0, 1]
+        """
+        return self._max_weight(self._max_pro, proposition, proposition)
+
+    def max_weight_con(self, proposition):
+        """
+        :type proposition: :class:`PropLiteral`
+        :rtype: float in interval [0, 1]
+        """
+        return self._max_weight(self._max_con, proposition,
+                                proposition.negate())
+
+    def accepted(self):
+        """
+        The set of acceptable propositions.
+
+        :rtype: set(:class:`PropLiteral`)
+        """
+        return {p for (p, value) in self._acceptable.items() if value}
+
+
+def _tracked(base, mutators):
+    """
+    Make a subclass of ``base`` whose instances count how many times they
+    have been changed in place, in the attribute ``version``, so that a
+    :class:`CAES` can tell that its proof standards have changed without
+    comparing their contents.
+
+    :param base: The class to be extended, such as ``dict``.
+    :param mutators: The names of the methods of ``base`` which change an\
+    instance.
+    """
+    def counting(name):
+        method = getattr(base, name)
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            self.version += 1
+            return method(self, *args, **kwargs)
+        return wrapper
+
+    namespace = {name: counting(name) for name in mutators
+                 if hasattr(base, name)}
+    namespace['version'] = 0
+    namespace['__repr__'] = lambda self: repr(base(self))
+    return type('_Tracked' + base.__name__.capitalize(), (base,), namespace)
+
+
+_TrackedDict = _tracked(dict, ['__setitem__', '__delitem__', 'pop',
+                               'popitem', 'clear', 'update', 'setdefault',
+                               '__ior__'])
+
+
+class _Standards(_TrackedDict):
+    """
+    The proof standards of the propositions of a :class:`ProofStandard`,
+    which counts its changes like :class:`_TrackedDict`. Looking up a
+    proposition which has no standard of its own gives the default, without
+    adding it.
+    """
+    default = 'scintilla'
+
+    def __missing__(self, proposition):
+        return self.default
+
+
+def _memoized(table):
+    """
+    Decorator which caches the results of a one-argument method of
+    :class:`CAES` in the memo table called ``table``.
+
+    Before the outermost call of an evaluation, the memo tables are checked
+    against the argument set, audience and proof standard of the CAES and
+    are cleared if any of these has changed.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(self, key):
+            if self._depth == 0:
+                self._sync_cache()
+            memo = self._memo[table]
+            try:
+                result = memo[key]
+            except KeyError:
+                self._misses += 1
+            else:
+                self._hits += 1
+                return result
+
+            self._depth += 1
+            try:
+                result = fn(self, key)
+            finally:
+                self._depth -= 1
+            memo[key] = result
+            return result
+        return wrapper
+    return decorator
+
 
 class CAES(object):
     """
     A class that represents a Carneades Argument Evaluation Structure (CAES).
 
+    The acceptability of propositions, the applicability of arguments and
+    the maximum weights pro and con each proposition are memoized, so that
+    a premise shared by many arguments is only evaluated once. The memo
+    tables are invalidated automatically whenever the argument set, the
+    audience or the proof standard changes.
+
+    When arguments are added to an acyclic argument set, only the results
+    for their conclusions and for the propositions which depend on these are
+    discarded, and they are re-evaluated when next asked for. Changes to the
+    audience made with :meth:`update_audience` are handled in the same way.
+
+    The CAES shares the assumptions and weights of the :class:`Audience`
+    with the caller, and keeps a snapshot of them with its memoized results,
+    so changes made to them in place, whether through the audience, through
+    the set and dictionary it was made from, or through :attr:`assumptions`
+    and :attr:`weight`, are detected.
+
+    >>> p = PropLiteral('p')
+    >>> q = PropLiteral('q')
+    >>> argset = ArgumentSet()
+    >>> argset.add_argument(Argument(p, premises={q}), arg_id='a1')
+    >>> audience = Audience({q}, {'a1': 0.5})
+    >>> caes = CAES(argset, audience, ProofStandard([]))
+    >>> caes.acceptable(p)
+    True
+    >>> caes.acceptable(p)
+    True
+    >>> caes.cache_info()
+    CacheInfo(hits=1, misses=2, size=2)
+    >>> audience.assumptions.discard(q)
+    >>> caes.acceptable(p)
+    False
+
+    The set and dictionary the audience was made from are shared too:
+
+    >>> assumed, weights = set(), {'a1': 0.5}
+    >>> caes = CAES(argset, Audience(assumed, weights),
+    ...             ProofStandard([(p, 'preponderance')]))
+    >>> caes.acceptable(p)
+    False
+    >>> assumed.add(q)
+    >>> caes.acceptable(p)
+    True
+    >>> weights['a1'] = 0.0
+    >>> caes.acceptable(p)
+    False
     """
     def __init__(self, argset, audience, proofstandard, alpha=0.4, beta=0.3,
-                 gamma=0.2):
+                 gamma=0.2, trace=False):
         """
         :parameter argset: the argument set used in the CAES
         :type argset: :class:`ArgSet`
@@ -588,6 +1734,11 @@ class CAES(object):
         doubt".
 
         :type gamma: float in interval [0, 1]
+
+        :parameter trace: if ``True``, write out the calls made while\
+        evaluating this CAES; see :mod:`carneades.tracecalls`.
+
+        :type trace: bool
         """
         self.argset = argset
         self.assumptions = audience.assumptions
@@ -596,7 +1747,246 @@ class CAES(object):
         self.alpha = alpha
         self.beta = beta
         self.gamma = gamma
+        self.trace = trace
+        # the ids of the assumed literals, see Argument.premise_ids
+        self._assumed_ids = frozenset(p.id for p in self.assumptions)
+
+        self._memo = {'acceptable': {}, 'applicable': {},
+                      'max_weight_pro': {}, 'max_weight_con': {}}
+        self._memo_key = None
+        self._cycles = None
+        self._depth = 0
+        self._hits = 0
+        self._misses = 0
+        argset.subscribe(self._argset_changed)
+
+    @property
+    def assumptions(self):
+        """
+        The assumptions of the audience.
+
+        :rtype: set(:class:`PropLiteral`)
+        """
+        return self._assumptions
+
+    @assumptions.setter
+    def assumptions(self, assumptions):
+        self._assumptions = assumptions
+
+    @property
+    def weight(self):
+        """
+        The weights assigned by the audience to arguments, by argument ID.
+
+        :rtype: dict(str, float)
+        """
+        return self._weight
+
+    @weight.setter
+    def weight(self, weight):
+        self._weight = weight
+
+    def _cache_key(self):
+        """
+        Summarise everything that the memoized results depend on, so that
+        a change to any of it can be detected.
+
+        The assumptions and weights are the caller's own containers, which
+        do not count their changes, so they are summarised by snapshots of
+        their contents.
+        """
+        return (self.argset.version, self.standard.version,
+                self.standard.default, self.alpha, self.beta, self.gamma,
+                frozenset(self._assumptions),
+                frozenset(self._weight.items()))
+
+    def _sync_cache(self):
+        """
+        Clear the memo tables if the argument set, audience or proof standard
+        have changed since the memoized results were computed.
+        """
+        key = self._cache_key()
+        if key != self._memo_key:
+            for memo in self._memo.values():
+                memo.clear()
+            self._memo_key = key
+            self._assumed_ids = frozenset(p.id for p in self.assumptions)
+            if self._has_cycles():
+                # top-down evaluation would never bottom out, so answer every
+                # query from a bottom-up labelling instead
+                self._seed(self.evaluate_all())
+
+    def _argset_changed(self, argset, arguments, previous_version):
+        """
+        Called by the argument set after each change: discard only the
+        memoized results which the arguments added or removed may affect, if
+        the memo tables were up to date before the change.
+
+        If the memo tables were already stale, or the argument set has or may
+        now have cycles, nothing is done here and the memo tables are cleared
+        by :meth:`_sync_cache` as usual.
+        """
+        key = self._memo_key
+        if argset is not self.argset or key is None or \
+           key[0] != previous_version or \
+           self._cycles != (previous_version, False):
+            return
+        changed = set()
+        for arg in arguments:
+            changed.add(arg.conclusion)
+            changed.add(arg.conclusion.negate())
+        dirty = argset.upstream(changed)
+        for arg in arguments:
+            if any(p in dirty for p in arg.premises + arg.exceptions):
+                # the argument depends on its own conclusion
+                return
+        for table in ('acceptable', 'max_weight_pro', 'max_weight_con'):
+            memo = self._memo[table]
+            for prop in dirty:
+                memo.pop(prop, None)
+        memo = self._memo['applicable']
+        for prop in dirty:
+            for arg in argset.arguments_using(prop):
+                memo.pop(arg, None)
+        # a removed argument is no longer indexed by its premises, and may
+        # be put back later
+        for arg in arguments:
+            memo.pop(arg, None)
+        self._memo_key = (argset.version,) + key[1:]
+        self._cycles = (argset.version, False)
+
+    def update_audience(self, add_assumptions=(), remove_assumptions=(),
+                        weights=None):
+        """
+        Change the assumptions and weights of the audience, and find out
+        which propositions this makes acceptable or unacceptable.
+
+        Only the propositions which may be affected are re-evaluated: those
+        concluded by arguments which use a changed assumption (or its
+        negation) as a premise or exception, or whose weight has changed, and
+        the propositions which depend on these. If the argument set has
+        cycles, every proposition is re-evaluated instead.
+
+        :parameter add_assumptions: the literals to be assumed.
+        :type add_assumptions: iterable(:class:`PropLiteral`)
+
+        :parameter remove_assumptions: the literals to be no longer assumed.
+        :type remove_assumptions: iterable(:class:`PropLiteral`)
+
+        :parameter weights: new weights for arguments, by argument ID.
+        :type weights: dict(str, float) or None
+
+        :return: the propositions whose acceptability has changed.
+        :rtype: set(:class:`PropLiteral`)
+        :raises ValueError: if a literal is both added and removed.
+        """
+        argset = self.argset
+        add_assumptions = set(add_assumptions)
+        remove_assumptions = set(remove_assumptions)
+        if add_assumptions & remove_assumptions:
+            raise ValueError("Cannot both add and remove assumption '{}'".\
+                             format(min(add_assumptions & remove_assumptions)))
+        added = add_assumptions - self._assumptions
+        removed = remove_assumptions & self._assumptions
+        reweighted = {arg_id: weight for (arg_id, weight) in
+                      (weights or {}).items()
+                      if self._weight.get(arg_id) != weight}
+
+        # the arguments whose applicability may change, and the propositions
+        # whose acceptability may change as a direct result
+        touched = set()
+        for p in added | removed:
+            touched.update(argset.arguments_using(p))
+            touched.update(argset.arguments_using(p.negate()))
+        for arg_id in reweighted:
+            touched.update(argset.arguments_with_id(arg_id))
+        changed = set()
+        for arg in touched:
+            changed.add(arg.conclusion)
+            changed.add(arg.conclusion.negate())
+
+        self._sync_cache()
+        cyclic = self._has_cycles()
+        if cyclic:
+            region = argset.propset()
+        else:
+            region = argset.upstream(changed)
+        before = self._acceptable_in(region)
+
+        self._assumptions -= removed
+        self._assumptions |= added
+        self._weight.update(reweighted)
+        if not cyclic:
+            # the rest of the memo tables are still valid
+            for table in ('acceptable', 'max_weight_pro', 'max_weight_con'):
+                memo = self._memo[table]
+                for prop in region:
+                    memo.pop(prop, None)
+            memo = self._memo['applicable']
+            for arg in touched:
+                memo.pop(arg, None)
+            for prop in region:
+                for arg in argset.arguments_using(prop):
+                    memo.pop(arg, None)
+            self._memo_key = self._cache_key()
+            self._assumed_ids = frozenset(p.id for p in self._assumptions)
+        after = self._acceptable_in(region)
+        return {p for p in region if after[p] != before[p]}
+
+    def _acceptable_in(self, propositions):
+        """
+        The acceptability of each of some propositions, checking the memo
+        tables against the argument set, audience and proof standard once
+        rather than for every proposition.
+
+        :rtype: dict(:class:`PropLiteral`, bool)
+        """
+        self._sync_cache()
+        self._depth += 1
+        try:
+            return {p: self.acceptable(p) for p in propositions}
+        finally:
+            self._depth -= 1
+
+    def _has_cycles(self):
+        """
+        Determine whether any proposition in the argument set depends on
+        itself. The answer is cached until the argument set changes.
+        """
+        argset = self.argset
+        if self._cycles is None or self._cycles[0] != argset.version:
+            cyclic = any(argset.is_cyclic(component) for component in
+                         argset.strongly_connected_components())
+            self._cycles = (argset.version, cyclic)
+        return self._cycles[1]
+
+    def _seed(self, labelling):
+        """
+        Fill the memo tables from a :class:`Labelling`.
+        """
+        self._memo['acceptable'].update(labelling._acceptable)
+        self._memo['applicable'].update(labelling._applicable)
+        self._memo['max_weight_pro'].update(labelling._max_pro)
+        self._memo['max_weight_con'].update(labelling._max_con)
 
+    def cache_info(self):
+        """
+        Report how effective memoization has been for this CAES.
+
+        :rtype: :class:`CacheInfo`
+        """
+        size = sum(len(memo) for memo in self._memo.values())
+        return CacheInfo(self._hits, self._misses, size)
+
+    def cache_clear(self):
+        """
+        Clear the memo tables and reset the hit and miss counters.
+        """
+        for memo in self._memo.values():
+            memo.clear()
+        self._memo_key = None
+        self._hits = 0
+        self._misses = 0
 
     def get_all_arguments(self):
         """
@@ -606,6 +1996,7 @@ class CAES(object):
             print(arg)
 
     @TraceCalls()
+    @_memoized('applicable')
     def applicable(self, argument):
         """
         An argument is *applicable* in a CAES if it needs to be taken into
@@ -620,7 +2011,7 @@ class CAES(object):
         _acceptable = lambda p: self.acceptable(p)
         return self._applicable(argument, _acceptable)
 
-    def _applicable(self, argument, _acceptable):
+    def _applicable(self, argument, _acceptable, _acceptable_exception=None):
         """
         :parameter argument: The argument whose applicablility is being
         determined.
@@ -631,25 +2022,39 @@ class CAES(object):
         acceptability of a proposition in the CAES.
 
         :type _acceptable: LambdaType
+
+        :parameter _acceptable_exception: The function which determines the
+        acceptability of the exceptions of ``argument``, if it differs from
+        ``_acceptable``.
+
+        :type _acceptable_exception: LambdaType or None
         :rtype: bool
         """
-        logging.debug('Checking applicability of {}...'.format(argument.arg_id))
-        logging.debug('Current assumptions: {}'.format(self.assumptions))
-        logging.debug('Current premises: {}'.format(argument.premises))
-        b1 = all(p in self.assumptions or \
-                 (p.negate() not in self.assumptions and \
-                  _acceptable(p)) for p in argument.premises)
+        if _acceptable_exception is None:
+            _acceptable_exception = _acceptable
+        assumed = self._assumed_ids
+        logger.debug('Checking applicability of %s...', argument.arg_id)
+        logger.debug('Current assumptions: %s', self.assumptions)
+        logger.debug('Current premises: %s', argument.premises)
+        # the negation of the literal with id i has id i ^ 1
+        b1 = all(i in assumed or \
+                 (i ^ 1 not in assumed and \
+                  _acceptable(p))
+                 for (p, i) in zip(argument.premises, argument.premise_ids))
 
         if argument.exceptions:
-            logging.debug('Current exception: {}'.format(argument.exceptions))
-        b2 = all(e not in self.assumptions and \
-                 (e.negate() in self.assumptions or \
-                  not _acceptable(e)) for e in argument.exceptions)
+            logger.debug('Current exception: %s', argument.exceptions)
+        b2 = all(i not in assumed and \
+                 (i ^ 1 in assumed or \
+                  not _acceptable_exception(e))
+                 for (e, i) in zip(argument.exceptions,
+                                   argument.exception_ids))
 
         return b1 and b2
 
 
     @TraceCalls()
+    @_memoized('acceptable')
     def acceptable(self, proposition):
         """
         A conclusion is *acceptable* in a CAES if it can be arrived at under
@@ -664,7 +2069,7 @@ class CAES(object):
         """
 
         standard = self.standard.get_proofstandard(proposition)
-        logging.debug("Checking whether proposition '{}'"
+        logger.debug("Checking whether proposition '{}'"
                       "meets proof standard '{}'.".\
                       format(proposition, standard))
         return self.meets_proof_standard(proposition, standard)
@@ -700,11 +2105,11 @@ class CAES(object):
             mwc = self.max_weight_con(proposition)
             exceeds_alpha = mwp > self.alpha
             diff_exceeds_gamma = (mwp - mwc) > self.gamma
-            logging.debug("max weight pro '{}' is {}".format(proposition, mwp))
-            logging.debug("max weight con '{}' is {}".format(proposition, mwc))
-            logging.debug("max weight pro '{}' >  alpha '{}': {}".\
+            logger.debug("max weight pro '{}' is {}".format(proposition, mwp))
+            logger.debug("max weight con '{}' is {}".format(proposition, mwc))
+            logger.debug("max weight pro '{}' >  alpha '{}': {}".\
                           format(mwp, self.alpha, exceeds_alpha))
-            logging.debug("diff between pro and con = {} > gamma: {}".\
+            logger.debug("diff between pro and con = {} > gamma: {}".\
                           format(mwp-mwc, diff_exceeds_gamma))
 
             result = (mwp > self.alpha) and (mwp - mwc > self.gamma)
@@ -716,6 +2121,407 @@ class CAES(object):
 
         return result
 
+    def _satisfies(self, standard, applicable_pro, mwp, mwc, alpha=None,
+                   gamma=None):
+        """
+        Apply a proof standard to precomputed quantities for a proposition.
+
+        :parameter standard: a specific level of proof
+        :type standard: str
+        :parameter applicable_pro: whether any argument pro the proposition\
+        is applicable.
+        :type applicable_pro: bool
+        :parameter mwp: the maximum weight pro the proposition.
+        :parameter mwc: the maximum weight con the proposition.
+        :parameter alpha: the threshold ``alpha``, if not that of the CAES.
+        :parameter gamma: the threshold ``gamma``, if not that of the CAES.
+        :rtype: bool
+
+        The arguments may also be NumPy arrays, in which case the standard is
+        applied elementwise; this is why ``&`` is used rather than ``and``.
+        """
+        if alpha is None:
+            alpha = self.alpha
+        if gamma is None:
+            gamma = self.gamma
+        if standard == 'scintilla':
+            return applicable_pro
+        elif standard == 'preponderance':
+            return mwp > mwc
+        elif standard == 'clear_and_convincing':
+            return (mwp > alpha) & (mwp - mwc > gamma)
+        elif standard == 'beyond_reasonable_doubt':
+            return (mwp > alpha) & (mwp - mwc > gamma) & (mwc < gamma)
+        return applicable_pro & False
+
+    def evaluate_all(self):
+        """
+        Determine the status of every proposition and argument in the CAES.
+
+        Rather than querying each proposition top-down, the strongly
+        connected components of the dependency graph are visited once, each
+        after the components it depends on (see
+        :meth:`ArgumentSet.strongly_connected_components`). Acyclic
+        components consist of a single proposition, which is labelled
+        directly; cyclic components are resolved by :meth:`_fixpoint`.
+
+        :rtype: :class:`Labelling`
+        :raises ValueError: if an applicable argument weighed by its proof\
+        standard has no weight.
+        """
+        argset = self.argset
+        acceptable = {}
+        applicable = {}
+        max_pro = {}
+        max_con = {}
+        unweighed = {}
+        self._assumed_ids = frozenset(p.id for p in self.assumptions)
+
+        def arguments(proposition):
+            try:
+                return argset.get_arguments(proposition)
+            except ValueError:
+                return ()
+
+        def label(conclusion):
+            found = []
+            for arg in arguments(conclusion):
+                if arg not in applicable:
+                    applicable[arg] = \
+                        self._applicable(arg, acceptable.__getitem__)
+                if applicable[arg]:
+                    found.append(arg)
+            return found
+
+        def max_weight(found):
+            return max((self.weight_of(arg) for arg in found), default=0.0)
+
+        for component in argset.strongly_connected_components():
+            if argset.is_cyclic(component):
+                self._fixpoint(component, acceptable, applicable, arguments)
+            for prop in component:
+                pro = label(prop)
+                con = label(prop.negate())
+                standard = self.standard.get_proofstandard(prop)
+                if standard in _WEIGHED_STANDARDS:
+                    max_pro[prop] = max_weight(pro)
+                    max_con[prop] = max_weight(con)
+                else:
+                    # the weights are only needed if they are asked for
+                    unweighed[prop] = pro
+                    unweighed[prop.negate()] = con
+                if prop not in acceptable:
+                    acceptable[prop] = self._satisfies(
+                        standard, len(pro) > 0, max_pro.get(prop, 0.0),
+                        max_con.get(prop, 0.0))
+
+        return Labelling(acceptable, applicable, max_pro, max_con,
+                         self.weight_of, unweighed)
+
+    def _fixpoint(self, component, acceptable, applicable, arguments):
+        """
+        Label a cyclic component of the dependency graph, in the style of
+        grounded semantics.
+
+        Each proposition in the component starts out undecided. A proposition
+        is decided to be acceptable once it meets its proof standard however
+        the remaining undecided propositions turn out, and to be not
+        acceptable once it fails its proof standard however they turn out.
+        This is repeated until nothing changes, which takes at most one pass
+        per proposition in the component; whatever is still undecided is not
+        acceptable. An argument pro or con a proposition in the component is
+        applicable only if it is applicable however the undecided
+        propositions turn out.
+
+        :param component: The propositions in the component.
+        :param acceptable: The acceptability of the propositions in the\
+        components already visited; updated in place.
+        :param applicable: The applicability of the arguments already\
+        labelled; updated in place.
+        :param arguments: The function returning the arguments pro a\
+        proposition.
+        """
+        # None marks a proposition which is still undecided
+        status = dict.fromkeys(component)
+
+        def bound(optimistic):
+            def _acceptable(p):
+                if p in status:
+                    value = status[p]
+                    return optimistic if value is None else value
+                return acceptable[p]
+            return _acceptable
+
+        lower = bound(False)
+        upper = bound(True)
+
+        def applicable_bound(arg, optimistic):
+            # applicability rises with the acceptability of the premises and
+            # falls with the acceptability of the exceptions
+            if optimistic:
+                return self._applicable(arg, upper, lower)
+            return self._applicable(arg, lower, upper)
+
+        def satisfies(prop, optimistic):
+            pro = [arg for arg in arguments(prop)
+                   if applicable_bound(arg, optimistic)]
+            standard = self.standard.get_proofstandard(prop)
+            if standard not in _WEIGHED_STANDARDS:
+                return self._satisfies(standard, len(pro) > 0, 0.0, 0.0)
+            con = [arg for arg in arguments(prop.negate())
+                   if applicable_bound(arg, not optimistic)]
+            return self._satisfies(
+                standard, len(pro) > 0,
+                max((self.weight_of(arg) for arg in pro), default=0.0),
+                max((self.weight_of(arg) for arg in con), default=0.0))
+
+        changed = True
+        while changed:
+            changed = False
+            for prop in component:
+                if status[prop] is not None:
+                    continue
+                if satisfies(prop, optimistic=False):
+                    status[prop] = True
+                    changed = True
+                elif not satisfies(prop, optimistic=True):
+                    status[prop] = False
+                    changed = True
+
+        for prop in component:
+            for conclusion in (prop, prop.negate()):
+                for arg in arguments(conclusion):
+                    applicable[arg] = applicable_bound(arg, optimistic=False)
+        for prop in component:
+            acceptable[prop] = status[prop] is True
+
+    def evaluate_batch(self, weights_matrix, assumptions=None):
+        """
+        Evaluate the CAES for many audiences at once, which differ only in
+        the weights that they assign to arguments.
+
+        The propositions are visited once, in the same order as in
+        :meth:`evaluate_all`, and for each one the applicability of its
+        arguments, the maximum weights pro and con and the proof standard
+        are computed for all the audiences together as NumPy array
+        operations. If the argument set has cycles, each audience is
+        evaluated in turn with :meth:`evaluate_all` instead.
+
+        This requires `NumPy <http://www.numpy.org/>`_.
+
+        :parameter weights_matrix: the weight assigned by each audience to\
+        each argument, with one row per audience and one column per\
+        argument, in the order of ``argset.arguments``.
+        :type weights_matrix: array-like of shape (audiences, arguments)
+
+        :parameter assumptions: the assumptions shared by all the audiences;\
+        by default, those of the audience of the CAES.
+        :type assumptions: set(:class:`PropLiteral`) or None
+
+        :rtype: :class:`BatchLabelling`
+        """
+        import numpy as np
+
+        argset = self.argset
+        if assumptions is None:
+            assumptions = self.assumptions
+        weights = np.asarray(weights_matrix, dtype=float)
+        if weights.ndim != 2 or weights.shape[1] != len(argset.arguments):
+            raise ValueError("Expected a weights matrix with {} columns".\
+                             format(len(argset.arguments)))
+
+        if self._has_cycles():
+            caes_list = [CAES(argset,
+                              Audience(assumptions,
+                                       {arg.arg_id: w for (arg, w) in
+                                        zip(argset.arguments, row)}),
+                              self.standard, self.alpha, self.beta,
+                              self.gamma)
+                         for row in weights]
+            return self._evaluate_each(caes_list)
+
+        return self._evaluate_vectors(weights, assumptions, self.alpha,
+                                      self.gamma, weights.shape[0])
+
+    def sweep_thresholds(self, alphas, gammas):
+        """
+        Evaluate the CAES for every combination of values of the thresholds
+        ``alpha`` and ``gamma`` in a grid.
+
+        The weights of the arguments are the same at every point of the grid,
+        so a single pass over the propositions suffices: a quantity which
+        does not depend on the thresholds, such as the maximum weight pro a
+        proposition whose arguments only rest on propositions with the proof
+        standards "scintilla" or "preponderance", is computed once, and only
+        the quantities which do depend on the thresholds are computed for the
+        whole grid, as NumPy array operations. If the
+        argument set has cycles, each point of the grid is evaluated in turn
+        with :meth:`evaluate_all` instead.
+
+        ``beta`` does not take part in any proof standard, so it is not swept.
+
+        This requires `NumPy <http://www.numpy.org/>`_.
+
+        :parameter alphas: the values of ``alpha``.
+        :type alphas: list(float)
+        :parameter gammas: the values of ``gamma``.
+        :type gammas: list(float)
+        :rtype: :class:`ThresholdSweep`
+        :raises ValueError: if an argument weighed by its proof standard\
+        has no weight.
+        """
+        import numpy as np
+
+        alphas = np.asarray(alphas, dtype=float)
+        gammas = np.asarray(gammas, dtype=float)
+        grid_alpha, grid_gamma = np.meshgrid(alphas, gammas, indexing='ij')
+        grid_alpha = grid_alpha.ravel()
+        grid_gamma = grid_gamma.ravel()
+
+        if self._has_cycles():
+            audience = Audience(self.assumptions, self.weight)
+            caes_list = [CAES(self.argset, audience, self.standard, alpha,
+                              self.beta, gamma)
+                         for (alpha, gamma) in zip(grid_alpha, grid_gamma)]
+            labelling = self._evaluate_each(caes_list)
+        else:
+            standard = self.standard.get_proofstandard
+
+            def weight_of(arg):
+                # an argument which no proof standard weighs may have no
+                # weight; it only goes into max_pro and max_con, which are
+                # not part of the sweep
+                if standard(arg.conclusion) in _WEIGHED_STANDARDS or \
+                   standard(arg.conclusion.negate()) in _WEIGHED_STANDARDS:
+                    return self.weight_of(arg)
+                return self.weight.get(arg.arg_id, np.nan)
+
+            weights = np.array([[weight_of(arg)
+                                 for arg in self.argset.arguments]])
+            labelling = self._evaluate_vectors(weights, self.assumptions,
+                                               grid_alpha, grid_gamma,
+                                               len(grid_alpha))
+
+        shape = (len(alphas), len(gammas), len(labelling.propositions))
+        acceptable = labelling.acceptable.reshape(shape)
+        breakpoints = {}
+        for (k, prop) in enumerate(labelling.propositions):
+            status = acceptable[:, :, k]
+            flips_alpha = (status[1:, :] != status[:-1, :]).any(axis=1)
+            flips_gamma = (status[:, 1:] != status[:, :-1]).any(axis=0)
+            breakpoints[prop] = {'alpha': alphas[1:][flips_alpha].tolist(),
+                                 'gamma': gammas[1:][flips_gamma].tolist()}
+        return ThresholdSweep(alphas, gammas, labelling.propositions,
+                              acceptable, breakpoints)
+
+    def _evaluate_each(self, caes_list):
+        """
+        Evaluate several CAES over the same argument set one by one with
+        :meth:`evaluate_all`, and collect the results in a
+        :class:`BatchLabelling` with one row per CAES.
+        """
+        import numpy as np
+
+        components = self.argset.strongly_connected_components()
+        propositions = [p for component in components for p in component]
+        labellings = [caes.evaluate_all() for caes in caes_list]
+        shape = (len(labellings), len(propositions))
+        return BatchLabelling(
+            propositions,
+            np.array([[l.acceptable(p) for p in propositions]
+                      for l in labellings], dtype=bool).reshape(shape),
+            np.array([[l.max_weight_pro(p) for p in propositions]
+                      for l in labellings], dtype=float).reshape(shape),
+            np.array([[l.max_weight_con(p) for p in propositions]
+                      for l in labellings], dtype=float).reshape(shape))
+
+    def _evaluate_vectors(self, weights, assumptions, alpha, gamma, n):
+        """
+        Evaluate an acyclic CAES for ``n`` variants at once.
+
+        Every quantity is held as a NumPy vector with one entry per variant,
+        or with a single entry if it is the same for all of them, which
+        broadcasts against the others.
+
+        :parameter weights: the weights of the arguments, in the order of\
+        ``argset.arguments``, with either one row per variant or a single\
+        row.
+        :parameter assumptions: the assumptions, which are the same for all\
+        variants.
+        :parameter alpha: ``alpha`` for each variant, or a single value.
+        :parameter gamma: ``gamma`` for each variant, or a single value.
+        :parameter n: the number of variants.
+        :rtype: :class:`BatchLabelling`
+        """
+        import numpy as np
+
+        argset = self.argset
+        column = {arg: j for (j, arg) in enumerate(argset.arguments)}
+        assumed = frozenset(p.id for p in assumptions)
+        true = np.ones(weights.shape[0], dtype=bool)
+        false = np.zeros(weights.shape[0], dtype=bool)
+        acceptable = {}
+        applicable = {}
+
+        def applicability(arg):
+            # as in _applicable, with the acceptability of each premise and
+            # exception taken from the vectors already computed
+            result = true
+            for (p, i) in zip(arg.premises, arg.premise_ids):
+                if i in assumed:
+                    continue
+                if i ^ 1 in assumed:
+                    return false
+                result = result & acceptable[p]
+            for (e, i) in zip(arg.exceptions, arg.exception_ids):
+                if i in assumed:
+                    return false
+                if i ^ 1 in assumed:
+                    continue
+                result = result & ~acceptable[e]
+            return result
+
+        def label(conclusion):
+            try:
+                arguments = argset.get_arguments(conclusion)
+            except ValueError:
+                arguments = ()
+            if not arguments:
+                return false, np.zeros(weights.shape[0])
+            for arg in arguments:
+                if arg not in applicable:
+                    applicable[arg] = applicability(arg)
+            mask = np.column_stack(np.broadcast_arrays(
+                *[applicable[arg] for arg in arguments]))
+            columns = weights[:, [column[arg] for arg in arguments]]
+            any_applicable = mask.any(axis=1)
+            best = np.where(mask, columns, -np.inf).max(axis=1)
+            return any_applicable, np.where(any_applicable, best, 0.0)
+
+        propositions = []
+        max_pro = []
+        max_con = []
+        for (prop,) in argset.strongly_connected_components():
+            applicable_pro, mwp = label(prop)
+            _, mwc = label(prop.negate())
+            standard = self.standard.get_proofstandard(prop)
+            acceptable[prop] = self._satisfies(standard, applicable_pro,
+                                               mwp, mwc, alpha, gamma)
+            propositions.append(prop)
+            max_pro.append(mwp)
+            max_con.append(mwc)
+
+        def matrix(vectors, dtype):
+            result = np.empty((n, len(vectors)), dtype=dtype)
+            for (k, vector) in enumerate(vectors):
+                result[:, k] = vector
+            return result
+
+        return BatchLabelling(propositions,
+                              matrix([acceptable[p] for p in propositions],
+                                     bool),
+                              matrix(max_pro, float), matrix(max_con, float))
+
     def weight_of(self, argument):
         """
         Retrieve the weight associated by the CAES audience with an argument.
@@ -747,16 +2553,17 @@ class CAES(object):
 
         applicable_args = [arg for arg in arguments if self.applicable(arg)]
         if len(applicable_args) == 0:
-            logging.debug('No applicable arguments in {}'.format(arg_ids))
+            logger.debug('No applicable arguments in {}'.format(arg_ids))
             return 0.0
 
         applic_arg_ids = [arg.arg_id for arg in applicable_args]
-        logging.debug('Checking applicability and weights of {}'.\
+        logger.debug('Checking applicability and weights of {}'.\
                       format(applic_arg_ids))
         weights = [self.weight_of(argument) for argument in applicable_args]
-        logging.debug('Weights of {} are {}'.format(applic_arg_ids, weights))
+        logger.debug('Weights of {} are {}'.format(applic_arg_ids, weights))
         return max(weights)
 
+    @_memoized('max_weight_pro')
     def max_weight_pro(self, proposition):
         """
         The maximum of the weights pro the proposition.
@@ -770,6 +2577,7 @@ class CAES(object):
         args = self.argset.get_arguments(proposition)
         return self.max_weight_applicable(args)
 
+    @_memoized('max_weight_con')
     def max_weight_con(self, proposition):
         """
         The maximum of the weights con the proposition.
@@ -823,6 +2631,7 @@ DOCTEST = False
 
 if __name__ == '__main__':
 
+    logging.basicConfig(format='%(levelname)s: %(message)s', level=LOGLEVEL)
     if DOCTEST:
         import doctest
         doctest.testmod(optionflags=doctest.NORMALIZE_WHITESPACE)
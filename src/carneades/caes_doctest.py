@@ -42,6 +42,23 @@ e
 >>> print(e == f)
 True
 
+Literals are interned, so copies are the same object, and a literal
+and its negation hash differently.
+
+>>> e is g is f
+True
+>>> len({e, e.negate()})
+2
+>>> import copy, pickle
+>>> copy.deepcopy(e) is e
+True
+>>> pickle.loads(pickle.dumps(e.negate())) is e.negate()
+True
+>>> e.polarity = False
+Traceback (most recent call last):
+    ...
+AttributeError: PropLiteral objects are immutable
+
 
 Arguments
 ---------
@@ -76,6 +93,40 @@ Argument set
 >>> argset.propset() == {a, negb}
 True
 >>> v3 = argset.add_proposition(a)
+>>> v3.index == v0.index
+True
+
+Only propositions are reported by ``propset``, not the vertices for
+arguments.
+
+>>> argset.add_argument(Argument(a, premises={negb}), arg_id='arg_a')
+>>> argset.propset() == {a, a.negate(), negb}
+True
+>>> len(argset.get_arguments(a))
+1
+
+Arguments can also be added in bulk, with or without IDs.
+
+>>> argset.add_arguments([Argument(negb, premises={h}),
+...                       (Argument(negb, premises={i}), 'arg_negb')])
+>>> [arg.arg_id for arg in argset.get_arguments(negb)]
+['arg2', 'arg_negb']
+>>> argset.get_arguments(h)
+()
+
+If any item is not an argument, none of them is added.
+
+>>> version = argset.version
+>>> argset.add_arguments([Argument(h, premises={i}), 5])
+Traceback (most recent call last):
+    ...
+TypeError: cannot unpack non-iterable int object
+>>> argset.get_arguments(h), argset.version == version
+((), True)
+>>> argset.add_arguments([(Argument(h, premises={i}), 'arg_h')])
+>>> [arg.arg_id for arg in argset.get_arguments(h)]
+['arg_h']
+>>> argset.remove_argument(argset.get_arguments(h)[0])
 
 >>> kill = PropLiteral('kill')
 >>> intent = PropLiteral('intent')
@@ -139,6 +190,378 @@ Vacuously true if there are no premises
 >>> caes = CAES(argset, audience, ps)
 >>> caes._applicable(arg2, acceptability)
 True
+
+Memoization
++++++++++++
+
+A premise shared by several arguments is only evaluated once.
+
+>>> s = PropLiteral('s')
+>>> t = PropLiteral('t')
+>>> u = PropLiteral('u')
+>>> argset = ArgumentSet()
+>>> argset.add_argument(Argument(s, premises={t, u}), arg_id='s1')
+>>> argset.add_argument(Argument(t, premises={u}), arg_id='t1')
+>>> argset.add_argument(Argument(u, premises=set()), arg_id='u1')
+>>> weights = {'s1': 0.5, 't1': 0.5, 'u1': 0.5}
+>>> caes = CAES(argset, Audience(set(), weights), ProofStandard([]))
+>>> caes.acceptable(s)
+True
+>>> caes.cache_info()
+CacheInfo(hits=1, misses=6, size=6)
+
+Changing a proof standard after a query invalidates the memo tables.
+
+>>> caes.standard.config[s] = 'dialectical_validity'
+>>> caes.acceptable(s)
+False
+>>> del caes.standard.config[s]
+>>> caes.acceptable(s)
+True
+
+Changing the audience invalidates the memo tables.
+
+>>> caes.assumptions.add(u.negate())
+>>> caes.acceptable(s)
+False
+
+So does adding an argument to the argument set.
+
+>>> argset.add_argument(Argument(t, premises=set()), arg_id='t2')
+>>> caes.acceptable(t)
+True
+>>> caes.cache_clear()
+>>> caes.cache_info()
+CacheInfo(hits=0, misses=0, size=0)
+
+Only the results which a new argument can affect are discarded: those for
+its conclusion and for the propositions which depend on it. Here the new
+argument for `u` affects `t` and `s`, but not `v`.
+
+>>> v = PropLiteral('v')
+>>> argset.add_argument(Argument(v, premises=set()), arg_id='v1')
+>>> weights = {'s1': 0.5, 't1': 0.5, 'u1': 0.5, 't2': 0.5, 'v1': 0.5,
+...            'u2': 0.8}
+>>> caes = CAES(argset, Audience(set(), weights),
+...             ProofStandard([(u, 'preponderance')]))
+>>> caes.acceptable(s), caes.acceptable(v)
+(True, True)
+>>> sorted(argset.upstream({u}))
+[-s, -t, s, t, u]
+>>> argset.add_argument(Argument(u.negate(), premises=set()), arg_id='u2')
+>>> before = caes.cache_info()
+>>> caes.acceptable(v)
+True
+>>> caes.cache_info().hits - before.hits
+1
+>>> caes.acceptable(s), caes.acceptable(t)
+(False, True)
+
+Changing the audience
++++++++++++++++++++++
+
+``update_audience`` changes the assumptions and weights, re-evaluates only
+what they can affect, and reports which propositions changed status.
+
+>>> caes.update_audience(add_assumptions={u})
+{s}
+>>> caes.update_audience(weights={'u2': 0.2})
+{u}
+>>> caes.acceptable(u), caes.acceptable(s)
+(True, True)
+>>> sorted(caes.update_audience(remove_assumptions={u},
+...                             weights={'u1': 0.0}))
+[s, u]
+>>> caes.update_audience(add_assumptions={u}, remove_assumptions={u})
+Traceback (most recent call last):
+    ...
+ValueError: Cannot both add and remove assumption 'u'
+
+Frozen argument sets
+++++++++++++++++++++
+
+A frozen snapshot can be shared between threads, each evaluating its own
+CAES, while the original argument set goes on changing.
+
+>>> from concurrent.futures import ThreadPoolExecutor
+>>> frozen = argset.freeze()
+>>> hash(frozen) == hash(argset.freeze())
+True
+>>> def accepted(assumed):
+...     audience = Audience(assumed, weights)
+...     caes = CAES(frozen, audience, ProofStandard([]))
+...     return sorted(caes.evaluate_all().accepted())
+>>> with ThreadPoolExecutor(4) as pool:
+...     results = list(pool.map(accepted, [set(), {u}, {u.negate()}] * 4))
+>>> results[:3]
+[[-u, s, t, u, v], [-u, s, t, u, v], [-u, t, u, v]]
+>>> results == results[:3] * 4
+True
+>>> argset.add_argument(Argument(v.negate()), arg_id='v2')
+>>> len(frozen.arguments) == len(argset.arguments) - 1
+True
+
+Thawing gives back an argument set which can be changed, and pickling
+preserves the snapshot.
+
+>>> import pickle
+>>> thawed = frozen.thaw()
+>>> thawed.freeze() == frozen, pickle.loads(pickle.dumps(frozen)) == frozen
+(True, True)
+>>> frozen.arguments = []
+Traceback (most recent call last):
+    ...
+AttributeError: FrozenArgumentSet objects are immutable
+
+Nor can the graph or the indexes of the snapshot be changed in place.
+
+>>> frozen.graph.set_attribute('arg', 0, 'x')
+Traceback (most recent call last):
+    ...
+TypeError: ReadOnlyGraph objects are immutable
+>>> frozen._prop_index[v] = 0
+Traceback (most recent call last):
+    ...
+TypeError: 'mappingproxy' object does not support item assignment
+>>> frozen == argset.freeze(), frozen == thawed.freeze()
+(False, True)
+
+The snapshot holds copies of the arguments, so adding one of the original
+arguments to another set does not rename it in the snapshot, and the
+copies cannot be renamed.
+
+>>> original = argset.arguments[0]
+>>> before = [arg.arg_id for arg in frozen.arguments]
+>>> other = ArgumentSet()
+>>> token = other.checkpoint()
+>>> other.add_argument(original, arg_id='zzz')
+>>> original.arg_id
+'zzz'
+>>> [arg.arg_id for arg in frozen.arguments] == before
+True
+>>> frozen.get_arguments(original.conclusion)[0].arg_id == before[0]
+True
+>>> frozen == thawed.freeze()
+True
+>>> caes = CAES(frozen, Audience(set(), weights), ProofStandard([]))
+>>> sorted(caes.evaluate_all().accepted())
+[-u, s, t, u, v]
+>>> other.add_argument(frozen.arguments[0], arg_id='zzz')
+Traceback (most recent call last):
+    ...
+AttributeError: The arguments of a FrozenArgumentSet are immutable; use FrozenArgumentSet.thaw()
+>>> [arg.arg_id for arg in frozen.arguments] == before
+True
+>>> other.rollback(token)
+>>> original.arg_id == before[0]
+True
+
+Trying out arguments
+++++++++++++++++++++
+
+Arguments can be added to an argument set and then taken back again,
+without copying it, by rolling back to a checkpoint; a CAES on the
+argument set follows along.
+
+>>> weights['s2'] = 0.9
+>>> caes = CAES(argset, Audience(set(), weights),
+...             ProofStandard([(s, 'preponderance')]))
+>>> token = argset.checkpoint()
+>>> argset.add_argument(Argument(s.negate(), premises={v}), arg_id='s2')
+>>> caes.acceptable(s), caes.acceptable(s.negate())
+(False, True)
+>>> caes.acceptable(v)
+True
+>>> argset.rollback(token)
+>>> argset.arguments_with_id('s2')
+()
+>>> caes.acceptable(s), caes.acceptable(s.negate())
+(True, False)
+
+Rolling back only discards the results which the arguments taken back can
+affect, so the result for `v` is still memoized.
+
+>>> before = caes.cache_info()
+>>> caes.acceptable(v)
+True
+>>> caes.cache_info().hits - before.hits
+1
+
+Any argument can also be removed on its own, and rolling back puts it back.
+
+>>> argset.remove_argument(argset.arguments_with_id('t1')[0])
+>>> [str(arg) for arg in argset.get_arguments(t)]
+['[], ~[] => t']
+>>> argset.rollback(token)
+>>> len(argset.get_arguments(t))
+2
+
+A CAES which is no longer used is forgotten by the argument set the next
+time something subscribes to it.
+
+>>> subscribers = len(argset._subscribers)
+>>> for _ in range(100):
+...     _ = CAES(argset, Audience(set(), weights), ProofStandard([]))
+>>> len(argset._subscribers) <= subscribers + 2
+True
+>>> argset.release(token)
+>>> argset.rollback(token)
+Traceback (most recent call last):
+    ...
+ValueError: 0 is not an open checkpoint
+
+Evaluating the whole graph
+++++++++++++++++++++++++++
+
+>>> kill = PropLiteral('kill')
+>>> intent = PropLiteral('intent')
+>>> murder = PropLiteral('murder')
+>>> witness1 = PropLiteral('witness1')
+>>> unreliable1 = PropLiteral('unreliable1')
+>>> witness2 = PropLiteral('witness2')
+>>> unreliable2 = PropLiteral('unreliable2')
+>>> arg1 = Argument(murder, premises={kill, intent})
+>>> arg2 = Argument(intent, premises={witness1}, exceptions={unreliable1})
+>>> arg3 = Argument(intent.negate(), premises={witness2},
+...                 exceptions={unreliable2})
+>>> argset = ArgumentSet()
+>>> argset.add_argument(arg1, arg_id='arg1')
+>>> argset.add_argument(arg2, arg_id='arg2')
+>>> argset.add_argument(arg3, arg_id='arg3')
+
+Every proposition comes after the propositions it depends on.
+
+>>> order = argset.evaluation_order()
+>>> order.index(intent) < order.index(murder)
+True
+>>> order.index(witness1) < order.index(intent)
+True
+
+>>> assumptions = {kill, witness1, witness2, unreliable2}
+>>> weights = {'arg1': 0.8, 'arg2': 0.3, 'arg3': 0.8}
+>>> ps = ProofStandard([(intent, "preponderance")])
+>>> caes = CAES(argset, Audience(assumptions, weights), ps)
+>>> labelling = caes.evaluate_all()
+>>> sorted(labelling.accepted())
+[intent, murder]
+>>> labelling.applicable(arg2), labelling.applicable(arg3)
+(True, False)
+>>> labelling.max_weight_pro(intent), labelling.max_weight_con(intent)
+(0.3, 0.0)
+
+The labelling agrees with top-down evaluation.
+
+>>> all(labelling.acceptable(p) == caes.acceptable(p) for p in order)
+True
+
+Only the arguments for propositions whose proof standard compares weights
+need a weight.
+
+>>> partial = CAES(argset, Audience(assumptions, {'arg2': 0.3, 'arg3': 0.8}),
+...                ps)
+>>> sorted(partial.evaluate_all().accepted())
+[intent, murder]
+>>> sweep = partial.sweep_thresholds([0.1], [0.0])
+>>> bool(sweep.acceptable[0, 0, sweep.propositions.index(murder)])
+True
+
+Evaluating for many audiences
++++++++++++++++++++++++++++++
+
+Each row of the weights matrix is one audience's weights for the
+arguments in ``argset.arguments``.
+
+>>> batch = caes.evaluate_batch([[0.8, 0.3, 0.8],
+...                              [0.8, 0.0, 0.8],
+...                              [0.8, 0.3, 0.1]])
+>>> batch.acceptable.shape == (3, len(batch.propositions))
+True
+>>> column = batch.propositions.index(intent)
+>>> batch.acceptable[:, column].tolist()
+[True, False, True]
+>>> batch.max_pro[:, column].tolist()
+[0.3, 0.0, 0.3]
+
+Every row agrees with evaluating that audience on its own.
+
+>>> row = batch.acceptable[0].tolist()
+>>> row == [labelling.acceptable(p) for p in batch.propositions]
+True
+
+Sweeping the thresholds
++++++++++++++++++++++++
+
+With the standard "clear_and_convincing", `intent` is acceptable only while
+``alpha`` and ``gamma`` are both below its maximum weight pro, 0.3, and
+`murder` follows it.
+
+>>> ps = ProofStandard([(intent, "clear_and_convincing")])
+>>> caes = CAES(argset, Audience(assumptions, weights), ps)
+>>> sweep = caes.sweep_thresholds([0.1, 0.2, 0.4], [0.0, 0.5])
+>>> sweep.acceptable.shape == (3, 2, len(sweep.propositions))
+True
+>>> sweep.acceptable[:, :, sweep.propositions.index(intent)].tolist()
+[[True, False], [True, False], [False, False]]
+>>> sweep.breakpoints[murder]
+{'alpha': [0.4], 'gamma': [0.5]}
+>>> sweep.breakpoints[kill]
+{'alpha': [], 'gamma': []}
+
+Each point of the grid agrees with evaluating with those thresholds.
+
+>>> single = CAES(argset, Audience(assumptions, weights), ps, alpha=0.2,
+...               gamma=0.0).evaluate_all()
+>>> sweep.acceptable[1, 0].tolist() == [single.acceptable(p)
+...                                     for p in sweep.propositions]
+True
+
+Cyclic argument graphs
+++++++++++++++++++++++
+
+Here `p` and `q` support each other, and `r` is defeated by itself.
+
+>>> p = PropLiteral('p')
+>>> q = PropLiteral('q')
+>>> r = PropLiteral('r')
+>>> s = PropLiteral('s')
+>>> argset = ArgumentSet()
+>>> argset.add_argument(Argument(p, premises={q}), arg_id='a1')
+>>> argset.add_argument(Argument(q, premises={p}), arg_id='a2')
+>>> argset.add_argument(Argument(r, exceptions={r}), arg_id='a3')
+>>> components = argset.strongly_connected_components()
+>>> sorted(sorted(c) for c in components if argset.is_cyclic(c))
+[[p, q], [r]]
+>>> argset.evaluation_order() # doctest: +ELLIPSIS
+Traceback (most recent call last):
+    ...
+ValueError: Proposition '...' depends on itself
+
+Nothing in a cycle is acceptable unless something outside the cycle
+supports it.
+
+>>> weights = {'a1': 0.5, 'a2': 0.5, 'a3': 0.5, 'a4': 0.5}
+>>> caes = CAES(argset, Audience({s}, weights), ProofStandard([]))
+>>> caes.acceptable(p), caes.acceptable(q), caes.acceptable(r)
+(False, False, False)
+>>> argset.add_argument(Argument(q, premises={s}), arg_id='a4')
+>>> caes.acceptable(p), caes.acceptable(q), caes.acceptable(r)
+(True, True, False)
+>>> sorted(caes.evaluate_all().accepted())
+[p, q]
+
+Under the standard "scintilla", the arguments need no weights, even in a
+cycle; a weight is only looked up if it is asked for.
+
+>>> caes = CAES(argset, Audience({s}, {}), ProofStandard([]))
+>>> caes.acceptable(p), caes.acceptable(q), caes.acceptable(r)
+(True, True, False)
+>>> labelling = caes.evaluate_all()
+>>> sorted(labelling.accepted())
+[p, q]
+>>> labelling.max_weight_pro(p)
+Traceback (most recent call last):
+    ...
+ValueError: No weight assigned to argument 'a1'.
 """
 
 if __name__ == '__main__':
@@ -10,9 +10,10 @@ To run it :
 
 import os
 import sys
-from copy import deepcopy
 from itertools import combinations
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+if not __package__:
+    # when run as a script, make sure that the package can be imported
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from carneades.caes import CAES, ArgumentSet, ProofStandard, Audience 
 from carneades.reader import Reader
@@ -56,6 +57,30 @@ class Dialogue(object):
         else:
             return burdenOfProof
 
+    def relevantArguments(self, availArgs, argset, conclusion):
+        """
+        Function to pick out the arguments which could affect whether a conclusion is acceptable, ie. those whose
+        conclusion it depends on, through the arguments in the argument set or the other available arguments.
+        Nothing else needs to be searched.
+
+        :param availArgs: List of available args for the side.
+
+        :type availArgs: [:class:`.Argument`]
+
+        :param argset: The current Argument Set
+
+        :type argset: :class:`.ArgumentSet`
+
+        :param conclusion: The conclusion in dispute.
+
+        :type conclusion: :class:`.PropLiteral`
+
+        :rtype: [:class:`.Argument`]
+
+        """
+        relevant = argset.ancestors([conclusion], availArgs)
+        return [arg for arg in availArgs if arg.conclusion in relevant]
+
     def findBestArgument(self, availArgs, argset, burdenOfProof, depth) :
         """
         Function that performs a depth first search to evaluate whether a possible set of arguments shift the burden of proof or not.
@@ -64,7 +89,8 @@ class Dialogue(object):
 
         :type availArgs: [:class:`.Argument`]
 
-        :param argset: The current Argument Set
+        :param argset: The current Argument Set. Combinations of arguments are tried out on it and rolled back,\
+        and the first combination which shifts the burden of proof is left in it.
 
         :type argset: :class:`.ArgumentSet`
 
@@ -79,34 +105,40 @@ class Dialogue(object):
         :rtype: [:class:`.CAES`,  :class:`.ArgumentSet`, [:class:`Argument`]]
 
         """
-        argsetSearch = deepcopy(argset) 
-        if (len(availArgs) >= depth):
-            pass
-        else:
-            depth = len(availArgs)
-
         if burdenOfProof == "Defense":
             conclusion = self.argumentsDefense[0].conclusion
         else:
             conclusion = self.argumentsProsecution[0].conclusion
 
-        combos = combinations(availArgs,depth)
-        for c in combos:
-            usedArguments = []
-            for arg in c:
-                argsetSearch.add_argument(arg)
-                usedArguments.append(arg)
-
-                caesSearch = CAES(argsetSearch,self.audience,self.ps)
-
-                acceptable = caesSearch.acceptable(conclusion)
-                if(acceptable):
-                    print('Side added argument(s):')
-                    for argument in added_arguments:
-                        print(argument.__str__())
-                        availArgs = {k: v for k, v in usedArguments.items() if v != argument}
-
-                    return [caesSearch , argsetSearch, availArgs]
+        candidates = self.relevantArguments(availArgs, argset, conclusion)
+        if (len(candidates) >= depth):
+            pass
+        else:
+            depth = len(candidates)
+
+        # each combination is tried out on argset itself and rolled back
+        # afterwards, rather than on a copy; the CAES follows the arguments
+        # added to argset, and only re-evaluates what they affect
+        caesSearch = CAES(argset,self.audience,self.ps)
+        token = argset.checkpoint()
+        try:
+            for c in combinations(candidates,depth):
+                usedArguments = []
+                for arg in c:
+                    argset.add_argument(arg)
+                    usedArguments.append(arg)
+
+                    acceptable = caesSearch.acceptable(conclusion)
+                    if(acceptable):
+                        print('Side added argument(s):')
+                        for argument in usedArguments:
+                            print(argument.__str__())
+                        availArgs = [argument for argument in availArgs
+                                     if argument not in usedArguments]
+                        return [caesSearch , argset, availArgs]
+                argset.rollback(token)
+        finally:
+            argset.release(token)
         return []
 
     def evaluateDialogue(self):
@@ -121,23 +153,23 @@ class Dialogue(object):
         weights = self.commandStack['Weights']
         assumptions = self.commandStack['Assumptions']
         self.audience = Audience(assumptions,weights)
-        argumentsDefenseUsing = deepcopy(self.argumentsDefense)
-        argumentsProsecutionUsing = deepcopy(self.argumentsProsecution)
+        argumentsDefenseUsing = list(self.argumentsDefense)
+        argumentsProsecutionUsing = list(self.argumentsProsecution)
         
         argset = ArgumentSet()
-        argset.add_argument(self.argumentsProsecution[0])
-        argset.add_argument(self.argumentsDefense[0])
+        argset.add_arguments([self.argumentsProsecution[0],
+                              self.argumentsDefense[0]])
         burdenOfProof = "Defense" 
+        caes = CAES(argset,self.audience,self.ps)
         while(True):
 
-            caes = CAES(argset,self.audience,self.ps)
             burdenOfProof = self.burdenOfProofLocation(burdenOfProof,caes)
 
             if (burdenOfProof == "Defense"):
                 print('\n ***** Burden of Proof on Defense *****')
                 res = self.findBestArgument(argumentsDefenseUsing, argset,burdenOfProof, depth = 4)
                 if len(res)==3:
-                    caes, argset, argumentDefenseUsing = res[0], res[1], res[2]
+                    caes, argset, argumentsDefenseUsing = res[0], res[1], res[2]
                 else:
                     print('AI cannot come up with a valid solution for Defense. Prosecution Wins')
                     break
@@ -146,7 +178,7 @@ class Dialogue(object):
                 print('\n ***** Burden of proof on Prosecution *****')
                 res = self.findBestArgument(argumentsProsecutionUsing,argset, burdenOfProof, depth = 4)
                 if len(res)==3:
-                    caes, argset, argumentDefenseUsing = res[0], res[1], res[2]
+                    caes, argset, argumentsProsecutionUsing = res[0], res[1], res[2]
                 else:
                     print('AI cannot come up with a valid solution for Prosecution. Defense Wins')
                     break
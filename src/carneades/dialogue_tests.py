@@ -0,0 +1,118 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+from carneades import dialogue
+from carneades.caes import PropLiteral, Argument, ArgumentSet, Audience, \
+    ProofStandard, CAES
+from carneades.dialogue import Dialogue
+
+class RecordingCAES(CAES):
+    """
+    A CAES which records, for each change to its argument set, whether its
+    memo tables were kept up to date incrementally rather than left to be
+    cleared.
+    """
+    def __init__(self, *args, **kwargs):
+        self.incremental = []
+        super().__init__(*args, **kwargs)
+
+    def _argset_changed(self, argset, arguments, previous_version):
+        super()._argset_changed(argset, arguments, previous_version)
+        self.incremental.append(self._memo_key is not None and
+                                self._memo_key[0] == argset.version)
+
+class DialogueTestCase(unittest.TestCase):
+    """
+    Test cases for the search for arguments in a Dialogue
+    """
+
+    def setUp(self):
+        (self.innocent, self.guilty, self.alibi, self.witness, self.lying,
+         self.motive, self.weather) = map(PropLiteral, [
+             'innocent', 'guilty', 'alibi', 'witness', 'lying', 'motive',
+             'weather'])
+        self.defense = Argument(self.innocent, premises={self.alibi},
+                                exceptions={self.lying})
+        self.prosecution = Argument(self.guilty)
+        self.dialogue = Dialogue.__new__(Dialogue)
+        self.dialogue.argumentsDefense = [self.defense]
+        self.dialogue.argumentsProsecution = [self.prosecution]
+        self.dialogue.audience = Audience({self.motive}, {})
+        self.dialogue.ps = ProofStandard([])
+        self.argset = ArgumentSet()
+        self.argset.add_arguments([self.prosecution, self.defense])
+
+    def search(self, availArgs, depth=1):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.dialogue.findBestArgument(availArgs, self.argset,
+                                                  'Defense', depth)
+
+    def test_relevant_arguments(self):
+        ''' Only arguments which the conclusion depends on are kept '''
+        unrelated = Argument(self.weather)
+        weak = Argument(self.alibi, premises={self.witness})
+        # only reachable through the exception of the defense's argument
+        exception = Argument(self.lying, premises={self.motive})
+        # only reachable through another available argument
+        indirect = Argument(self.witness)
+        relevant = self.dialogue.relevantArguments(
+            [unrelated, weak, exception, indirect], self.argset,
+            self.innocent)
+        self.assertEqual(relevant, [weak, exception, indirect])
+
+    def test_rejected_candidates_are_rolled_back(self):
+        ''' The argument set only gains the argument which is chosen '''
+        weak = Argument(self.alibi, premises={self.witness})
+        strong = Argument(self.alibi)
+        unrelated = Argument(self.weather)
+        before = list(self.argset.arguments)
+        ids = [arg.arg_id for arg in before]
+        propset = self.argset.propset()
+        with mock.patch.object(dialogue, 'CAES', RecordingCAES):
+            caes, argset, left = self.search([weak, strong, unrelated])
+        self.assertIs(argset, self.argset)
+        self.assertEqual(argset.arguments, before + [strong])
+        self.assertEqual([arg.arg_id for arg in before], ids)
+        self.assertEqual(argset.get_arguments(self.alibi), (strong,))
+        self.assertEqual(argset.propset() - propset, {self.alibi.negate()})
+        self.assertEqual(left, [weak, unrelated])
+        self.assertTrue(caes.acceptable(self.innocent))
+        # after the first query, rolling back the rejected candidate only
+        # discarded what it affected
+        self.assertTrue(all(caes.incremental[1:]))
+
+    def test_nothing_found(self):
+        ''' The argument set is unchanged if no argument helps '''
+        weak = Argument(self.alibi, premises={self.witness})
+        exception = Argument(self.lying, premises={self.motive})
+        before = list(self.argset.arguments)
+        self.assertEqual(self.search([weak, exception], depth=2), [])
+        self.assertEqual(self.argset.arguments, before)
+        self.assertEqual(self.argset.get_arguments(self.alibi), ())
+
+    def test_pruning_keeps_best_argument(self):
+        ''' The same argument is chosen with and without pruning '''
+        def candidates():
+            return [Argument(self.weather), Argument(self.motive),
+                    Argument(self.alibi, premises={self.witness}),
+                    Argument(self.alibi)]
+
+        pruned = self.search(candidates())
+        chosen = [str(arg) for arg in self.argset.arguments]
+        self.setUp()
+        with mock.patch.object(Dialogue, 'relevantArguments',
+                               lambda self, availArgs, argset, conclusion:
+                               list(availArgs)):
+            unpruned = self.search(candidates())
+        self.assertEqual([str(arg) for arg in self.argset.arguments], chosen)
+        self.assertEqual(chosen[-1], '[], ~[] => alibi')
+        self.assertEqual([str(arg) for arg in pruned[2]],
+                         [str(arg) for arg in unpruned[2]])
+
+if __name__ == '__main__':
+    unittest.main()
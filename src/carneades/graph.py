@@ -0,0 +1,389 @@
+# Graph backends for the Carneades Argument Evaluation Structure
+#
+# For license information, see LICENSE
+
+"""
+Graph backends used by :class:`carneades.caes.ArgumentSet` to store its
+dependency graph.
+
+An :class:`.ArgumentSet` only uses its graph as an adjacency structure in
+which every vertex carries one of two attributes: ``prop``, for vertices
+which represent propositions, or ``arg``, for vertices which represent
+arguments. Two backends provide this:
+
+* :class:`AdjacencyGraph`, a pure-Python structure which keeps the
+  attributes in flat lists and the edges in integer arrays. This is the
+  default, and evaluation never needs anything else.
+
+* :class:`IGraphBackend`, which stores the graph in an
+  `igraph <http://igraph.org/>`_ ``Graph``.
+
+Either backend can be converted to an ``igraph.Graph`` with
+:meth:`to_igraph`, which is what :meth:`.ArgumentSet.draw` uses for layout;
+igraph itself is only imported when that happens.
+
+>>> g = AdjacencyGraph()
+>>> g.add_vertices(['p', None, 'q'], [None, 'arg1', None])
+0
+>>> g.add_edges([(0, 1), (1, 2)])
+>>> g.successors(1), g.predecessors(1)
+([2], [0])
+>>> g.vertex(1)['arg']
+'arg1'
+"""
+
+from array import array
+
+
+def _remove_last(items, item):
+    """
+    Remove the last occurrence of an item from a list.
+    """
+    for i in range(len(items) - 1, -1, -1):
+        if items[i] == item:
+            del items[i]
+            return
+    raise ValueError('{} is not in the list'.format(item))
+
+
+class Vertex(object):
+    """
+    A view of a single vertex of an :class:`AdjacencyGraph`, providing the
+    parts of the interface of ``igraph.Vertex`` that are used by
+    :class:`.ArgumentSet`.
+    """
+    __slots__ = ('graph', 'index')
+
+    def __init__(self, graph, index):
+        self.graph = graph
+        self.index = index
+
+    def __getitem__(self, name):
+        return self.graph.attribute(name)[self.index]
+
+    def attributes(self):
+        """
+        The attributes of the vertex, as a dictionary.
+
+        :rtype: dict
+        """
+        return {name: self[name] for name in AdjacencyGraph.attribute_names}
+
+    def __repr__(self):
+        return 'Vertex({}, {})'.format(self.index, self.attributes())
+
+
+class AdjacencyGraph(object):
+    """
+    A directed graph stored as flat attribute lists and edge arrays.
+
+    Each vertex costs two list slots for its attributes plus its entries in
+    the adjacency lists, instead of the attribute dictionary and the
+    C-extension objects needed by igraph.
+    """
+    attribute_names = ('prop', 'arg')
+
+    def __init__(self):
+        self._props = []
+        self._args = []
+        self._sources = array('l')
+        self._targets = array('l')
+        self._out = []
+        self._in = []
+
+    def vcount(self):
+        """
+        The number of vertices in the graph.
+
+        :rtype: int
+        """
+        return len(self._props)
+
+    def ecount(self):
+        """
+        The number of edges in the graph.
+
+        :rtype: int
+        """
+        return len(self._sources)
+
+    def add_vertices(self, props, args):
+        """
+        Add vertices to the graph.
+
+        :param props: The ``prop`` attribute of each new vertex.
+        :type props: list
+        :param args: The ``arg`` attribute of each new vertex.
+        :type args: list
+        :return: The index of the first new vertex.
+        :rtype: int
+        """
+        first = len(self._props)
+        self._props.extend(props)
+        self._args.extend(args)
+        for _ in range(len(props)):
+            self._out.append([])
+            self._in.append([])
+        return first
+
+    def add_edges(self, edges):
+        """
+        Add edges to the graph.
+
+        :param edges: The edges to be added.
+        :type edges: list(tuple(int, int))
+        """
+        for (source, target) in edges:
+            self._sources.append(source)
+            self._targets.append(target)
+            self._out[source].append(target)
+            self._in[target].append(source)
+
+    def delete_edges(self, edges):
+        """
+        Delete edges from the graph. For each edge, the copy which was added
+        last is deleted, so deleting the edges which were added last takes
+        time proportional to their number.
+
+        :param edges: The edges to be deleted.
+        :type edges: list(tuple(int, int))
+        :raises ValueError: if an edge is not in the graph.
+        """
+        sources, targets = self._sources, self._targets
+        for (source, target) in reversed(edges):
+            for i in range(len(sources) - 1, -1, -1):
+                if sources[i] == source and targets[i] == target:
+                    break
+            else:
+                raise ValueError('Edge {} does not exist'.format(
+                    (source, target)))
+            del sources[i]
+            del targets[i]
+            _remove_last(self._out[source], target)
+            _remove_last(self._in[target], source)
+
+    def truncate(self, vcount):
+        """
+        Delete the vertices with index ``vcount`` or more, which must not
+        have any edges.
+
+        :param vcount: The number of vertices to be kept.
+        :type vcount: int
+        """
+        for names in (self._props, self._args, self._out, self._in):
+            del names[vcount:]
+
+    def set_attribute(self, name, index, value):
+        """
+        Set an attribute of a vertex.
+
+        :param name: Either ``'prop'`` or ``'arg'``.
+        :param index: The index of the vertex.
+        :type index: int
+        :param value: The new value.
+        """
+        self.attribute(name)[index] = value
+
+    def vertex(self, index):
+        """
+        :rtype: :class:`Vertex`
+        """
+        return Vertex(self, index)
+
+    def attribute(self, name):
+        """
+        The values of a vertex attribute, in order of vertex index.
+
+        :param name: Either ``'prop'`` or ``'arg'``.
+        :rtype: list
+        """
+        if name == 'prop':
+            return self._props
+        elif name == 'arg':
+            return self._args
+        raise KeyError('Attribute {} does not exist'.format(name))
+
+    def edges(self):
+        """
+        The edges of the graph, in the order they were added.
+
+        :rtype: list(tuple(int, int))
+        """
+        return list(zip(self._sources, self._targets))
+
+    def successors(self, index):
+        """
+        :rtype: list(int)
+        """
+        return list(self._out[index])
+
+    def predecessors(self, index):
+        """
+        :rtype: list(int)
+        """
+        return list(self._in[index])
+
+    def to_igraph(self):
+        """
+        Copy the graph into an ``igraph.Graph``.
+
+        :rtype: :class:`igraph.Graph`
+        """
+        from igraph import Graph
+        g = Graph(n=self.vcount(), edges=self.edges(), directed=True)
+        g.vs['prop'] = self._props
+        g.vs['arg'] = self._args
+        return g
+
+
+class IGraphBackend(object):
+    """
+    The same interface as :class:`AdjacencyGraph`, implemented by an
+    ``igraph.Graph``.
+    """
+    def __init__(self):
+        from igraph import Graph
+        self._graph = Graph(directed=True)
+
+    def vcount(self):
+        return self._graph.vcount()
+
+    def ecount(self):
+        return self._graph.ecount()
+
+    def add_vertices(self, props, args):
+        g = self._graph
+        first = g.vcount()
+        g.add_vertices(len(props))
+        new_vs = g.vs[first:]
+        new_vs['prop'] = props
+        new_vs['arg'] = args
+        return first
+
+    def add_edges(self, edges):
+        self._graph.add_edges(edges)
+
+    def delete_edges(self, edges):
+        g = self._graph
+        for (source, target) in reversed(edges):
+            g.delete_edges(g.get_eid(source, target))
+
+    def truncate(self, vcount):
+        g = self._graph
+        g.delete_vertices(range(vcount, g.vcount()))
+
+    def set_attribute(self, name, index, value):
+        self._graph.vs[index][name] = value
+
+    def vertex(self, index):
+        return self._graph.vs[index]
+
+    def attribute(self, name):
+        try:
+            return self._graph.vs[name]
+        except KeyError:
+            if name in AdjacencyGraph.attribute_names:
+                return [None] * self._graph.vcount()
+            raise
+
+    def edges(self):
+        return self._graph.get_edgelist()
+
+    def successors(self, index):
+        return self._graph.successors(index)
+
+    def predecessors(self, index):
+        return self._graph.predecessors(index)
+
+    def to_igraph(self):
+        return self._graph
+
+
+class ReadOnlyGraph(object):
+    """
+    A read-only view of a graph which is never changed again, as used by
+    :class:`.FrozenArgumentSet`. The methods which would change the graph
+    raise ``TypeError``, and the attributes are returned as tuples.
+
+    >>> g = AdjacencyGraph()
+    >>> g.add_vertices(['p', None], [None, 'arg1'])
+    0
+    >>> view = ReadOnlyGraph(g)
+    >>> view.attribute('arg')
+    (None, 'arg1')
+    >>> view.add_edges([(0, 1)])
+    Traceback (most recent call last):
+        ...
+    TypeError: ReadOnlyGraph objects are immutable
+    """
+    __slots__ = ('_graph', '_attributes')
+
+    def __init__(self, graph):
+        """
+        :param graph: The graph, which must not be changed afterwards.
+        """
+        self._graph = graph
+        self._attributes = {name: tuple(graph.attribute(name))
+                            for name in AdjacencyGraph.attribute_names}
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("ReadOnlyGraph objects are immutable")
+
+    add_vertices = add_edges = delete_edges = truncate = set_attribute = \
+        _immutable
+
+    def vcount(self):
+        return self._graph.vcount()
+
+    def ecount(self):
+        return self._graph.ecount()
+
+    def vertex(self, index):
+        return Vertex(self, index)
+
+    def attribute(self, name):
+        try:
+            return self._attributes[name]
+        except KeyError:
+            raise KeyError('Attribute {} does not exist'.format(name))
+
+    def edges(self):
+        return list(self._graph.edges())
+
+    def successors(self, index):
+        return list(self._graph.successors(index))
+
+    def predecessors(self, index):
+        return list(self._graph.predecessors(index))
+
+    def to_igraph(self):
+        """
+        Copy the graph into an ``igraph.Graph``.
+
+        :rtype: :class:`igraph.Graph`
+        """
+        graph = self._graph.to_igraph()
+        if isinstance(self._graph, IGraphBackend):
+            # the igraph backend hands out the graph it holds
+            graph = graph.copy()
+        return graph
+
+
+BACKENDS = {'adjacency': AdjacencyGraph, 'igraph': IGraphBackend}
+"""
+The available graph backends, by name.
+"""
+
+
+def make_graph(backend='adjacency'):
+    """
+    Create an empty graph.
+
+    :param backend: The name of a backend in :data:`BACKENDS`.
+    :type backend: str
+    :raises ValueError: if there is no such backend.
+    """
+    try:
+        return BACKENDS[backend]()
+    except KeyError:
+        raise ValueError("{} is not a valid graph backend".format(backend))
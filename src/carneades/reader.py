@@ -11,6 +11,8 @@ or
 
 >>> pip install PyYAML
 
+If PyYAML was built with libyaml, its C parser is used, which is much faster.
+
 To load up a text file written in the specified format:
 Note however the file should be opened only in read mode.
 
@@ -18,6 +20,16 @@ Note however the file should be opened only in read mode.
 >>> file = open("file.text")
 >>> r.load(file)
 
+To replay files which are loaded again and again without parsing them each
+time, give the Reader a directory in which to cache their execution plans:
+
+>>> r = Reader(plan_cache='.carneades-plans')
+
+The plans are stored with :mod:`marshal`, which is not safe against
+files which have been tampered with or corrupted, so plans are only read
+from a cache which belongs to the current user, and each plan is checked
+before it is replayed; see :meth:`Reader.read_plan`.
+
 Syntax rules for class Reader:
 Every command is written in the following manner ::
 
@@ -64,30 +76,114 @@ To run tests on the Reader class use ::
 
 """
 
+import hashlib
+import marshal
 import os
+import stat
 import sys
-import yaml
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+if not __package__:
+    # when run as a script, make sure that the package can be imported
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from carneades.caes import PropLiteral, Argument, ArgumentSet, Audience, ProofStandard, CAES
 from copy import deepcopy
+from types import MappingProxyType
+
+def _caes_query(method, arg_name, arg_type, show=True, many=False):
+    """
+    Make a command handler for :class:`Reader` which calls a method of a
+    :class:`.CAES` with one argument, stores the result in the return variable
+    if there is one, and otherwise prints it if ``show`` is true.
+
+    :param method: The name of the method.
+    :param arg_name: The name of the argument in the command.
+    :param arg_type: The type of the variable(s) named by the argument.
+    :param show: Whether to print the result if there is no return variable.
+    :param many: Whether the argument is a list of variable names.
+    """
+    def handler(self, var_name, args):
+        var = self.is_initialized(var_name,CAES)
+        if many:
+            value = [self.is_initialized(name, arg_type) for name in args[arg_name]]
+        else:
+            value = self.is_initialized(args[arg_name], arg_type)
+        result = getattr(var, method)(value)
+        return_var = self._return_var(args)
+        if return_var is not None:
+            self.initialised_variables[return_var] = result
+        elif show:
+            print(result)
+    return handler
+
 
 class Reader(object):
     """
     Class Designed to read data from a *.txt file.
     Loads data into CAES system for evaluation.
 
+    """
+    COMMAND_KEYS = frozenset(['type','func_name','var_name','args','return_var'])
+    REQUIRED_KEYS = ('type','func_name','var_name','args')
+
+    SCHEMA = {func_name: (frozenset(valid_args), tuple(req_args))
+              for (func_name, (valid_args, req_args)) in {
+        'PropLiteral': (['polarity','proofStandard'], []),
+        'Argument': (['conclusion','premises','exceptions','weight','by'], ['conclusion']),
+        'ArgumentSet': ([], []),
+        'Audience': (['assumptions','weight'], ['assumptions','weight']),
+        'ProofStandard': (['propstandards'], ['propstandards']),
+        'Assumptions': (['props'], ['props']),
+        'CAES': (['argset','audience','proofstandard','alpha','beta','gamma'], ['argset','audience','proofstandard']),
+        'negate': (['return_var'], []),
+        'add_argument': (['argument','arg_id'], ['argument']),
+        'add_proposition': (['proposition','return_var'], ['proposition','return_var']),
+        'get_arguments': (['proposition','return_var'], ['proposition','return_var']),
+        'draw': (['debug'], []),
+        'write_to_graphviz': (['fname'], []),
+        'get_proofstandard': (['proposition','return_var'], ['proposition','return_var']),
+        'acceptable': (['proposition','return_var'], ['proposition']),
+        'applicable': (['proposition','return_var'], ['proposition']),
+        'get_all_arguments': ([], []),
+        'max_weight_applicable': (['arguments','return_var'], ['arguments']),
+        'max_weight_con': (['proposition','return_var'], ['proposition']),
+        'max_weight_pro': (['proposition','return_var'], ['proposition']),
+        'meets_proof_standard': (['proposition','standard','return_var'], ['proposition','standard']),
+        'weight_of': (['argument','return_var'], ['argument']),
+    }.items()}
+    """
+    The arguments allowed and required by each function, compiled once for
+    all commands: ``func_name -> (valid_args, req_args)``.
     """
 
-    def __init__ (self):
+    VARIABLE_TYPES = {PropLiteral: 'PropLiteral', Argument: 'Argument',
+                      ArgumentSet: 'ArgumentSet', Audience: 'Audience',
+                      ProofStandard: 'ProofStandard', CAES: 'CAES'}
+    """
+    The table of :attr:`initialised_variables` which holds the variables of
+    each type.
+    """
+
+    PLAN_VERSION = 1
+    """
+    The version of the execution plans written to the plan cache; plans
+    written with another version are ignored.
+    """
+
+    def __init__ (self, plan_cache=None):
         """
         Constructor for Reader class.
         To load up a text file use load()
 
+        :param plan_cache: A directory in which to cache the execution plan\
+        of each file loaded, see :meth:`deserialise`. By default, nothing is\
+        cached.
+        :type plan_cache: str or None
         """
         self.fileObject = None;
         self. initialised_variables = {}
+        self.pending_arguments = (None, [])
+        self.plan_cache = plan_cache
 
     def load(self,fileObject):
         """
@@ -108,25 +204,55 @@ class Reader(object):
         self.fileObject = fileObject
         self.deserialise()
     
-    def getCommandStack(self):
+    def getCommandStack(self, copy=False):
+        """
+        The variables defined by the file, for :class:`.Dialogue`.
+
+        By default, the result is read-only and shares the objects held by
+        the reader, so it costs next to nothing however large the file is:
+        the tables of literals and of weights are read-only views of the
+        reader's own tables, and the lists are tuples. The literals of the
+        arguments are the same objects as those in the table of literals.
+
+        :param copy: If true, return plain dictionaries and lists, with\
+        copies of the tables, which can be changed freely.
+        :type copy: bool
+        :return: The literals (``PropLiteral``), the assumptions of all the\
+        ``Assumptions`` commands (``Assumptions``), the weights of the\
+        arguments (``Weights``), the proof standards of the literals\
+        (``proofStandardList``), and the arguments of each side\
+        (``ArgumentsDefense`` and ``ArgumentsProsecution``).
+        :rtype: mapping
+        """
+        variables = self.initialised_variables
         commandStack = {}
-        commandStack['PropLiteral'] = deepcopy(self.initialised_variables['PropLiteral'])
-        commandStack['Assumptions'] = [item for v in  self.initialised_variables['Assumptions'].values() for item in v]
-        commandStack['Weights'] = deepcopy(self.initialised_variables['Weights'])
-        commandStack['proofStandardList'] = deepcopy(self.initialised_variables['proofStandardList'])
+        commandStack['Assumptions'] = [item for v in variables['Assumptions'].values() for item in v]
         commandStack['ArgumentsDefense'] = []
         commandStack['ArgumentsProsecution'] = []
-        for v in self.initialised_variables['Argument'].values():
+        for v in variables['Argument'].values():
             if(v[1]=="Defense"):
                 commandStack['ArgumentsDefense'].append(v[0])
             else:
                 commandStack['ArgumentsProsecution'].append(v[0])
-        return commandStack
+        if copy:
+            commandStack['PropLiteral'] = dict(variables['PropLiteral'])
+            commandStack['Weights'] = deepcopy(variables['Weights'])
+            commandStack['proofStandardList'] = list(variables['proofStandardList'])
+            return commandStack
+        for key in ('Assumptions', 'ArgumentsDefense', 'ArgumentsProsecution'):
+            commandStack[key] = tuple(commandStack[key])
+        commandStack['PropLiteral'] = MappingProxyType(variables['PropLiteral'])
+        commandStack['Weights'] = MappingProxyType(variables['Weights'])
+        commandStack['proofStandardList'] = tuple(variables['proofStandardList'])
+        return MappingProxyType(commandStack)
 
     def is_initialized(self, var_name, var_type):
         """
         Function to check whether a variable has been initialised.
 
+        Variables are kept in a table for each type, see :attr:`VARIABLE_TYPES`,
+        apart from the results of some functions, which are kept by name.
+
         :param var_name: The variable name to check.
 
         :type var_name: str
@@ -140,32 +266,29 @@ class Reader(object):
         :raises NameError: if the var_name isn't initialised
 
         """
-        type = 'None'
-        if var_type ==  PropLiteral:
-            type = 'PropLiteral'
-        elif var_type ==  Argument:
-            type = 'Argument'
-        elif var_type == ArgumentSet:
-            type = 'ArgumentSet'
-        elif var_type == Audience:
-            type = 'Audience'
-        elif var_type == ProofStandard:
-            type = 'ProofStandard'
-        elif var_type == CAES:
-            type = 'CAES'
-        else:
-            type = 'func'
-        if var_name in self.initialised_variables[type] :
-            return self.initialised_variables[type][var_name]
-        else:
-            raise NameError("{} is not defined".format(var_name))
+        variables = self.initialised_variables
+        table = variables.get(self.VARIABLE_TYPES.get(var_type, 'func'), {})
+        if var_name in table:
+            return table[var_name]
+        if var_name in variables:
+            # the result of a function, stored under its own name
+            value = variables[var_name]
+            if isinstance(value, var_type):
+                return value
+            raise TypeError("{} is not of type {}".format(var_name,
+                                                          var_type.__name__))
+        for type_name in self.VARIABLE_TYPES.values():
+            if var_name in variables.get(type_name, {}):
+                raise TypeError("{} is a {}, not of type {}".format(
+                    var_name, type_name, var_type.__name__))
+        raise NameError("{} is not defined".format(var_name))
 
     def check_command_structure(self, c):
         """
         Checks validty of a command sequence.
         This checks syntactic validity of the command in terms of whta's allowed in the specific type of function call -
         which ones are allowed and which ones aren't.
-        Take a look at the source and the valid_functions dict to see what's happening.
+        Take a look at :attr:`SCHEMA` to see what's allowed.
 
         :param c: command 
         :type c: dict
@@ -175,227 +298,492 @@ class Reader(object):
         :raises NameError: Invalid function name
 
         """
-        must_have_keys = ['type','func_name','var_name','args']
-        optional_keys = ['return_var']
-        valid_functions = {
-        'PropLiteral':{'valid_args':['polarity','proofStandard'],'req_args':[]},
-        'Argument':{'valid_args':['conclusion','premises','exceptions','weight','by'],'req_args':['conclusion']},
-        'ArgumentSet':{'valid_args':[],'req_args':[]},
-        'Audience': {'valid_args':['assumptions','weight'],'req_args':['assumptions','weight']}, 
-        'ProofStandard': {'valid_args':['propstandards'],'req_args':['propstandards']},
-        'Assumptions': {'valid_args':['props'],'req_args':['props']},
-        'CAES':{'valid_args':['argset','audience','proofstandard','alpha','beta','gamma'],'req_args':['argset','audience','proofstandard']},
-        'negate':{'valid_args':['return_var'],'req_args':[]},
-        'add_argument':{'valid_args':['argument','arg_id'],'req_args':['argument']},
-        'add_proposition': {'valid_args':['proposition','return_var'],'req_args':['proposition','return_var']},
-        'get_arguments': {'valid_args':['proposition','return_var'],'req_args':['proposition','return_var']},   
-        'draw':{'valid_args':['debug'],'req_args':[]},
-        'write_to_graphviz': {'valid_args':['fname'],'req_args':[]},
-        'get_proofstandard': {'valid_args':['proposition','return_var'],'req_args':['proposition','return_var']},
-        'acceptable': {'valid_args':['proposition','return_var'],'req_args':['proposition']},
-        'applicable': {'valid_args':['proposition','return_var'],'req_args':['proposition']},
-        'get_all_arguments': {'valid_args':[],'req_args':[]},
-        'max_weight_applicable': {'valid_args':['arguments','return_var'],'req_args':['arguments']},
-        'max_weight_con': {'valid_args':['proposition','return_var'],'req_args':['proposition']},
-        'max_weight_pro': {'valid_args':['proposition','return_var'],'req_args':['proposition']},
-        'meets_proof_standard': {'valid_args':['proposition','standard','return_var'],'req_args':['proposition','standard']},
-        'weight_of': {'valid_args':['argument','return_var'],'req_args':['argument']}
-        }
         for k in c:
-            if k not in must_have_keys and k not in optional_keys:
+            if k not in self.COMMAND_KEYS:
                 raise ValueError('Key:{} invalid. Refer to documentation on correct syntax'.format(k))
-        for k in must_have_keys:
+        for k in self.REQUIRED_KEYS:
             if k not in c:
                 raise IOError("Required key {} missing".format(k))
         func_name = c['func_name']
-        if func_name in valid_functions:
-            #Check for valid Arguments alowed
-            valid_args = valid_functions[func_name]['valid_args']
-            req_args = valid_functions[func_name]['req_args']
-            if c['args'] != "None":
-                for arg in c['args']:
-                    if arg not in valid_args:
-                        raise ValueError("Arg: {} invalid for constructor {}".format(arg,func_name))
-                for arg in req_args:
-                    if arg not in c['args']:
-                        raise IOError("Required argument(s) {} missing in {}".format(arg,func_name))
-                    elif c['args'][arg] == "None":
-                        raise IOError("Required argument(s) {} cannot be None".format(arg))
-            if c['args'] == "None" and len(req_args) > 0:
-                raise IOError("Required arguments missing in {}".format(func_name))
-        else:
+        try:
+            valid_args, req_args = self.SCHEMA[func_name]
+        except (KeyError, TypeError):
             raise NameError("Not a valid function {}".format(func_name))
+        args = c['args']
+        if args != "None":
+            #Check for valid Arguments alowed
+            for arg in args:
+                if arg not in valid_args:
+                    raise ValueError("Arg: {} invalid for constructor {}".format(arg,func_name))
+            for arg in req_args:
+                if arg not in args:
+                    raise IOError("Required argument(s) {} missing in {}".format(arg,func_name))
+                elif args[arg] == "None":
+                    raise IOError("Required argument(s) {} cannot be None".format(arg))
+        elif req_args:
+            raise IOError("Required arguments missing in {}".format(func_name))
+
+    def iter_commands(self):
+        """
+        Parse the file one command at a time, yielding each command number and
+        command as soon as it has been read, so that only one command is held
+        in memory at once however long the file is.
+
+        The libyaml-based ``CSafeLoader`` of PyYAML is used if it is
+        available, and the pure-Python ``SafeLoader`` otherwise; either way,
+        the top-level mapping is read event by event, and only the value of
+        each command is built into Python objects.
+
+        :rtype: iterator(tuple(int, dict))
+        :raises ValueError: if the file is not a mapping of commands
+        """
+        # PyYAML is only needed once a file is actually loaded
+        import yaml
+        Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        loader = Loader(self.fileObject)
+        anchors = {}
+
+        def compose(event):
+            # build the node for a value, starting from its first event
+            if isinstance(event, yaml.AliasEvent):
+                return anchors[event.anchor]
+            if isinstance(event, yaml.ScalarEvent):
+                tag = event.tag
+                if tag is None or tag == '!':
+                    tag = loader.resolve(yaml.ScalarNode, event.value,
+                                         event.implicit)
+                node = yaml.ScalarNode(tag, event.value, event.start_mark,
+                                       event.end_mark, style=event.style)
+            elif isinstance(event, yaml.SequenceStartEvent):
+                tag = event.tag
+                if tag is None or tag == '!':
+                    tag = loader.resolve(yaml.SequenceNode, None,
+                                         event.implicit)
+                node = yaml.SequenceNode(tag, [], event.start_mark, None,
+                                         flow_style=event.flow_style)
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    node.value.append(compose(loader.get_event()))
+                node.end_mark = loader.get_event().end_mark
+            elif isinstance(event, yaml.MappingStartEvent):
+                tag = event.tag
+                if tag is None or tag == '!':
+                    tag = loader.resolve(yaml.MappingNode, None,
+                                         event.implicit)
+                node = yaml.MappingNode(tag, [], event.start_mark, None,
+                                        flow_style=event.flow_style)
+                while not loader.check_event(yaml.MappingEndEvent):
+                    key = compose(loader.get_event())
+                    node.value.append((key, compose(loader.get_event())))
+                node.end_mark = loader.get_event().end_mark
+            else:
+                raise ValueError("Unexpected {} in {}".format(
+                    type(event).__name__, self.fileObject.name))
+            if event.anchor is not None:
+                anchors[event.anchor] = node
+            return node
+
+        try:
+            loader.get_event()      # StreamStartEvent
+            if loader.check_event(yaml.StreamEndEvent):
+                return
+            loader.get_event()      # DocumentStartEvent
+            if not loader.check_event(yaml.MappingStartEvent):
+                raise ValueError("{} is not a mapping of commands".format(
+                    self.fileObject.name))
+            loader.get_event()
+            while not loader.check_event(yaml.MappingEndEvent):
+                key = loader.construct_document(compose(loader.get_event()))
+                command = loader.construct_document(
+                    compose(loader.get_event()))
+                yield key, command
+        finally:
+            loader.dispose()
 
     def deserialise(self):
         """
-        Function to deserialise the given file, validate it and creates and executes a command stack.
+        Function to deserialise the given file, validate it and execute its commands.
+        Each command is executed as soon as it has been parsed, see :meth:`iter_commands`.
+
+        If there is a :attr:`plan_cache`, the commands of the file are also
+        compiled into an execution plan, see :meth:`compile_command`, which is
+        saved in the cache under the hash of the contents of the file once
+        they have all been executed. When a file with the same contents is
+        loaded again, its plan is read from the cache and replayed, without
+        parsing or validating the file. Note that the whole plan is held in
+        memory until it is saved.
 
         :raises ValueError: if the return_var is added when not required
         """
-        command_stack = yaml.load(self.fileObject)
         self.initialised_variables = {"PropLiteral":{},"Argument":{},"ArgumentSet":{},"Assumptions":{}, "Weights":{},"ProofStandard":{},"Audience":{},"CAES":{},"proofStandardList":[]}
+        self.pending_arguments = (None, [])
         print("Deserialising file {}".format(self.fileObject.name))
-        for k,command in command_stack.items():
-            print("Processing command {}...".format(k))
-            self.check_command_structure(command)
-            var_name = command['var_name']
-            func_name = command['func_name']
-            args = command['args']
-            if (command['type'] == "construct"):
-                if func_name == "PropLiteral":
-                    if 'polarity' in args and args["polarity"] != "None":
-                        self.initialised_variables["PropLiteral"][var_name]= PropLiteral(var_name,polarity=args['polarity'])
-                    else:
-                        self.initialised_variables["PropLiteral"][var_name] = PropLiteral(var_name)
-                    if 'proofStandard' in args and args["proofStandard"] != "None":
-                        self.initialised_variables['proofStandardList'].append((self.initialised_variables["PropLiteral"][var_name], args["proofStandard"]))
-                    else:
-                        self.initialised_variables['proofStandardList'].append((self.initialised_variables["PropLiteral"][var_name], "scintilla"))
-                if func_name == "Argument":
-                    premises = []
-                    exceptions = []
-                    conclusion = self.is_initialized(args['conclusion'],PropLiteral)                        
-                    if 'premises' in args and args["premises"] != "None":
-                       premises = [self.is_initialized(x,PropLiteral) for x in args['premises']]
-                    if 'exceptions' in args and args["exceptions"] != "None":
-                        exceptions = [self.is_initialized(x,PropLiteral) for x in args['exceptions']]
-                    if 'by' not in args or args["by"] == "None":
-                        args["by"] = "Prosecution" #default
-                    if args["by"] != "Defense" and args["by"] != "Prosecution":
-                        raise ValueError("{} invalid value".format(args["by"]))
-                    self.initialised_variables["Argument"][var_name] = (Argument(conclusion,premises=set(premises),exceptions=set(exceptions)),args["by"])
-                    if 'weight' not in args or args['weight'] == "None":
-                        args['weight'] = 0.0
-                    self.initialised_variables["Weights"][var_name] = args["weight"]
-                if func_name == "ArgumentSet":
-                    self.initialised_variables['ArgumentSet'][var_name] = ArgumentSet()
-                if func_name == "Audience":
-                    assumptions = [self.is_initialized(x,PropLiteral) for x in args['assumptions']]
-                    self.initialised_variables['Audience'][var_name] = Audience(set(assumptions),args['weight'])
-                if func_name == "ProofStandard":
-                    prop_standards = [(self.is_initialized(k,PropLiteral),v) for k,v in args['propstandards'].items()]
-                    self.initialised_variables['ProofStandard'][var_name] = ProofStandard(prop_standards)
-                if func_name == "Assumptions":
-                    assumptions = [self.is_initialized(prop, PropLiteral) for prop in args['props']]
-                    self.initialised_variables['Assumptions'][var_name] = assumptions
-                if func_name == "CAES":
-                    argset = self.is_initialized(args['argset'],ArgumentSet)
-                    audience = self.is_initialized(args['audience'],Audience)
-                    proofStandard = self.is_initialized(args['proofstandard'],ProofStandard)
-                    alpha = 0.4
-                    beta = 0.3
-                    gamma = 0.2
-                    if 'alpha' in args and args['alpha'] != "None":
-                        alpha = args['alpha']
-                    if 'beta' in args and args['beta'] != "None":
-                        alpha = args['beta']
-                    if 'gamma' in args and args['gamma'] != "gamma":
-                        alpha = args['gamma']
-                    self.initialised_variables['CAES'][var_name] = CAES(argset,audience,proofStandard,alpha,beta,gamma)
-            elif (command['type'] == "func"):
-                return_var = None
-                if 'return_var' in args and args['return_var'] != "None":
-                    return_var = args['return_var']
-                if func_name == 'negate':
-                    var = self.is_initialized(var_name, PropLiteral)
-                    if return_var is not None:
-                        self.initialised_variables['PropLiteral'][return_var] = var.negate()
-                    else:
-                        print(var.negate())
-                if func_name == 'add_argument':
-                    var = self.is_initialized(var_name, ArgumentSet)
-                    arg = self.is_initialized(args['argument'], Argument)
-                    arg_id = None
-                    print(arg[0])
-                    if 'arg_id' in args and args['arg_id'] != "None":
-                        arg_id = args['arg_id']
-                    if return_var is not None:
-                        raise ValueError("{} does not take a return variable".format(func_name))
-                    else:
-                        var.add_argument(arg[0],arg_id)
-                if func_name == "draw":
-                    var = self.is_initialized(var_name, ArgumentSet)
-                    debug = False
-                    if 'debug' in args and args['debug'] != "None":
-                        debug = args['debug']
-                    var.draw(debug)
-                if func_name == "add_proposition":
-                    var = self.is_initialized(var_name, ArgumentSet)
-                    proposition = self.is_initialized(args['proposition'],PropLiteral)
-                    return_var = args['return_var']
-                    self.initialised_variables[return_var] = var.add_proposiion(proposition)
-                if func_name == "get_arguments":
-                    var = self.is_initialized(var_name, ArgumentSet)
-                    proposition = self.is_initialized(args['proposition'],PropLiteral)
-                    return_var = args['return_var']
-                    self.initialised_variables[return_var] = var.get_arguments(proposition)
-                if func_name == "write_to_graphviz":
-                    var = self.is_initialized(var_name, ArgumentSet)
-                    fname = None
-                    if 'fname' in args and args['fname'] != "None":
-                        fname = args['fname']
-                    var.write_to_graphviz(fname)
-                if func_name == "get_proofstandard":
-                    var = self.is_initialized(var_name,ProofStandard)
-                    prop = self.is_initialized(args['proposition'],PropLiteral)
-                    return_var = args['return_var']
-                    self.initialised_variables[return_var] = var.get_proofstandard(prop)
-                if func_name == "acceptable":
-                    var = self.is_initialized(var_name,CAES)
-                    prop = self.is_initialized(args['proposition'],PropLiteral)
-                    if return_var is not None:
-                        self.initialised_variables[return_var] = var.acceptable(prop)
-                    else:
-                        var.acceptable(prop)
-                if func_name == "applicable":
-                    var = self.is_initialized(var_name,CAES)
-                    prop = self.is_initialized(args['proposition'],PropLiteral)
-                    if return_var is not None:
-                        self.initialised_variables[return_var] = var.applicable(prop)
-                    else:
-                        var.applicable(prop)
-                if func_name == "get_all_arguments":
-                    var = self.is_initialized(var_name,CAES)
-                    var.get_all_arguments()
-                if func_name == "max_weight_applicable":
-                    var = self.is_initialized(var_name,CAES)
-                    arguments = [self.is_initialized(argument, Argument) for argument in args['arguments']]
-                    if return_var is None:
-                        print(var.max_weight_applicable(arguments))
-                    else:
-                        self.initialised_variables[return_var] = var.max_weight_applicable(arguments)
-                if func_name == "max_weight_con":
-                    var = self.is_initialized(var_name,CAES)
-                    prop =  self.is_initialized(args['proposition'],PropLiteral)
-                    if return_var is None:
-                        print(var.max_weight_con(prop))
-                    else:
-                        self.initialised_variables[return_var] = var.max_weight_con(prop)
-                if func_name == "max_weight_pro":
-                    var = self.is_initialized(var_name,CAES)
-                    prop =  self.is_initialized(args['proposition'],PropLiteral)
-                    if return_var is None:
-                        print(var.max_weight_pro(prop))
-                    else:
-                        self.initialised_variables[return_var] = var.max_weight_pro(prop)
-                if func_name == "meets_proof_standard":
-                    var = self.is_initialized(var_name,CAES)
-                    prop =  self.is_initialized(args['proposition'],PropLiteral)
-                    standard = args['standard']
-                    if return_var is None:
-                        print(var.meets_proof_standard(prop,standard))
-                    else:
-                        self.initialised_variables[return_var] = var.meets_proof_standard(prop,standard)
-                if func_name == "weight_of":
-                    var = self.is_initialized(var_name,CAES)
-                    argument =  self.is_initialized(args['argument'],Argument)
-                    if return_var is None:
-                        print(var.weight_of(argument))
-                    else:
-                        self.initialised_variables[return_var] = var.weight_of(argument)
-            else:
-                raise ValueError("{} - invalid argument for key \'type\'")        
-            print("..Done")
+        path = self.plan_path() if self.plan_cache is not None else None
+        plan = self.read_plan(path) if path is not None else None
+        if plan is not None:
+            for (k, step) in plan:
+                print("Processing command {}...".format(k))
+                self.run_step(step)
+                print("..Done")
+        else:
+            plan = []
+            for k,command in self.iter_commands():
+                print("Processing command {}...".format(k))
+                step = self.compile_command(command)
+                self.run_step(step)
+                if path is not None:
+                    plan.append((k, step))
+                print("..Done")
+            if path is not None:
+                self.write_plan(path, plan)
+        self.flush_arguments()
+
+    def execute(self, command):
+        """
+        Validate a single command and execute it.
+
+        :param command: The command.
+        :type command: dict
+        """
+        self.run_step(self.compile_command(command))
+
+    def compile_command(self, command):
+        """
+        Validate a command and compile it into a step of an execution plan,
+        which can be run with :meth:`run_step`.
+
+        :param command: The command.
+        :type command: dict
+        :return: The type, function name, variable name and args of the command.
+        :rtype: tuple
+        :raises ValueError: if the type of the command is invalid
+        """
+        self.check_command_structure(command)
+        kind = command['type']
+        if kind != "construct" and kind != "func":
+            raise ValueError("{} - invalid argument for key \'type\'".format(kind))
+        return (kind, command['func_name'], command['var_name'], command['args'])
+
+    def run_step(self, step):
+        """
+        Run a step of an execution plan, by looking up its handler in
+        :attr:`HANDLERS`. The step is not validated.
+
+        :param step: A step, from :meth:`compile_command`.
+        :type step: tuple
+        """
+        kind, func_name, var_name, args = step
+        if func_name != 'add_argument':
+            self.flush_arguments()
+        handler = self.HANDLERS.get((kind, func_name))
+        if handler is not None:
+            handler(self, var_name, args)
+
+    def plan_path(self):
+        """
+        The path of the cached execution plan for the contents of the file.
+
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        start = self.fileObject.tell()
+        for chunk in iter(lambda: self.fileObject.read(1 << 16), ''):
+            digest.update(chunk.encode('utf-8'))
+        self.fileObject.seek(start)
+        return os.path.join(self.plan_cache, '{}.v{}.plan'.format(
+            digest.hexdigest(), self.PLAN_VERSION))
+
+    def read_plan(self, path):
+        """
+        Read an execution plan from the plan cache.
+
+        :mod:`marshal` can build any object, including code objects, from a
+        file which has been tampered with, and is not guaranteed to handle
+        corrupted data safely. So a plan is only read if both it and the
+        cache directory belong to the current user and cannot be written by
+        anybody else, which is how :meth:`write_plan` makes them, and it is
+        only returned if every step is well formed; see :meth:`check_plan`.
+
+        :param path: The path of the plan, from :meth:`plan_path`.
+        :type path: str
+        :return: The plan, or ``None`` if it is not in the cache, cannot be\
+        read or is not to be trusted.
+        :rtype: list(tuple(int, tuple)) or None
+        """
+        try:
+            if not self.trusted(os.stat(os.path.dirname(path))):
+                return None
+            with open(path, 'rb') as f:
+                if not self.trusted(os.fstat(f.fileno())):
+                    return None
+                plan = marshal.load(f)
+            self.check_plan(plan)
+        except (OSError, EOFError, ValueError, TypeError, NameError):
+            return None
+        return plan
+
+    @staticmethod
+    def trusted(status):
+        """
+        Whether a file in the plan cache can be trusted: it must belong to the
+        current user, and nobody else may write to it. On systems without
+        user IDs, only the permissions are checked.
+
+        :param status: The status of the file, from ``os.stat``.
+        :type status: os.stat_result
+        :rtype: bool
+        """
+        if hasattr(os, 'getuid') and status.st_uid != os.getuid():
+            return False
+        return not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def check_plan(self, plan):
+        """
+        Check that a plan read from the cache is made of steps which
+        :meth:`compile_command` could have made: each one a valid command,
+        whose args hold nothing but the values which YAML gives.
+
+        :param plan: The plan.
+        :raises ValueError: if the plan is not a list of steps, or a step\
+        holds any other values
+        :raises IOError: if a step misses a required argument
+        :raises NameError: if a step calls an invalid function
+        """
+        if not isinstance(plan, list):
+            raise ValueError("A plan must be a list of steps")
+        for entry in plan:
+            if not (isinstance(entry, tuple) and len(entry) == 2 and
+                    isinstance(entry[1], tuple) and len(entry[1]) == 4):
+                raise ValueError("Invalid step {!r}".format(entry))
+            kind, func_name, var_name, args = entry[1]
+            if kind not in ("construct", "func"):
+                raise ValueError("{} - invalid argument for key \'type\'".\
+                                 format(kind))
+            self.check_value(entry[0])
+            self.check_value(var_name)
+            self.check_value(args)
+            self.check_command_structure({'type': kind,
+                                          'func_name': func_name,
+                                          'var_name': var_name,
+                                          'args': args})
+
+    @classmethod
+    def check_value(cls, value):
+        """
+        Check that a value holds nothing but the types which YAML gives:
+        strings, numbers, booleans, ``None``, lists and dicts.
+
+        :raises ValueError: if it holds any other type
+        """
+        if isinstance(value, (list, dict)):
+            for item in value:
+                cls.check_value(item)
+                if isinstance(value, dict):
+                    cls.check_value(value[item])
+        elif not (value is None or
+                  isinstance(value, (str, int, float, bool))):
+            raise ValueError("Invalid value {!r} in plan".format(value))
+
+    @staticmethod
+    def write_plan(path, plan):
+        """
+        Write an execution plan to the plan cache. Plans with values which
+        cannot be written, such as dates, are not cached. The cache directory
+        is made readable and writable by the current user only, as is the
+        plan.
+
+        :param path: The path of the plan, from :meth:`plan_path`.
+        :type path: str
+        :param plan: The command number and step of each command.
+        :type plan: list(tuple(int, tuple))
+        """
+        try:
+            data = marshal.dumps(plan)
+        except ValueError:
+            return
+        directory = os.path.dirname(path)
+        # only the current user may write to the cache, see read_plan()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # write to a temporary file first, so that a plan which is being
+        # written is never read
+        temporary = '{}.{}.tmp'.format(path, os.getpid())
+        descriptor = os.open(temporary,
+                             os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(descriptor, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+
+    def flush_arguments(self):
+        """
+        Add the arguments collected from a run of consecutive add_argument
+        commands to their :class:`.ArgumentSet` in one bulk operation.
+        """
+        argset, arguments = self.pending_arguments
+        if argset is not None:
+            argset.add_arguments(arguments)
+        self.pending_arguments = (None, [])
+
+    # Handlers for commands, registered in HANDLERS below. Each is called
+    # with the var_name and args of the command.
+
+    @staticmethod
+    def _given(args, key):
+        """
+        Whether an optional argument of a command was given.
+        """
+        return key in args and args[key] != "None"
+
+    def _return_var(self, args):
+        if self._given(args, 'return_var'):
+            return args['return_var']
+        return None
+
+    def _construct_proposition(self, var_name, args):
+        if self._given(args, 'polarity'):
+            prop = PropLiteral(var_name, polarity=args['polarity'])
+        else:
+            prop = PropLiteral(var_name)
+        self.initialised_variables["PropLiteral"][var_name] = prop
+        if self._given(args, 'proofStandard'):
+            self.initialised_variables['proofStandardList'].append((prop, args["proofStandard"]))
+        else:
+            self.initialised_variables['proofStandardList'].append((prop, "scintilla"))
+
+    def _construct_argument(self, var_name, args):
+        premises = []
+        exceptions = []
+        conclusion = self.is_initialized(args['conclusion'],PropLiteral)
+        if self._given(args, 'premises'):
+            premises = [self.is_initialized(x,PropLiteral) for x in args['premises']]
+        if self._given(args, 'exceptions'):
+            exceptions = [self.is_initialized(x,PropLiteral) for x in args['exceptions']]
+        if not self._given(args, 'by'):
+            args["by"] = "Prosecution" #default
+        if args["by"] != "Defense" and args["by"] != "Prosecution":
+            raise ValueError("{} invalid value".format(args["by"]))
+        self.initialised_variables["Argument"][var_name] = (Argument(conclusion,premises=set(premises),exceptions=set(exceptions)),args["by"])
+        if not self._given(args, 'weight'):
+            args['weight'] = 0.0
+        self.initialised_variables["Weights"][var_name] = args["weight"]
+
+    def _construct_argset(self, var_name, args):
+        self.initialised_variables['ArgumentSet'][var_name] = ArgumentSet()
+
+    def _construct_audience(self, var_name, args):
+        assumptions = [self.is_initialized(x,PropLiteral) for x in args['assumptions']]
+        self.initialised_variables['Audience'][var_name] = Audience(set(assumptions),args['weight'])
+
+    def _construct_proofstandard(self, var_name, args):
+        prop_standards = [(self.is_initialized(k,PropLiteral),v) for k,v in args['propstandards'].items()]
+        self.initialised_variables['ProofStandard'][var_name] = ProofStandard(prop_standards)
+
+    def _construct_assumptions(self, var_name, args):
+        assumptions = [self.is_initialized(prop, PropLiteral) for prop in args['props']]
+        self.initialised_variables['Assumptions'][var_name] = assumptions
+
+    def _construct_caes(self, var_name, args):
+        argset = self.is_initialized(args['argset'],ArgumentSet)
+        audience = self.is_initialized(args['audience'],Audience)
+        proofStandard = self.is_initialized(args['proofstandard'],ProofStandard)
+        thresholds = {'alpha': 0.4, 'beta': 0.3, 'gamma': 0.2}
+        for name in thresholds:
+            if self._given(args, name):
+                thresholds[name] = args[name]
+        self.initialised_variables['CAES'][var_name] = CAES(argset,audience,proofStandard,**thresholds)
+
+    def _negate(self, var_name, args):
+        var = self.is_initialized(var_name, PropLiteral)
+        return_var = self._return_var(args)
+        if return_var is not None:
+            self.initialised_variables['PropLiteral'][return_var] = var.negate()
+        else:
+            print(var.negate())
+
+    def _add_argument(self, var_name, args):
+        var = self.is_initialized(var_name, ArgumentSet)
+        arg = self.is_initialized(args['argument'], Argument)
+        arg_id = None
+        print(arg[0])
+        if self._given(args, 'arg_id'):
+            arg_id = args['arg_id']
+        if self._return_var(args) is not None:
+            raise ValueError("add_argument does not take a return variable")
+        if self.pending_arguments[0] is not var:
+            self.flush_arguments()
+            self.pending_arguments = (var, [])
+        self.pending_arguments[1].append((arg[0],arg_id))
+
+    def _draw(self, var_name, args):
+        var = self.is_initialized(var_name, ArgumentSet)
+        debug = False
+        if self._given(args, 'debug'):
+            debug = args['debug']
+        var.draw(debug)
+
+    def _add_proposition(self, var_name, args):
+        var = self.is_initialized(var_name, ArgumentSet)
+        proposition = self.is_initialized(args['proposition'],PropLiteral)
+        self.initialised_variables[args['return_var']] = var.add_proposition(proposition)
+
+    def _get_arguments(self, var_name, args):
+        var = self.is_initialized(var_name, ArgumentSet)
+        proposition = self.is_initialized(args['proposition'],PropLiteral)
+        self.initialised_variables[args['return_var']] = var.get_arguments(proposition)
+
+    def _write_to_graphviz(self, var_name, args):
+        var = self.is_initialized(var_name, ArgumentSet)
+        fname = None
+        if self._given(args, 'fname'):
+            fname = args['fname']
+        var.write_to_graphviz(fname)
+
+    def _get_proofstandard(self, var_name, args):
+        var = self.is_initialized(var_name,ProofStandard)
+        prop = self.is_initialized(args['proposition'],PropLiteral)
+        self.initialised_variables[args['return_var']] = var.get_proofstandard(prop)
+
+    def _get_all_arguments(self, var_name, args):
+        var = self.is_initialized(var_name,CAES)
+        var.get_all_arguments()
+
+    def _meets_proof_standard(self, var_name, args):
+        var = self.is_initialized(var_name,CAES)
+        prop =  self.is_initialized(args['proposition'],PropLiteral)
+        result = var.meets_proof_standard(prop,args['standard'])
+        return_var = self._return_var(args)
+        if return_var is None:
+            print(result)
+        else:
+            self.initialised_variables[return_var] = result
+
+    HANDLERS = {
+        ('construct', 'PropLiteral'): _construct_proposition,
+        ('construct', 'Argument'): _construct_argument,
+        ('construct', 'ArgumentSet'): _construct_argset,
+        ('construct', 'Audience'): _construct_audience,
+        ('construct', 'ProofStandard'): _construct_proofstandard,
+        ('construct', 'Assumptions'): _construct_assumptions,
+        ('construct', 'CAES'): _construct_caes,
+        ('func', 'negate'): _negate,
+        ('func', 'add_argument'): _add_argument,
+        ('func', 'draw'): _draw,
+        ('func', 'add_proposition'): _add_proposition,
+        ('func', 'get_arguments'): _get_arguments,
+        ('func', 'write_to_graphviz'): _write_to_graphviz,
+        ('func', 'get_proofstandard'): _get_proofstandard,
+        ('func', 'acceptable'): _caes_query('acceptable', 'proposition', PropLiteral, show=False),
+        ('func', 'applicable'): _caes_query('applicable', 'proposition', PropLiteral, show=False),
+        ('func', 'get_all_arguments'): _get_all_arguments,
+        ('func', 'max_weight_applicable'): _caes_query('max_weight_applicable', 'arguments', Argument, many=True),
+        ('func', 'max_weight_con'): _caes_query('max_weight_con', 'proposition', PropLiteral),
+        ('func', 'max_weight_pro'): _caes_query('max_weight_pro', 'proposition', PropLiteral),
+        ('func', 'meets_proof_standard'): _meets_proof_standard,
+        ('func', 'weight_of'): _caes_query('weight_of', 'argument', Argument),
+    }
+    """
+    The handler for each kind of command, by the type and function name of
+    the command. A command without a handler, such as a ``construct`` command
+    for a function, does nothing.
+    """
 
 
 def reader_demo():
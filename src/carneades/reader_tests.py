@@ -1,3 +1,10 @@
+import marshal
+import operator
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
 from caes import PropLiteral, Argument
 from reader import Reader
@@ -43,5 +50,139 @@ class ReaderTestCase(unittest.TestCase):
         var_type = PropLiteral
         self.assertRaises(NameError, r.is_initialized, var_name, var_type)
 
+    def test_commands_match_whole_document(self):
+        ''' Streaming parse yields the same commands as loading the whole file '''
+        import yaml
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test1.txt')
+        r = Reader()
+        with open(path, 'r') as f:
+            r.fileObject = f
+            streamed = list(r.iter_commands())
+        with open(path, 'r') as f:
+            whole = yaml.load(f, Loader=yaml.SafeLoader)
+        self.assertEqual(streamed, list(whole.items()))
+
+    def test_commands_run_as_parsed(self):
+        ''' Commands before a syntax error have already been executed '''
+        import yaml
+        text = ("0:\n    func_name: PropLiteral\n    type: construct\n"
+                "    var_name: kill\n    args:\n        None\n"
+                "1: [unclosed\n")
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write(text)
+        try:
+            r = Reader()
+            with open(f.name, 'r') as case:
+                self.assertRaises(yaml.YAMLError, r.load, case)
+            self.assertIn('kill', r.initialised_variables['PropLiteral'])
+        finally:
+            os.remove(f.name)
+
+    def test_cached_plan_is_replayed(self):
+        ''' An unchanged file is replayed from its cached plan without parsing '''
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test1.txt')
+        cache = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache)
+        r = Reader(plan_cache=cache)
+        with open(path, 'r') as f:
+            r.load(f)
+        self.assertEqual(len(os.listdir(cache)), 1)
+        replayed = Reader(plan_cache=cache)
+        def iter_commands():
+            raise AssertionError('the file was parsed')
+        replayed.iter_commands = iter_commands
+        with open(path, 'r') as f:
+            replayed.load(f)
+        for kind in ('PropLiteral', 'Argument', 'CAES'):
+            self.assertEqual(sorted(replayed.initialised_variables[kind]),
+                             sorted(r.initialised_variables[kind]))
+        accepted = lambda reader: {name: sorted(map(str, caes.evaluate_all().accepted()))
+                                   for (name, caes) in reader.initialised_variables['CAES'].items()}
+        self.assertEqual(accepted(replayed), accepted(r))
+        with open(path, 'r') as f:
+            text = f.read()
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write(text + '\n# changed\n')
+        try:
+            with open(f.name, 'r') as case:
+                Reader(plan_cache=cache).load(case)
+            self.assertEqual(len(os.listdir(cache)), 2)
+        finally:
+            os.remove(f.name)
+
+    def test_untrusted_plan_is_ignored(self):
+        ''' A plan which is malformed, or writable by others, is not replayed '''
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test1.txt')
+        cache = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache)
+        with open(path, 'r') as f:
+            Reader(plan_cache=cache).load(f)
+        (name,) = os.listdir(cache)
+        plan_path = os.path.join(cache, name)
+        self.assertEqual(os.stat(plan_path).st_mode & 0o077, 0)
+        r = Reader(plan_cache=cache)
+        with open(path, 'r') as f:
+            r.load(f)
+        plan = r.read_plan(plan_path)
+        self.assertIsNotNone(plan)
+        tampered = [plan[:1] + [(99, ('func', 'add_argument', 'arg', {'argument': 'x', 'id': compile('0', 'x', 'eval')}))],
+                    [(99, ('func', 'no_such_function', 'x', 'None'))],
+                    [(99, ('construct', 'PropLiteral'))],
+                    {'not': 'a list'}]
+        for bad in tampered:
+            with open(plan_path, 'wb') as f:
+                marshal.dump(bad, f)
+            self.assertIsNone(r.read_plan(plan_path))
+        with open(plan_path, 'wb') as f:
+            marshal.dump(plan, f)
+        self.assertEqual(r.read_plan(plan_path), plan)
+        os.chmod(plan_path, 0o666)
+        self.assertIsNone(r.read_plan(plan_path))
+        parsed = []
+        replayed = Reader(plan_cache=cache)
+        iter_commands = replayed.iter_commands
+        replayed.iter_commands = lambda: parsed.append(True) or iter_commands()
+        with open(path, 'r') as f:
+            replayed.load(f)
+        self.assertEqual(parsed, [True])
+        self.assertEqual(sorted(replayed.initialised_variables['CAES']),
+                         sorted(r.initialised_variables['CAES']))
+
+    def test_command_stack_shares_objects(self):
+        ''' The command stack is a read-only view unless a copy is asked for '''
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test2.txt')
+        r = Reader()
+        with open(path, 'r') as f:
+            r.load(f)
+        stack = r.getCommandStack()
+        self.assertIs(stack['PropLiteral']['kill'],
+                      r.initialised_variables['PropLiteral']['kill'])
+        literals = set(stack['PropLiteral'].values())
+        for arg in stack['ArgumentsProsecution'] + stack['ArgumentsDefense']:
+            self.assertIn(arg.conclusion, literals)
+        self.assertRaises(TypeError, operator.setitem, stack, 'Weights', {})
+        self.assertRaises(TypeError, operator.setitem, stack['Weights'], 'arg1', 1.0)
+        copied = r.getCommandStack(copy=True)
+        copied['Weights']['arg1'] = 1.0
+        copied['ArgumentsDefense'].append(None)
+        self.assertNotIn(None, r.getCommandStack()['ArgumentsDefense'])
+        self.assertEqual(dict(stack['Weights']), r.initialised_variables['Weights'])
+
+class ImportTestCase(unittest.TestCase):
+    """
+    Test that importing the package is free of slow imports and side effects
+    """
+
+    def test_import_is_lazy(self):
+        ''' Importing does not load igraph or yaml, touch sys.path or configure logging '''
+        code = ("import logging, sys; path = list(sys.path); "
+                "import carneades.reader, carneades.dialogue; "
+                "print('igraph' in sys.modules, 'yaml' in sys.modules, "
+                "sys.path == path, bool(logging.getLogger().handlers))")
+        src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+        out = subprocess.check_output([sys.executable, '-c', code], cwd=src,
+                                      universal_newlines=True)
+        self.assertEqual(out.split(), ['False', 'False', 'True', 'False'])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -10,18 +10,80 @@ and return values, when executing algorithms with complex function call
 sequences, and especially ones that require recursion.
 
 The class :class:`TraceCalls` is called as a decorator :func:`@TraceCalls`.
+
+Tracing is off unless it is switched on, in one of three ways:
+
+* for the whole process, by setting the environment variable
+  ``CARNEADES_TRACE`` to a non-empty value other than ``0``, or by setting
+  :attr:`TraceCalls.enabled`;
+
+* for the current thread, inside a :func:`tracing` block;
+
+* for the methods of a single object, by setting its ``trace`` attribute, as
+  in ``CAES(..., trace=True)``.
+
+When tracing is off, a decorated function costs little more than an
+undecorated one.
+
+>>> class Doubler(object):
+...     trace = False
+...     @TraceCalls(stream=sys.stdout)
+...     def double(self, x):
+...         return 2 * x
+>>> d = Doubler()
+>>> d.double(2)
+4
+>>> with tracing():
+...     d.double(3)
+<BLANKLINE>
+Calling double(3)
+double(3)-->6
+6
+>>> d.trace = True
+>>> d.double(4)
+<BLANKLINE>
+Calling double(4)
+double(4)-->8
+8
 """
+import os
 import sys
+import threading
+from contextlib import contextmanager
 from functools import wraps
 import logging
 
+# per-thread tracing state: the current indent, and whether a tracing()
+# block is active
+_local = threading.local()
+
+
+@contextmanager
+def tracing(enabled=True):
+    """
+    Context manager which switches tracing on (or off) for the current
+    thread.
+
+    :param enabled: Whether calls should be traced inside the block.
+    :type enabled: bool
+    """
+    previous = getattr(_local, 'enabled', False)
+    _local.enabled = enabled
+    try:
+        yield
+    finally:
+        _local.enabled = previous
+
+
 class TraceCalls(object):
-    """ 
+    """
     Use as a decorator on functions that should be traced. Several functions
     can be decorated; they will all be indented according to their call
-    depth.
-        
+    depth, which is kept separately for each thread.
+
     """
+    enabled = os.environ.get('CARNEADES_TRACE', '') not in ('', '0')
+
     def __init__(self, stream=sys.stdout, indent_step=2, show_ret=True):
         """
         :param stream: The output stream
@@ -31,23 +93,34 @@ class TraceCalls(object):
         """
         self.indent_step = indent_step
         self.show_ret = show_ret
-        TraceCalls.cur_indent = 0
         self.stream = stream
 
     def __call__(self, fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            indent = ' ' * TraceCalls.cur_indent
-            argstr = ', '.join(
-                [str(a) for a in args][1:])
-            self.stream.write("\n{}Calling {}({})\n".format(indent, fn.__name__, argstr))
+            if TraceCalls.enabled or getattr(_local, 'enabled', False) or \
+               (args and getattr(args[0], 'trace', False) is True):
+                return self.trace(fn, args, kwargs)
+            return fn(*args, **kwargs)
+        return wrapper
+
+    def trace(self, fn, args, kwargs):
+        """
+        Call ``fn`` and write out the call and its return value.
+        """
+        cur_indent = getattr(_local, 'indent', 0)
+        indent = ' ' * cur_indent
+        argstr = ', '.join(
+            [str(a) for a in args][1:])
+        self.stream.write("\n{}Calling {}({})\n".format(indent, fn.__name__, argstr))
 
-            TraceCalls.cur_indent += self.indent_step
+        _local.indent = cur_indent + self.indent_step
+        try:
             ret = fn(*args, **kwargs)
-            TraceCalls.cur_indent -= self.indent_step
+        finally:
+            _local.indent = cur_indent
 
-            if self.show_ret:
-                self.stream.write("{}{}({})-->{}\n".format(indent, fn.__name__,
-                                                      argstr, ret))
-                return ret
-        return wrapper
\ No newline at end of file
+        if self.show_ret:
+            self.stream.write("{}{}({})-->{}\n".format(indent, fn.__name__,
+                                                  argstr, ret))
+        return ret